@@ -1,310 +1,248 @@
-"""Main module"""
+"""Main module
 
-# IMPORTS
-from src import ikidef, ikidraw
-
-# USER DATA -----------------------------------------------------------------------------------
-
-draw_iki = False  # Whether to provide a visualization of the final results
-ask_name = 'What is your name?'
-
-# Get the user's name with proper length constraints
-user_name = ikidef.input_limit(ask_name, 2, 30)
-# Extract the first name from the full name (if applicable)
-first_name = ikidef.first_word(user_name, ' ')
-# Record the current date
-test_date = ikidef.current_date()
-
-###################### QUESTIONNAIRE #######################################
-
-# FIRST SET OF QUESTIONS ---------------------------------------------------
-# (Assigned to true/false variables based on the answers)
-# (Always asked)
-
-# Value limits
-value_minTrue = 5  # Threshold for a "true" evaluation
-value_max = 10  # Maximum possible value
-value_min = 0  # Minimum possible value
+Run this file to take the questionnaire. Importing it only defines `questionnaire` and `main`:
+the drawing (turtle/Tk) and the statistics module are loaded when a session needs them.
+"""
 
-# First set of questions
-ask_love = 'How much do you love your job?'
-ask_world = 'How much does your work help make the world a better place?'
-ask_money = 'How satisfied are you with your earnings?'
-ask_good = 'How good are you at it?'
-
-# Get numerical input for each question and evaluate if it meets the threshold
-value_love = ikidef.ask_for_number(ask_love, value_min, value_max)
-ok_love = ikidef.true_or_not(value_love, value_minTrue)
-
-value_world = ikidef.ask_for_number(ask_world, value_min, value_max)
-ok_world = ikidef.true_or_not(value_world, value_minTrue)
+# IMPORTS
+from src import ikidef, ikidraw, ikieval, ikimetrics, ikiprofile
 
-value_money = ikidef.ask_for_number(ask_money, value_min, value_max)
-ok_money = ikidef.true_or_not(value_money, value_minTrue)
 
-value_good = ikidef.ask_for_number(ask_good, value_min, value_max)
-ok_good = ikidef.true_or_not(value_good, value_minTrue)
+def questionnaire(source=None, sink=None, draw: bool = True, instant: bool = False, profile=None,
+                  model=None) -> dict:
+    """Runs the questionnaire once.
 
-# COUNTING FOR EVALUATION --------------------------------------------------
+    Args:
+        source (callable | None): Source of the answers, called with each question like `input`
+            (default: `input`). See `ikidef.answers_from` and `ikidef.Transcript` for replaying
+            recorded sessions.
+        sink (callable | None): Output of the results, called like `print` (default: `print`).
+        draw (bool): Whether the results are drawn with `ikidraw` (if the session leads to a drawing).
+        instant (bool): Whether the drawing appears at once instead of being animated.
+        profile (ikiprofile.Profile | None): Scoring profile with the limits, thresholds and weights
+            (default: the rules of `ikiprofile.DEFAULT_PROFILE`).
+        model (ikieval.Model | None): Dimensions asked about and their rings (default: the love,
+            world, money and good circles of `ikieval.IKIGAI_MODEL`).
 
-from statistics import mean
+    Returns:
+        dict: The user's name and date, the value of every dimension (by name), the conclusion and
+            advice texts, whether the results are drawn ('draw_iki') and the name of the scoring
+            profile ('profile').
+    """
+    source = source or input
+    sink = sink or print
+    model = model or ikieval.IKIGAI_MODEL
+    evaluator = ikiprofile.compile_model(model, profile or ikiprofile.DEFAULT_PROFILE)
+    count = len(model.names)  # Number of dimensions (and of rings)
 
-# LWMG (Love, World, Money, Good) values
-LWMG = (value_love, value_world, value_good, value_money)
-score_LWMG_sum = sum(LWMG)
-score_LWMG_avr = mean(LWMG)
-score_LWMG_min = min(LWMG)
+    # USER DATA -----------------------------------------------------------------------------------
 
-# Calculate PMVP (Passion, Mission, Vocation, Profession) values based on averages of LWMG
-passion = (value_good, value_love)
-value_passion = mean(passion)
-ok_passion = ikidef.true_or_not(value_passion, value_minTrue)
+    draw_iki = False  # Whether to provide a visualization of the final results
 
-mission = (value_world, value_love)
-value_mission = mean(mission)
-ok_mission = ikidef.true_or_not(value_mission, value_minTrue)
+    # Get the user's name with proper length constraints
+    user_name = ikidef.input_limit(ikieval.ask_name, ikieval.name_min_length, ikieval.name_max_length,
+                                   source=source, sink=sink)
+    # Extract the first name from the full name (if applicable)
+    first_name = ikidef.first_word(user_name, ' ')
+    # Record the current date
+    test_date = ikidef.current_date()
 
-vocation = (value_world, value_money)
-value_vocation = mean(vocation)
-ok_vocation = ikidef.true_or_not(value_vocation, value_minTrue)
+    ###################### QUESTIONNAIRE #######################################
 
-profession = (value_good, value_money)
-value_profession = mean(profession)
-ok_profession = ikidef.true_or_not(value_profession, value_minTrue)
+    # FIRST SET OF QUESTIONS ---------------------------------------------------
+    # (One question per dimension of the model, always asked)
 
-PMVP = (value_passion, value_mission, value_vocation, value_profession)
-score_PWMP_min = min(PMVP)
-score_PWMP_sum = sum(PMVP)
-score_PWMP_avr = mean(PMVP)
+    # Value limits (from the scoring profile)
+    value_minTrue = evaluator.profile.value_minTrue  # Threshold for a "true" evaluation
+    value_max = evaluator.value_max  # Maximum possible value
+    value_min = evaluator.value_min  # Minimum possible value
+
+    # Get numerical input for each question (the thresholds are applied by the evaluator)
+    values = [ikidef.ask_for_number(question, value_min, value_max, source=source, sink=sink)
+              for question in model.questions]
+
+    # COUNTING FOR EVALUATION --------------------------------------------------
 
-# RESULTS AND ADDITIONAL QUESTIONS ----------------------------------------
+    started = ikimetrics.clock()
+
+    # LWMG (Love, World, Money, Good) values and PMVP (Passion, Mission, Vocation, Profession)
+    # values based on (weighted) averages of neighbouring LWMG values, as defined by the scoring
+    # profile (other models keep these score names for their answers and rings)
+    scores = evaluator.scores(*values)
+    score_LWMG_avr = scores['score_LWMG_avr']
+    score_LWMG_min = scores['score_LWMG_min']
+    ok_rings = [scores[f'ok_{name}'] for name in model.ring_names]  # Ring k overlaps dimensions k and k + 1
+    ikimetrics.record('scoring', started)
+
+    # RESULTS AND ADDITIONAL QUESTIONS ----------------------------------------
+
+    msg_results = ikieval.msg_results.format(first_name=first_name, score_avr=score_LWMG_avr,
+                                             score_min=score_LWMG_min)
+    positive, negative, msg_error = ikieval.positive, ikieval.negative, ikieval.msg_error
+
+    text_conclusion = '-'  # Conclusion text for `ikidraw`, to be updated based on results
+    text_advice = '-'
+
+    make = [False] * count  # Flags for additional advice (yes/no questions)
+
+    # RESULTS IF EVERYTHING MAX → RANDOM
+
+    give_random = False  # Initially set to False for random advice
+
+    started = ikimetrics.clock()  # Time the evaluation, not the wait for the answers.
+
+    # OTHER SCENARIOS: the follow-up questions about the rings under the limit or the lowest ones
+    outcome, ask_yn = ikieval.questions_to_ask(scores, value_max, model)
+
+    if outcome == ikieval.OUTCOME_MAX:
+        sink(msg_results, ikieval.msg_congrat, sep='', end='')
+        text_conclusion = ikieval.msg_congrat
+    elif outcome == ikieval.OUTCOME_IMPROVE:
+        sink(msg_results, ikieval.msg_congrat, ikieval.msg_improve, '\n', sep='')
+    elif outcome == ikieval.OUTCOME_UNDER:
+        sink(msg_results, ikieval.msg_under_limit, '\n', sep='')
+    else:
+        sink(ikieval.msg_unexpected)
+
+    ikimetrics.record('evaluation', started)
+
+    if score_LWMG_avr == value_max:
+        give_random = ikidef.ask_for_yn(ikieval.ask_random, positive, negative, msg_error, source=source, sink=sink)
+
+        if not give_random:  # If no random advice is requested, end here
+            draw_iki = True
+
+    # ADDITIONAL QUESTIONS -----------------------------------------------------
+
+    for index, question in enumerate(model.follow_ups):
+        if ask_yn[index]:
+            make[index] = ikidef.ask_for_yn(question, positive, negative, msg_error, source=source, sink=sink)
+
+    # RESULTS FROM ADDITIONAL QUESTIONS ----------------------------------------
 
-msg_results = f'\n{first_name}, your average rating is {score_LWMG_avr}. Your lowest grade awarded is {score_LWMG_min}. '
+    msg_sorry = ikieval.msg_sorry.format(first_name=first_name)
+    temp_advice = ikieval.temp_advice  # Template for displaying each piece of advice on a new line
 
-msg_congrat = "Congratulations! Keep doing what you're doing."
-msg_under_limit = "You have some values under the limit. You need to work on improving them."
-msg_improve = 'Still, you can make some improvements based on your lowest grade(s).'
+    # RANDOM ADVICE LOOP -------------------------------------------------------
 
-positive = 'yes'
-negative = 'no'
+    while give_random:
+        random_ask = True
+        if random_ask:
+            import random
+            give_random = True
+            text_advice = ikieval.text_random
+            random_advice = random.choice([model.tries[index] for index in model.random_order])
+            sink(random_advice, end=" ")
+            text_advice = temp_advice.format(adv=text_advice, plus=random_advice)
+            random_ask = ikidef.ask_for_yn(ikieval.ask_random_again, positive, negative, msg_error,
+                                           source=source, sink=sink)
 
-yn_instructions = f'Answer {positive}/{negative}'
-msg_error = f'{yn_instructions} as instructed. Write in lowercase!'
+        if not random_ask:
+            give_random = False
+            draw_iki = True
+            break
 
-ask_yn_love = ask_yn_world = ask_yn_money = ask_yn_good = False  # Flags for yes/no follow-up questions
+    # WHAT PMVP VALUES ARE MISSING ---------------------------------------------
 
-text_conclusion = '-'  # Conclusion text for `ikidraw`, to be updated based on results
-text_advice = '-'
+    started = ikimetrics.clock()
 
-make_love = make_world = make_money = make_good = False  # Flags for additional advice (yes/no questions)
+    if not all(ok_rings):
+        sink(ikieval.msg_miss)
+        for ring in model.ring_order:
+            if not ok_rings[ring]:
+                sink('\t -', model.ring_names[ring].capitalize())
 
-# RESULTS IF EVERYTHING MAX → RANDOM
+        # A ring under the limit is lost if neither of its dimensions can be improved.
+        if any(not ok_rings[ring] and not make[ring] and not make[(ring + 1) % count] for ring in range(count)):
+            sink('\n', msg_sorry, sep='', end=" ")
+            text_conclusion = ikieval.msg_under
+            text_advice = ikieval.msg_change_job
+            draw_iki = True
 
-give_random = False  # Initially set to False for random advice
-ask_random = f'There is probably nothing to improve. {yn_instructions}: Do you want random advice to just check it?'
-ask_random_again = f'{yn_instructions}: Do you want another random message?'
+    elif score_LWMG_avr < value_max:
+        text_conclusion = ikieval.msg_space
+        text_advice = ikieval.text_space
 
-if score_LWMG_avr == value_max:
-    print(msg_results, msg_congrat, sep='', end='')
-    text_conclusion = msg_congrat
-    give_random = ikidef.ask_for_yn(ask_random, positive, negative, msg_error)
+        for index in model.advice_order:
+            if make[index]:
+                sink(model.tries[index], end=" ")
+                text_advice = temp_advice.format(adv=text_advice, plus=model.tries[index])
 
-    if not give_random:  # If no random advice is requested, end here
-        draw_iki = True
+        if not any(make):
+            sink(ikieval.msg_still_ok, end='')
+            text_conclusion = ikieval.msg_still_ok
+            text_advice = ''
 
-# OTHER SCENARIOS ----------------------------------------------------------
-
-elif ok_passion and ok_mission and ok_vocation and ok_profession and score_PWMP_avr < value_max:
-    print(msg_results, msg_congrat, msg_improve, '\n', sep='')
-
-    if score_PWMP_min == value_passion:
-        ask_yn_love = ask_yn_good = True
-    if score_PWMP_min == value_mission:
-        ask_yn_love = ask_yn_world = True
-    if score_PWMP_min == value_vocation:
-        ask_yn_world = ask_yn_money = True
-    if score_PWMP_min == value_profession:
-        ask_yn_money = ask_yn_good = True
-
-elif not ok_passion or not ok_mission or not ok_vocation or not ok_profession:
-    print(msg_results, msg_under_limit, '\n', sep='')
-
-    if not ok_passion:
-        ask_yn_love = ask_yn_good = True
-    if not ok_mission:
-        ask_yn_love = ask_yn_world = True
-    if not ok_vocation:
-        ask_yn_world = ask_yn_money = True
-    if not ok_profession:
-        ask_yn_money = ask_yn_good = True
-
-else:
-    msg_unexpected = 'Unexpected result. Please contact the developer!'
-    print(msg_unexpected)
-
-# ADDITIONAL QUESTIONS -----------------------------------------------------
-
-ask_love2 = f'{yn_instructions}: Can the environment you work in be improved (e.g., music, people, good tea during tasks)?'
-ask_world2 = f'{yn_instructions}: Is there a small part of your work that helps/makes someone happy, and could you do more of it?'
-ask_money2 = f'{yn_instructions}: Can you ask for more money?'
-ask_good2 = f'{yn_instructions}: Is there anything you could learn to improve your skills?'
-
-if ask_yn_love:
-    make_love = ikidef.ask_for_yn(ask_love2, positive, negative, msg_error)
-if ask_yn_world:
-    make_world = ikidef.ask_for_yn(ask_world2, positive, negative, msg_error)
-if ask_yn_money:
-    make_money = ikidef.ask_for_yn(ask_money2, positive, negative, msg_error)
-if ask_yn_good:
-    make_good = ikidef.ask_for_yn(ask_good2, positive, negative, msg_error)
-
-# RESULTS FROM ADDITIONAL QUESTIONS ----------------------------------------
-
-msg_try_love = 'You can try to improve your work environment.'
-msg_try_world = 'You can try to magnify the parts of your work that make someone happy.'
-msg_try_money = 'You can try to negotiate for more money.'
-msg_try_good = 'You can try to learn skills to improve your performance.'
-
-msg_try = f'Try applying the advice given and retake this test. {first_name}, I know you can do it!'
-
-msg_miss = '\nYou are missing in your current job:'
-
-name_passion = 'Passion'
-name_mission = 'Mission'
-name_vocation = 'Vocation'
-name_profession = 'Profession'
-
-msg_under = "You cannot improve your essential grade(s) under the limit!"
-msg_change_job = "You might need to consider changing jobs!"
-msg_sorry = f"I'm sorry, {first_name}! {msg_under} {msg_change_job}"
-
-msg_gaps = 'You have critical gaps in some areas, but you can address them!'
-msg_space = 'Your score is fine. Still, there is room for improvement if you wish.'
-msg_still_ok = "You cannot improve your lowest grade, but your score is fine."
-
-try_love = try_good = try_money = try_world = False  # Flags for showing specific advice in final results
-
-temp_advice = '{adv}\n   - {plus}'  # Template for displaying each piece of advice on a new line
-
-# RANDOM ADVICE LOOP -------------------------------------------------------
-
-while give_random:
-    random_ask = True
-    if random_ask:
-        import random
-        give_random = True
-        text_advice = '   Just a random check:'
-        random_advice = random.choice([msg_try_good, msg_try_love, msg_try_money, msg_try_world])
-        print(random_advice, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=random_advice)
-        random_ask = ikidef.ask_for_yn(ask_random_again, positive, negative, msg_error)
-
-    if not random_ask:
-        give_random = False
-        draw_iki = True
-        break
-
-# WHAT PMVP VALUES ARE MISSING ---------------------------------------------
-
-if not ok_passion or not ok_mission or not ok_vocation or not ok_profession:
-    print(msg_miss)
-    if not ok_passion:
-        print('\t -', name_passion)
-    if not ok_mission:
-        print('\t -', name_mission)
-    if not ok_vocation:
-        print('\t -', name_vocation)
-    if not ok_profession:
-        print('\t -', name_profession)
-
-    if (not ok_passion and (not make_good and not make_love)) or \
-       (not ok_mission and (not make_world and not make_love)) or \
-       (not ok_vocation and (not make_world and not make_money)) or \
-       (not ok_profession and (not make_good and not make_money)):
-        print('\n', msg_sorry, sep='', end=" ")
-        text_conclusion = msg_under
-        text_advice = msg_change_job
         draw_iki = True
 
-elif (not ok_passion and (make_good or make_love)) or \
-     (not ok_mission and (make_world or make_love)) or \
-     (not ok_vocation and (make_world or make_money)) or \
-     (not ok_profession and (make_good or make_money)):
-    print('\n', msg_gaps, sep='', end=" ")
-    text_conclusion = msg_gaps
-
-    if not ok_passion and make_love:
-        try_love = True
-    if not ok_passion and make_good:
-        try_good = True
-    if not ok_mission and make_love:
-        try_love = True
-    if not ok_mission and make_world:
-        try_world = True
-    if not ok_vocation and make_money:
-        try_money = True
-    if not ok_vocation and make_world:
-        try_world = True
-    if not ok_profession and make_money:
-        try_money = True
-    if not ok_profession and make_good:
-        try_good = True
-
-    text_advice = '   You really need to focus on improving:'
-
-    if try_love:
-        print(msg_try_love, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_love)
-    if try_good:
-        print(msg_try_good, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_good)
-    if try_world:
-        print(msg_try_world, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_world)
-    if try_money:
-        print(msg_try_money, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_money)
-
-    print(msg_try, end=" ")
-    draw_iki = True
-
-elif (ok_passion and ok_mission and ok_vocation and ok_profession) and score_LWMG_avr < value_max:
-    text_conclusion = msg_space
-
-    if make_love:
-        try_love = True
-    if make_good:
-        try_good = True
-    if make_money:
-        try_money = True
-    if make_world:
-        try_world = True
-
-    text_advice = '   Optional space for improvement:'
-
-    if try_love:
-        print(msg_try_love, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_love)
-    if try_good:
-        print(msg_try_good, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_good)
-    if try_world:
-        print(msg_try_world, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_world)
-    if try_money:
-        print(msg_try_money, end=" ")
-        text_advice = temp_advice.format(adv=text_advice, plus=msg_try_money)
-
-    if not make_love and not make_world and not make_money and not make_good:
-        print(msg_still_ok, end='')
-        text_conclusion = msg_still_ok
-        text_advice = ''
-
-    draw_iki = True
-
-###################### DRAW #######################################
-
-if draw_iki:
-    ikidraw.ikigai_draw(value_love, value_good, value_money, value_world, value_max, value_minTrue, 
-                        text_conclusion, text_advice, user_name, test_date)
-
+    ikimetrics.record('advice', started)
+
+    ###################### DRAW #######################################
+
+    if draw_iki and draw:
+        ikidraw.ring_draw(model, values, value_max, value_minTrue, text_conclusion, text_advice, user_name,
+                          test_date, instant=instant, profile=evaluator.profile)
+
+    return {
+        'user_name': user_name,
+        'test_date': test_date,
+        **dict(zip(model.names, values)),
+        'text_conclusion': text_conclusion,
+        'text_advice': text_advice,
+        'draw_iki': draw_iki,
+        'profile': evaluator.name,
+    }
+
+
+def main(argv: list | None = None) -> dict:
+    """Command line entry point: runs the questionnaire with the keyboard and screen.
+
+    Args:
+        argv (list | None): Command line arguments (default: `sys.argv[1:]`).
+
+    Returns:
+        dict: The results of `questionnaire`.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description='IKIGAI PRO WORK - job satisfaction questionnaire.')
+    parser.add_argument('--no-draw', action='store_true', help='do not draw the results')
+    parser.add_argument('--instant', action='store_true',
+                        help='show the drawing at once instead of animating it')
+    parser.add_argument('--metrics', metavar='PATH',
+                        help='record stage timings and write them to this file (JSON for .json, '
+                             'Prometheus text otherwise)')
+    parser.add_argument('--history', metavar='PATH',
+                        help='keep the results in this database and show the changes since the last test')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='JSON scoring profile with the limits, thresholds and weights to use')
+    args = parser.parse_args(argv)
+
+    profile = None
+    if args.profile:
+        try:
+            profile = ikiprofile.load_profile(args.profile)
+        except (OSError, ValueError) as error:
+            parser.error(f'invalid profile: {error}')
+
+    if args.metrics:
+        ikimetrics.enable()
+    try:
+        result = questionnaire(draw=not args.no_draw, instant=args.instant, profile=profile)
+    finally:
+        if args.metrics:
+            ikimetrics.dump(args.metrics)
+
+    if args.history:
+        from src import ikihistory
+
+        with ikihistory.HistoryStore(args.history) as store:
+            change = store.add_result(result, profile)
+        print('\n' + ikihistory.format_change(change))
+
+    return result
+
+
+# Run the questionnaire if this file is executed directly.
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,233 @@
+"""Benchmark suite.
+
+Measures the scoring, validation, text wrapping, questionnaire and rendering paths at several input
+sizes with the standard library only, saves the results as JSON and compares them with a baseline.
+
+Usage:
+    python -m benchmarks.run                                   # run and print
+    python -m benchmarks.run --save results.json               # also save the results
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.25
+
+With a baseline, the exit status is 1 if any benchmark got slower than the tolerance allows.
+"""
+
+import json
+import platform
+import random
+import sys
+import timeit
+
+TOLERANCE = 0.25  # Allowed slowdown against the baseline (0.25 = 25 %).
+REPEAT = 5  # Timing runs per benchmark; the fastest one counts.
+
+
+# BENCHMARKS ----------------------------------------------------------------------------------
+
+def bench_get_sum_avg_min(size: int):
+    from src import ikidef
+
+    rng = random.Random(size)
+    data = [rng.uniform(0, 10) for _ in range(size)]
+    return lambda: ikidef.get_sum_avg_min(data)
+
+
+def bench_consecutive_and_circular_averages(size: int):
+    from src import ikidef
+
+    rng = random.Random(size)
+    data = [rng.uniform(0, 10) for _ in range(size)]
+    return lambda: ikidef.consecutive_and_circular_averages(data)
+
+
+def bench_is_it_number(size: int):
+    from src import ikidef
+
+    rng = random.Random(size)
+    answers = [rng.choice(('7', '7,5', '10.0', 'abc', '', '-3')) for _ in range(size)]
+    return lambda: [ikidef.is_it_number(answer, 'Error') for answer in answers]
+
+
+def bench_max_line_length(size: int):
+    from src import drawdef
+
+    rng = random.Random(size)
+    words = ['improve', 'environment', 'negotiate', 'skills', 'a', 'the', 'performance', 'magnify']
+    text = ' '.join(rng.choice(words) for _ in range(size // 7 + 1))[:size]
+    wrap = drawdef.max_line_length.__wrapped__  # Without the memoization, to time the wrapping itself.
+    return lambda: wrap(text, 70)
+
+
+def bench_assessment(size: int):
+    import IKIGAI_PRO_WORK
+    from src import ikidef
+
+    rng = random.Random(size)
+    sessions = [['Jane Doe', *(str(rng.randint(0, 10)) for _ in range(4)), *rng.choices(('yes', 'no'), k=8)]
+                for _ in range(size)]
+
+    def run():
+        for answers in sessions:
+            source = ikidef.answers_from(answers + ['no'] * 8)  # Enough answers for any follow-up.
+            IKIGAI_PRO_WORK.questionnaire(source, lambda *args, **kwargs: None, draw=False)
+
+    return run
+
+
+def bench_render_svg(size: int):
+    from src import ikisvg
+
+    rng = random.Random(size)
+    reports = [[rng.randint(0, 10) for _ in range(4)] for _ in range(size)]
+    return lambda: [ikisvg.ikigai_svg(*values, 10, 5, 'Conclusion text.', 'Advice text.', 'Jane Doe', '18.10.2026')
+                    for values in reports]
+
+
+def bench_render_png(size: int):
+    from src import ikipng
+
+    rng = random.Random(size)
+    reports = [[rng.randint(0, 10) for _ in range(4)] for _ in range(size)]
+    canvas = ikipng.Canvas(ikipng.SIZE, ikipng.SIZE, ikipng.SIZE / ikipng.EXTENT)
+    return lambda: [ikipng.ikigai_png(*values, 10, 5, canvas=canvas) for values in reports]
+
+
+def bench_group_by(size: int):
+    from src import ikigroup
+
+    rng = random.Random(size)
+    rows = [{'team': rng.choice(('red', 'green', 'blue', 'gold')), 'love': str(rng.randint(0, 10)),
+             'world': f'{rng.uniform(0, 10):.1f}', 'money': str(rng.randint(0, 10)), 'good': '7,5'}
+            for _ in range(size)]
+    return lambda: ikigroup.aggregate(rows, 'team', workers=1)  # One core, to compare runs on any machine.
+
+
+BENCHMARKS = {
+    'get_sum_avg_min': (bench_get_sum_avg_min, (4, 100, 10_000)),
+    'consecutive_and_circular_averages': (bench_consecutive_and_circular_averages, (4, 100, 10_000)),
+    'is_it_number': (bench_is_it_number, (1, 100, 10_000)),
+    'max_line_length': (bench_max_line_length, (100, 1_000, 10_000)),
+    'assessment': (bench_assessment, (1, 10, 100)),
+    'render_svg': (bench_render_svg, (1, 10, 100)),
+    'render_png': (bench_render_png, (1, 10)),
+    'group_by': (bench_group_by, (1_000, 100_000)),
+}
+
+
+# RUNNING -------------------------------------------------------------------------------------
+
+def measure(function, repeat: int = REPEAT, min_time: float = 0.05) -> float:
+    """Measures the fastest time of one call in seconds.
+
+    Args:
+        function (callable): The function to time, without arguments.
+        repeat (int): Number of timing runs.
+        min_time (float): Minimum duration of one timing run in seconds.
+
+    Returns:
+        float: Seconds per call.
+    """
+    timer = timeit.Timer(function)
+
+    # Like `timeit.Timer.autorange`: double the calls per run until a run takes long enough.
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run_benchmarks(names=None, sizes=None, repeat: int = REPEAT, min_time: float = 0.05) -> dict:
+    """Runs benchmarks and collects the results.
+
+    Args:
+        names (list | None): Names of the benchmarks to run (default: all of BENCHMARKS).
+        sizes (list | None): Input sizes to use instead of each benchmark's own sizes.
+        repeat (int): Number of timing runs per benchmark.
+        min_time (float): Minimum duration of one timing run in seconds.
+
+    Returns:
+        dict: The environment and 'results': seconds per call by benchmark name and input size.
+    """
+    results = {}
+    for name in names or BENCHMARKS:
+        setup, default_sizes = BENCHMARKS[name]
+        results[name] = {str(size): measure(setup(size), repeat, min_time) for size in sizes or default_sizes}
+
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float = TOLERANCE) -> list:
+    """Compares results with a baseline.
+
+    Args:
+        current (dict): Results of `run_benchmarks`.
+        baseline (dict): Stored results of `run_benchmarks`.
+        tolerance (float): Allowed slowdown (0.25 = 25 %).
+
+    Returns:
+        list: (name, size, baseline seconds, current seconds, ratio, regressed) for every benchmark
+            found in both.
+    """
+    rows = []
+    for name, sizes in current['results'].items():
+        for size, seconds in sizes.items():
+            before = baseline['results'].get(name, {}).get(size)
+            if before is None:
+                continue
+            ratio = seconds / before
+            rows.append((name, size, before, seconds, ratio, ratio > 1 + tolerance))
+    return rows
+
+
+def main(argv: list | None = None) -> int:
+    """Command line entry point of the benchmark suite."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Run the IKIGAI benchmark suite.')
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help=f'benchmarks to run (default: all of {", ".join(BENCHMARKS)})')
+    parser.add_argument('--save', help='save the results as JSON to this file')
+    parser.add_argument('--baseline', help='compare with the results in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE,
+                        help='allowed slowdown against the baseline (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='timing runs (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.names) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f'unknown benchmark(s): {", ".join(sorted(unknown))}')
+
+    current = run_benchmarks(args.names or None, repeat=args.repeat)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump(current, file, indent=2)
+            file.write('\n')
+
+    if not args.baseline:
+        for name, sizes in current['results'].items():
+            for size, seconds in sizes.items():
+                print(f'{name:<36}{size:>8}{seconds * 1e6:>14.2f} us')
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as file:
+        baseline = json.load(file)
+
+    rows = compare(current, baseline, args.tolerance)
+    for name, size, before, seconds, ratio, regressed in rows:
+        flag = '  SLOWER' if regressed else ''
+        print(f'{name:<36}{size:>8}{before * 1e6:>14.2f} us{seconds * 1e6:>14.2f} us{ratio:>8.2f}x{flag}')
+
+    regressions = sum(row[-1] for row in rows)
+    if regressions:
+        print(f'{regressions} benchmark(s) slower than the baseline allows ({args.tolerance:.0%}).')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,17 @@
 """Function module for ikidraw."""
 
+from collections import namedtuple
+from functools import lru_cache
+from math import cos, pi, radians, sin
+
+
+@lru_cache(maxsize=1024)
 def max_line_length(text: str, max_length: int) -> str:
     """Divides text into multiple lines if the current lines exceed the specified maximum length.
 
+    Continuation lines start with a tab. The text is scanned once and the result is built with
+    a single join; results are memoized for repeated (text, max_length) pairs.
+
     Args:
         text (str): The input text to be processed.
         max_length (int): The maximum allowed length for each line.
@@ -10,34 +19,67 @@ def max_line_length(text: str, max_length: int) -> str:
     Returns:
         str: The modified text with lines adjusted to the specified maximum length.
     """
-    text_mod = ""  # Empty string for storing the modified text.
     line_separator = '\n'  # Character used to separate lines.
     word_separator = ' '  # Character used to separate words.
+    parts = []  # Pieces of the modified text, joined at the end.
 
     for line in text.split(line_separator):
-        current_line = ''  # Temporary variable for building the current line.
-        words = line.split(word_separator)  # Splits the line into words.
-
-        for word in words:
-            line_length = len(current_line)  # Current line's length.
-            word_length = len(word)  # Length of the current word.
-            word_separator_length = len(word_separator)  # Length of the separator.
+        current_line = []  # Pieces of the current line.
+        line_length = 0  # Current line's length.
 
+        for word in line.split(word_separator):
             # Add the word to the current line if it does not exceed the maximum length.
-            if line_length + word_separator_length + word_length <= max_length:
-                if current_line:  # Add separator if the current line is not empty.
-                    current_line += word_separator
-                current_line += word  # Append the word to the current line.
+            if line_length + 1 + len(word) <= max_length:
+                if line_length:  # Add separator if the current line is not empty.
+                    current_line.append(word_separator)
+                    line_length += 1
+                current_line.append(word)
+                line_length += len(word)
             else:
                 # Add the current line to the modified text and start a new line.
-                text_mod += line_separator + current_line
-                current_line = '\t' + word  # Start a new line with a tab for better readability.
+                parts.append(line_separator)
+                parts.extend(current_line)
+                current_line = ['\t', word]  # Start a new line with a tab for better readability.
+                line_length = 1 + len(word)
 
-        if current_line:  # Add the last line if it exists.
-            text_mod += line_separator + current_line
+        if line_length:  # Add the last line if it exists.
+            parts.append(line_separator)
+            parts.extend(current_line)
 
-    text = text_mod.strip()  # Remove leading/trailing separators.
-    return text
+    return ''.join(parts).strip()  # Remove leading/trailing separators.
+
+
+def wrap_paragraphs(paragraphs, max_length: int):
+    """Lazily wraps a stream of paragraphs with `max_line_length`.
+
+    Args:
+        paragraphs: Iterable of texts.
+        max_length (int): The maximum allowed length for each line.
+
+    Yields:
+        str: The wrapped texts, one per paragraph.
+    """
+    for paragraph in paragraphs:
+        yield max_line_length(paragraph, max_length)
+
+
+def color_name_by_limits(value_ask: float, value_max: float, value_min_true: float) -> str:
+    """Gets the name of the color for the given value's position relative to limits.
+
+    Args:
+        value_ask (float): The value to evaluate.
+        value_max (float): The maximum limit.
+        value_min_true (float): The minimum acceptable limit.
+
+    Returns:
+        str: The Tk color name corresponding to the value's range.
+    """
+    if value_ask == value_max:
+        return 'green'  # Maximum value is green.
+    elif value_ask >= value_min_true:
+        return 'dark goldenrod'  # Within acceptable range is dark goldenrod.
+    else:
+        return 'red'  # Below minimum limit is red.
 
 
 def color_by_limits(value_ask: float, value_max: float, value_min_true: float):
@@ -53,9 +95,359 @@ def color_by_limits(value_ask: float, value_max: float, value_min_true: float):
     """
     from turtle import color
 
-    if value_ask == value_max:
-        return color('green')  # Maximum value is green.
-    elif value_ask >= value_min_true:
-        return color('dark goldenrod')  # Within acceptable range is dark goldenrod.
+    return color(color_name_by_limits(value_ask, value_max, value_min_true))
+
+
+# LAYOUT ------------------------------------------------------------------------------------------
+
+Text = namedtuple('Text', ['x', 'y', 'text', 'color', 'size', 'weight'])
+Text.__doc__ = """A text written like `turtle.write(text, align='center')`: (x, y) is its bottom center."""
+
+FONT_FAMILY = 'Arial'
+CIRCLE_FILL = '#AAB7B8'  # Fill color of the circles.
+CIRCLE_OUTLINE = 'white'  # Outline color of the circles.
+CIRCLE_OUTLINE_WIDTH = 3
+CIRCLE_RADIUS = 150
+CIRCLE_STEPS = 72  # Corners of the polygons that approximate the circles (`turtle.circle` uses 37).
+
+# RGB values of the Tk color names used in the drawing, for renderers without Tk
+COLORS = {
+    'white': (255, 255, 255),
+    'black': (0, 0, 0),
+    'green': (0, 128, 0),
+    'dark goldenrod': (184, 134, 11),
+    'red': (255, 0, 0),
+}
+
+# The four circles of `ikigai_draw`, counterclockwise from the top: love, good, money, world
+IKIGAI_NAMES = ('LOVE', 'GOOD AT', 'PAID FOR', 'WORLD')
+IKIGAI_RING_NAMES = ('PASSION', 'PROFESSION', 'VOCATION', 'MISSION')
+IKIGAI_HINTS = ('Improve the environment.', 'Learn necessary things.', 'Ask for more money.',
+                'Increase the part that helps.')
+IKIGAI_HINT_ORDER = (3, 1, 0, 2)  # `ikigai_draw` writes the hints right, left, up and down.
+
+
+def rgb(color: str) -> tuple[int, int, int]:
+    """Converts a Tk color name (of COLORS) or a '#RRGGBB' color to an (r, g, b) tuple."""
+    if color.startswith('#'):
+        return tuple(int(color[index:index + 2], 16) for index in (1, 3, 5))
+    return COLORS[color]
+
+
+def move(x: float, y: float, heading: float, distance: float) -> tuple[float, float]:
+    """Moves a point like `turtle.forward`.
+
+    Args:
+        x (float): Horizontal position.
+        y (float): Vertical position (pointing up, as in turtle).
+        heading (float): Direction in degrees, counterclockwise from east.
+        distance (float): Distance to move.
+
+    Returns:
+        tuple[float, float]: The new position.
+    """
+    angle = radians(heading)
+    return x + distance * cos(angle), y + distance * sin(angle)
+
+
+@lru_cache(maxsize=8)
+def _unit_circle(steps: int) -> tuple:
+    return tuple((cos(2 * pi * index / steps), sin(2 * pi * index / steps)) for index in range(steps + 1))
+
+
+def circle_points(x: float, y: float, r: float, steps: int = CIRCLE_STEPS) -> list:
+    """Computes the corners of a regular polygon approximating a circle.
+
+    Args:
+        x (float): Horizontal position of the center.
+        y (float): Vertical position of the center (pointing up, as in turtle).
+        r (float): Radius.
+        steps (int): Number of polygon sides.
+
+    Returns:
+        list: steps + 1 (x, y) points; the last one closes the polygon at the first one.
+    """
+    return [(x + r * dx, y + r * dy) for dx, dy in _unit_circle(steps)]
+
+
+def ring_layout(values: list | tuple, names: list | tuple, ring_names: list | tuple, hints: list | tuple,
+                value_max: float, value_minTrue: float, text_conclusion: str, text_advice: str,
+                your_name: str, test_date: str, start: tuple | None = None,
+                ring_values: list | tuple | None = None, score_avr: float | None = None,
+                thresholds: list | tuple | None = None, profile_name: str | None = None,
+                hint_order: list | tuple | None = None) -> dict:
+    """Computes the drawing of a model with any number of overlapping circles.
+
+    The circles are drawn like in `ikidraw.ikigai_draw`: the turtle moves around a regular polygon
+    and draws a circle at every corner. Dimension k is labeled at 90 + k * 360 / N degrees and the
+    ring average of dimensions k and k + 1 between them.
+
+    Args:
+        values (list | tuple): The N values, counterclockwise starting at the top.
+        names (list | tuple): The N circle labels.
+        ring_names (list | tuple): The N labels of the overlaps (dimension k with k + 1, the last
+            one with the first one).
+        hints (list | tuple): The N advice hints shown outside the circles.
+        value_max (float): Maximum possible value for the evaluations.
+        value_minTrue (float): Minimum acceptable value for the evaluations.
+        text_conclusion (str): Conclusion text to display in the drawing.
+        text_advice (str): Advice text to display in the drawing.
+        your_name (str): Name of the user.
+        test_date (str): Date of the evaluation.
+        start (tuple | None): Start (x, y, heading) of the turtle path around the circles. By
+            default the circles are centered on the origin.
+        ring_values (list | tuple | None): The N overlap values, if they are not the means of the
+            neighbouring values (e.g. weighted by a scoring profile).
+        score_avr (float | None): The final score in the center, if it is not the mean of the values.
+        thresholds (list | tuple | None): Minimum acceptable value of each of the N values followed by
+            each of the N overlaps (e.g. the thresholds of a scoring profile). By default every
+            value is compared with `value_minTrue`.
+        profile_name (str | None): If given, the name of the scoring profile is shown under the date.
+        hint_order (list | tuple | None): Indices of the dimensions in the order their hints are
+            written (default: counterclockwise from the top).
+
+    Returns:
+        dict: 'circles' (list of circle centers), 'radius', 'texts' (list of `Text`) and
+            'personal' (list of `Text` with the name and date).
+    """
+    if __name__ == '__main__':
+        import ikidef  # Import for direct testing of this file.
+    else:
+        from src import ikidef  # Import for use within the main module.
+
+    mean = ikidef.statistics_module().mean
+    count = len(values)
+    turn = 360 / count
+    if ring_values is None:
+        ring_values = ikidef.consecutive_and_circular_averages(values)
+    if score_avr is None:
+        score_avr = mean(values)
+    if thresholds is None:
+        thresholds = (value_minTrue,) * (2 * count)
+    value_limits, ring_limits = thresholds[:count], thresholds[count:]
+
+    r = CIRCLE_RADIUS
+    move_circle = 30  # Distance between circles.
+    total_center = 10  # Offset for centering text and values.
+    dist = 1.2  # Distance multiplier for placing text inside circles.
+    under_names = 25  # Distance for placing text below circle labels.
+    LR_dist = 375  # Horizontal distance for side text.
+    UD_dist = 300  # Vertical distance for side text.
+
+    def color(value, limit=value_minTrue):
+        return color_name_by_limits(value, value_max, limit)
+
+    # Filled circles: one circle at every corner of the turtle path.
+    x, y, heading = start or (0, 0, -90)
+    circles = []
+    for _ in range(count):
+        heading += turn
+        x, y = move(x, y, heading, move_circle)
+        circles.append(move(x, y, heading + 90, r))  # turtle.circle(r) turns around the left side.
+
+    if start is None:  # Center the circles on the origin.
+        center_x = mean(x for x, _ in circles)
+        center_y = mean(y for _, y in circles)
+        circles = [(x - center_x, y - center_y) for x, y in circles]
+
+    texts = []
+    directions = [90 + index * turn for index in range(count)]
+
+    # Circle labels (still in the outline color) and values
+    for heading, name, value, limit in zip(directions, names, values, value_limits):
+        texts.append(Text(*move(0, 0, heading, dist * r), name, CIRCLE_OUTLINE, 14, 'bold'))
+        texts.append(Text(*move(0, -under_names, heading, dist * r), str(value), color(value, limit), 18, 'normal'))
+
+    # Final score in the center
+    texts.append(Text(0, -total_center, str(score_avr), color(score_avr), 18, 'normal'))
+
+    # Overlap labels and values, starting with the overlap of the last and first circle
+    for index in range(-1, count - 1):
+        heading = 90 + (index + 0.5) * turn
+        texts.append(Text(*move(0, -total_center, heading, dist * r / 2), ring_names[index], 'white', 14, 'bold'))
+        texts.append(Text(*move(0, -total_center - under_names, heading, dist * r / 2), str(ring_values[index]),
+                          color(ring_values[index], ring_limits[index]), 18, 'normal'))
+
+    # Hints around the circles, in the color of the last overlap value (as in `ikigai_draw`)
+    hint_color = color(ring_values[count - 2], ring_limits[count - 2])
+    for index in hint_order or range(count):
+        angle = radians(directions[index])
+        x, y = total_center + LR_dist * cos(angle), -total_center + UD_dist * sin(angle)
+        texts.append(Text(x, y, hints[index], hint_color, 12, 'normal'))
+
+    # Conclusion and advice (lower-right corner)
+    text_final = f'Conclusion:\n - {text_conclusion}\n\nAdvice:\n {text_advice}'
+    texts.append(Text(*move(0, 0, 143, -500), max_line_length(text_final, 70), 'black', 8, 'bold'))
+
+    # Scoring profile (under the name and date of `personal_texts`)
+    if profile_name is not None:
+        x, y = move(0, 0, 145, 450)
+        texts.append(Text(x, y - 150, f'Profile: {profile_name}', 'black', 12, 'bold'))
+
+    return {'circles': circles, 'radius': r, 'texts': texts, 'personal': personal_texts(your_name, test_date)}
+
+
+def ikigai_layout(value_love: float, value_good: float, value_money: float, value_world: float,
+                  value_max: float, value_minTrue: float, text_conclusion: str, text_advice: str,
+                  your_name: str, test_date: str, profile=None) -> dict:
+    """Computes what `ikidraw.ikigai_draw` draws, without drawing it.
+
+    The positions follow the turtle moves of `ikigai_draw` step by step, in turtle coordinates
+    (origin in the center, y pointing up), so that other renderers can reproduce the picture
+    without Tk.
+
+    Args:
+        value_love (float): User's evaluation for "What you love."
+        value_good (float): User's evaluation for "What you're good at."
+        value_money (float): User's evaluation for "What you can be paid for."
+        value_world (float): User's evaluation for "What the world needs."
+        value_max (float): Maximum possible value for the evaluations.
+        value_minTrue (float): Minimum acceptable value for the evaluations.
+        text_conclusion (str): Conclusion text to display in the drawing.
+        text_advice (str): Advice text to display in the drawing.
+        your_name (str): Name of the user.
+        test_date (str): Date of the evaluation.
+        profile (ikiprofile.Profile | None): Scoring profile whose weights give the PMVP values and
+            the final score and whose thresholds give the colors; its name is shown under the date
+            (default: the means and `value_minTrue` of the main module, without a name).
+
+    Returns:
+        dict: 'circles' (list of circle centers), 'radius', 'texts' (list of `Text`) and
+            'personal' (list of `Text` with the name and date).
+    """
+    ring_values = score_avr = thresholds = profile_name = None
+    if profile is not None:
+        if __name__ == '__main__':
+            import ikiprofile  # Import for direct testing of this file.
+        else:
+            from src import ikiprofile  # Import for use within the main module.
+
+        evaluator = ikiprofile.compile_profile(profile)
+        scores = evaluator.scores(value_love, value_world, value_money, value_good)
+        # Values in drawing order, overlaps in ring order: love-good, good-money, money-world, world-love
+        order = ('love', 'good', 'money', 'world', 'passion', 'profession', 'vocation', 'mission')
+        ring_values = tuple(scores[f'value_{name}'] for name in order[4:])
+        score_avr = scores['score_LWMG_avr']
+        thresholds = tuple(evaluator.thresholds[name] for name in order)
+        profile_name = evaluator.name
+
+    return ring_layout(
+        (value_love, value_good, value_money, value_world),
+        IKIGAI_NAMES, IKIGAI_RING_NAMES, IKIGAI_HINTS,
+        value_max, value_minTrue, text_conclusion, text_advice, your_name, test_date,
+        start=(-13, -16, -90 + 6),  # Offsets of `ikigai_draw` for centering the four circles.
+        ring_values=ring_values, score_avr=score_avr, thresholds=thresholds, profile_name=profile_name,
+        hint_order=IKIGAI_HINT_ORDER,
+    )
+
+
+def model_layout(model, values: list | tuple, value_max: float, value_minTrue: float, text_conclusion: str,
+                 text_advice: str, your_name: str, test_date: str, profile=None) -> dict:
+    """Computes the drawing of the answers of any model.
+
+    The model of the main module is drawn like `ikigai_layout`. The circles of other models are
+    drawn counterclockwise from the top in the order of the model, labeled with the upper-case
+    names and with the advice lines of the model as hints.
+
+    Args:
+        model (ikieval.Model): The model.
+        values (list | tuple): The answers, one per dimension of the model.
+        value_max (float): Maximum possible value for the evaluations.
+        value_minTrue (float): Minimum acceptable value for the evaluations.
+        text_conclusion (str): Conclusion text to display in the drawing.
+        text_advice (str): Advice text to display in the drawing.
+        your_name (str): Name of the user.
+        test_date (str): Date of the evaluation.
+        profile (ikiprofile.Profile | None): Scoring profile; its name is shown under the date
+            (see `ikiprofile.compile_model` for the profiles of other models).
+
+    Returns:
+        dict: The layout, as returned by `ring_layout`.
+    """
+    if __name__ == '__main__':
+        import ikieval  # Import for direct testing of this file.
+        import ikiprofile
     else:
-        return color('red')  # Below minimum limit is red.
+        from src import ikieval  # Import for use within the main module.
+        from src import ikiprofile
+
+    if model == ikieval.IKIGAI_MODEL:
+        value_love, value_world, value_money, value_good = values
+        return ikigai_layout(value_love, value_good, value_money, value_world, value_max, value_minTrue,
+                             text_conclusion, text_advice, your_name, test_date, profile)
+
+    ring_values = score_avr = thresholds = profile_name = None
+    if profile is not None:
+        evaluator = ikiprofile.compile_model(model, profile)
+        scores = evaluator.scores(*values)
+        ring_values = tuple(scores[f'value_{name}'] for name in model.ring_names)
+        score_avr = scores['score_LWMG_avr']
+        thresholds = tuple(evaluator.thresholds[name] for name in model.names + model.ring_names)
+        profile_name = evaluator.name
+
+    return ring_layout(
+        values, [name.upper() for name in model.names], [name.upper() for name in model.ring_names],
+        model.tries, value_max, value_minTrue, text_conclusion, text_advice, your_name, test_date,
+        ring_values=ring_values, score_avr=score_avr, thresholds=thresholds, profile_name=profile_name,
+    )
+
+
+def personal_texts(your_name: str, test_date: str) -> list:
+    """Computes the name and date texts of the layout (upper-left corner).
+
+    They are the only texts that differ between respondents with the same scores and advice.
+
+    Args:
+        your_name (str): Name of the user.
+        test_date (str): Date of the evaluation.
+
+    Returns:
+        list: The `Text` items.
+    """
+    x, y = move(0, 0, 145, 450)
+    return [
+        Text(x, y, 'IKIGAI - ', 'black', 20, 'bold'),
+        Text(x, y - 50, your_name, 'black', 20, 'bold'),
+        Text(x, y - 100, test_date, 'black', 20, 'bold'),
+    ]
+
+
+# Directions of the values in the drawing of `ikigai_draw`, by dimension
+IKIGAI_HEADINGS = {'love': 90, 'good': 180, 'money': 270, 'world': 360,
+                   'passion': 135, 'mission': 45, 'vocation': 315, 'profession': 225}
+
+
+def ordinal(number: int) -> str:
+    """Writes a number as an ordinal ('1st', '2nd', '73rd', '11th')."""
+    if number % 100 in (11, 12, 13):
+        return f'{number}th'
+    suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return f'{number}{suffix}'
+
+
+def percentile_texts(percentiles: dict) -> list:
+    """Computes the percentile texts shown under the values of the drawing of `ikigai_draw`.
+
+    Args:
+        percentiles (dict): Percentile ranks (0-100) by dimension ('love', 'passion', ...), e.g.
+            from `ikistats.PercentileIndex.of`. Missing dimensions and NaN ranks are not shown.
+
+    Returns:
+        list: The `Text` items.
+    """
+    r = CIRCLE_RADIUS
+    dist = 1.2  # Distance multiplier for placing text inside circles, as in `ikigai_layout`.
+    total_center = 10
+    under_values = 45  # Distance of the percentile below the value's anchor.
+
+    texts = []
+    for dimension, percentile in percentiles.items():
+        if dimension not in IKIGAI_HEADINGS or percentile != percentile:
+            continue
+        heading = IKIGAI_HEADINGS[dimension]
+        if dimension in ('love', 'good', 'money', 'world'):
+            x, y = move(0, -under_values, heading, dist * r)
+        else:
+            x, y = move(0, -total_center - under_values, heading, dist * r / 2)
+        texts.append(Text(x, y, f'{ordinal(round(percentile))} percentile', 'white', 10, 'normal'))
+    return texts
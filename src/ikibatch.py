@@ -0,0 +1,476 @@
+"""Batch module.
+
+Evaluates a CSV or JSONL file of answers without any interaction and writes the scores, conclusions
+and advice texts to an output stream. The file is processed as a generator pipeline in chunks of
+rows, so memory use does not depend on the file size.
+
+Usage:
+    python -m src.ikibatch answers.csv -o results.jsonl
+"""
+
+import csv
+import io
+import json
+import os
+import struct
+import sys
+from itertools import islice
+
+import numpy as np
+
+from src import ikieval, ikiprofile, ikiscore
+
+# Fields of the input file
+ANSWER_FIELDS = ikiscore.ANSWER_COLUMNS  # love, world, money, good
+YN_FIELDS = tuple(f'make_{name}' for name in ANSWER_FIELDS)  # Follow-up answers, yes/no.
+
+
+def result_fields(model: ikieval.Model = ikieval.IKIGAI_MODEL) -> tuple:
+    """Fields of the output records of a model.
+
+    The answers, the average and lowest answer, the ring values and their `ok_*` flags (rings in
+    the order of the model), the texts and the profile.
+    """
+    rings = tuple(model.ring_names[index] for index in model.ring_order)
+    return ('row', 'name', 'date', *model.names, 'score_LWMG_avr', 'score_LWMG_min', *rings,
+            *(f'ok_{ring}' for ring in rings), 'conclusion', 'advice', 'error', 'profile')
+
+
+# Fields of the output records
+RESULT_FIELDS = result_fields()  # row, name, date, love, ..., passion, ..., ok_passion, ..., profile
+
+ERROR_FIELDS = ('row', 'name', 'date', 'error', 'profile')  # Fields of the records of invalid rows.
+TEXT_FIELDS = ('name', 'date', 'conclusion', 'advice', 'error', 'profile')
+
+
+def _field_kinds(fields: tuple) -> tuple[tuple, tuple, dict]:
+    """Splits result fields into the float and bool fields and names the scores that fill them."""
+    bool_fields = tuple(field for field in fields if field.startswith('ok_'))
+    float_fields = tuple(field for field in fields if field not in ('row', *TEXT_FIELDS, *bool_fields))
+    score_names = {field: field if field in bool_fields or field.startswith('score_') else f'value_{field}'
+                   for field in float_fields + bool_fields}
+    return float_fields, bool_fields, score_names
+
+
+# Float and bool fields of the output records and the names of the result fields in the scores
+FLOAT_FIELDS, BOOL_FIELDS, SCORE_NAMES = _field_kinds(RESULT_FIELDS)
+
+CHUNK_SIZE = 4096  # Number of rows scored together.
+OUTPUT_BUFFER = 1 << 20  # Buffer size of output files in bytes.
+
+
+# READING -------------------------------------------------------------------------------------
+
+def read_answers(stream, file_format: str):
+    """Yields one dictionary of raw answers per row of a CSV or JSONL stream.
+
+    Args:
+        stream: Text stream to read from.
+        file_format (str): 'csv' (with a header line) or 'jsonl' (one JSON object per line).
+
+    Yields:
+        dict: The raw answers of one respondent.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    if file_format == 'csv':
+        yield from csv.DictReader(stream)
+    elif file_format == 'jsonl':
+        for line in stream:
+            if line.strip():  # Skip empty lines.
+                yield json.loads(line)
+    else:
+        raise ValueError(f"Unsupported file format '{file_format}'. Use 'csv' or 'jsonl'.")
+
+
+def parse_yn(answer) -> bool:
+    """Converts a follow-up answer to a boolean.
+
+    Accepts the answers of the questionnaire ('yes'/'no') and JSON booleans. A missing or empty
+    answer counts as 'no'.
+
+    Args:
+        answer: The raw answer.
+
+    Returns:
+        bool: True for a positive answer, False for a negative one.
+
+    Raises:
+        ValueError: If the answer is neither positive nor negative.
+    """
+    if answer is None or answer == '' or answer is False or answer == ikieval.negative:
+        return False
+    if answer is True or answer == ikieval.positive:
+        return True
+    raise ValueError(f"Answer {ikieval.positive}/{ikieval.negative}, not '{answer}'.")
+
+
+# EVALUATION ----------------------------------------------------------------------------------
+
+def evaluate_batches(rows, value_min: float = ikieval.value_min, value_max: float = ikieval.value_max,
+                     value_minTrue: float = ikieval.value_minTrue, chunk_size: int = CHUNK_SIZE,
+                     profile: ikiprofile.Profile | None = None, model: ikieval.Model = ikieval.IKIGAI_MODEL):
+    """Evaluates rows of raw answers and yields the results of every chunk of rows as columns.
+
+    Rows are validated column by column with `ikiscore.validate_answers`, scored in chunks with
+    the evaluator of the scoring profile (`ikiscore.score_batch` for the default weights) and the
+    texts are looked up in `ikieval.decision_table`.
+
+    Args:
+        rows: Iterable of dictionaries with raw answers.
+        value_min (float): The minimum allowable value.
+        value_max (float): The maximum allowable value.
+        value_minTrue (float): Threshold for a "true" evaluation.
+        chunk_size (int): Number of rows scored together.
+        profile (ikiprofile.Profile | None): Scoring profile. If given, its limits, thresholds and
+            weights replace `value_min`, `value_max` and `value_minTrue`.
+        model (ikieval.Model): Model of the answers: one answer column and one `make_<name>`
+            column per dimension (see `ikiprofile.compile_model` for the profiles of other models).
+
+    Yields:
+        dict: The columns of `result_fields(model)` for one chunk: NumPy arrays for the numbers (NaN
+            for invalid rows) and the `ok_*` flags, lists of strings for the texts. Invalid rows
+            have an 'error' and empty conclusion and advice texts. Every row has the name of the
+            profile ('profile').
+    """
+    if profile is None:
+        profile = ikiprofile.profile_from_dict({'value_min': value_min, 'value_max': value_max,
+                                                'value_minTrue': value_minTrue}, name='default')
+    evaluator = ikiprofile.compile_model(model, profile)  # Compiled once per model and profile.
+    value_min, value_max = evaluator.value_min, evaluator.value_max
+    float_fields, bool_fields, score_names = _field_kinds(result_fields(model))
+    yn_fields = tuple(f'make_{name}' for name in model.names)
+
+    numbered = enumerate(rows, start=1)
+
+    while chunk := list(islice(numbered, chunk_size)):
+        numbers, rows_chunk = zip(*chunk)
+        errors = {}  # First error of each invalid row, by index in the chunk.
+
+        # Validate the chunk column by column with the rules of `ikidef.ask_for_number`
+        columns = []
+        for field in model.names:
+            raw = [row.get(field) for row in rows_chunk]
+            for index, value in enumerate(raw):
+                if value is None:
+                    errors.setdefault(index, f"Missing answer '{field}'.")
+
+            validation = ikiscore.validate_answers(raw, value_min, value_max)
+            for index, _, message in validation.errors:
+                errors.setdefault(index, f"'{field}': {message}")
+            columns.append(validation.values)
+
+        make = np.zeros((len(chunk), len(yn_fields)), dtype=bool)
+        for index, row in enumerate(rows_chunk):
+            try:
+                make[index] = [parse_yn(row.get(field)) for field in yn_fields]
+            except ValueError as error:
+                errors.setdefault(index, str(error))
+
+        valid = np.ones(len(chunk), dtype=bool)
+        valid[list(errors)] = False
+
+        batch = {
+            'row': np.array(numbers, dtype=np.int64),
+            'name': [row.get('name', '') for row in rows_chunk],
+            'date': [row.get('date', '') for row in rows_chunk],
+            **{field: np.full(len(chunk), np.nan) for field in float_fields},
+            **{field: np.zeros(len(chunk), dtype=bool) for field in bool_fields},
+            'conclusion': [''] * len(chunk),
+            'advice': [''] * len(chunk),
+            'error': [errors.get(index, '') for index in range(len(chunk))],
+            'profile': [evaluator.name] * len(chunk),
+        }
+
+        if valid.any():
+            scores = evaluator.score_batch(np.column_stack(columns)[valid])
+            keys = ikieval.decision_key(scores, make[valid].T, value_max, model).tolist()
+            table = ikieval.decision_table(model)
+
+            for field, score in score_names.items():
+                batch[field][valid] = scores[score]
+
+            positions = np.flatnonzero(valid).tolist()
+            for position, key in zip(positions, keys):
+                decision = table[key]
+                batch['conclusion'][position] = decision.text_conclusion
+                batch['advice'][position] = decision.text_advice
+
+        yield batch
+
+
+def _batch_lists(batch: dict, fields: tuple = RESULT_FIELDS) -> tuple[dict, list]:
+    """Converts the columns of a batch to lists of Python values and finds the invalid rows."""
+    columns = {field: batch[field].tolist() if isinstance(batch[field], np.ndarray) else batch[field]
+               for field in fields}
+    return columns, [index for index, error in enumerate(columns['error']) if error]
+
+
+def evaluate_rows(rows, value_min: float = ikieval.value_min, value_max: float = ikieval.value_max,
+                  value_minTrue: float = ikieval.value_minTrue, chunk_size: int = CHUNK_SIZE,
+                  profile: ikiprofile.Profile | None = None, model: ikieval.Model = ikieval.IKIGAI_MODEL):
+    """Evaluates rows of raw answers and yields one result record per row.
+
+    Invalid rows yield a record with only the row number, name, date, error and profile.
+
+    Args:
+        rows: Iterable of dictionaries with raw answers.
+        value_min (float): The minimum allowable value.
+        value_max (float): The maximum allowable value.
+        value_minTrue (float): Threshold for a "true" evaluation.
+        chunk_size (int): Number of rows scored together.
+        profile (ikiprofile.Profile | None): Scoring profile (see `evaluate_batches`).
+        model (ikieval.Model): Model of the answers (see `evaluate_batches`).
+
+    Yields:
+        dict: The result record of one row, with the keys of `result_fields(model)`.
+    """
+    result = result_fields(model)
+    for batch in evaluate_batches(rows, value_min, value_max, value_minTrue, chunk_size, profile, model):
+        columns, invalid = _batch_lists(batch, result)
+        invalid = set(invalid)
+        for index in range(len(columns['row'])):
+            fields = ERROR_FIELDS if index in invalid else result
+            yield {field: columns[field][index] for field in fields}
+
+
+# WRITING -------------------------------------------------------------------------------------
+
+def write_results(results, stream, file_format: str, fields: tuple = RESULT_FIELDS) -> int:
+    """Writes result records to a stream as CSV or JSONL.
+
+    Args:
+        results: Iterable of result records.
+        stream: Text stream to write to.
+        file_format (str): 'csv' or 'jsonl'.
+        fields (tuple): Columns of the CSV output (`result_fields` of the model).
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    count = 0
+
+    if file_format == 'csv':
+        writer = csv.DictWriter(stream, fieldnames=fields, restval='')
+        writer.writeheader()
+        for count, record in enumerate(results, start=1):
+            writer.writerow(record)
+    elif file_format == 'jsonl':
+        for count, record in enumerate(results, start=1):
+            stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+    else:
+        raise ValueError(f"Unsupported file format '{file_format}'. Use 'csv' or 'jsonl'.")
+
+    return count
+
+
+def write_batches(batches, stream, file_format: str, fields: tuple = RESULT_FIELDS) -> int:
+    """Writes result columns (from `evaluate_batches`) to a stream as CSV or JSONL.
+
+    Every batch is formatted in memory and written with a single call, and the output is the same
+    as that of `write_results` for the same rows.
+
+    Args:
+        batches: Iterable of result columns.
+        stream: Text stream to write to.
+        file_format (str): 'csv' or 'jsonl'.
+        fields (tuple): The result fields (`result_fields` of the model).
+
+    Returns:
+        int: The number of records written.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    if file_format not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported file format '{file_format}'. Use 'csv' or 'jsonl'.")
+
+    count = 0
+    if file_format == 'csv':
+        stream.write(','.join(fields) + '\r\n')  # The header of `csv.DictWriter`.
+
+    for batch in batches:
+        columns, invalid = _batch_lists(batch, fields)
+        rows = list(zip(*(columns[field] for field in fields)))
+
+        if file_format == 'csv':
+            for index in invalid:  # Only the error fields, the others are written as empty fields.
+                rows[index] = tuple(value if field in ERROR_FIELDS else None
+                                    for field, value in zip(fields, rows[index]))
+
+            buffer = io.StringIO()
+            csv.writer(buffer).writerows(rows)
+            stream.write(buffer.getvalue())
+        else:
+            records = [dict(zip(fields, row)) for row in rows]
+            for index in invalid:
+                records[index] = {field: records[index][field] for field in ERROR_FIELDS}
+            stream.write(''.join(json.dumps(record, ensure_ascii=False) + '\n' for record in records))
+
+        count += len(rows)
+
+    return count
+
+
+class NpyColumnWriter:
+    """Writes result columns into a directory with one NumPy .npy file per field.
+
+    The files are appended batch by batch (one write per file and batch) and can be loaded with
+    `np.load(path, mmap_mode='r')`. Numbers are float64 (NaN for invalid rows), 'row' is int64
+    and the `ok_*` flags are bool. Texts are dictionary-encoded: `<field>.npy` holds int32 codes
+    into `<field>.labels.npy`, so `labels[codes]` gives the texts.
+
+    Args:
+        directory (str): Output directory (created if missing).
+        fields (tuple): The result fields (`result_fields` of the model).
+    """
+
+    HEADER_SIZE = 128  # Fixed .npy header size, so that the row count can be filled in at the end.
+
+    def __init__(self, directory: str, fields: tuple = RESULT_FIELDS):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.fields = fields
+        self.count = 0
+        self._labels = {field: {} for field in TEXT_FIELDS}
+        bool_fields = _field_kinds(fields)[1]
+        self._dtypes = {field: np.dtype(np.int32 if field in TEXT_FIELDS else np.bool_ if field in bool_fields
+                                        else np.int64 if field == 'row' else np.float64)
+                        for field in fields}
+        self._files = {}
+        for field in fields:
+            self._files[field] = open(os.path.join(directory, f'{field}.npy'), 'wb')
+            self._files[field].write(self._header(field, 0))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _header(self, field: str, count: int) -> bytes:
+        """The .npy (version 1.0) header of a column with `count` rows."""
+        header = repr({'descr': np.lib.format.dtype_to_descr(self._dtypes[field]), 'fortran_order': False,
+                       'shape': (count,)})
+        header = header.ljust(self.HEADER_SIZE - 11) + '\n'
+        return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header.encode('latin1')
+
+    def write(self, batch: dict):
+        """Appends the result columns of one batch."""
+        for field in self.fields:
+            column = batch[field]
+            if field in TEXT_FIELDS:
+                labels = self._labels[field]
+                column = [labels.setdefault(text, len(labels)) for text in column]
+            self._files[field].write(np.asarray(column, dtype=self._dtypes[field]).tobytes())
+        self.count += len(batch['row'])
+
+    def close(self):
+        """Fills in the row counts and writes the label files."""
+        for field, file in self._files.items():
+            if file.closed:
+                continue
+            file.seek(0)
+            file.write(self._header(field, self.count))
+            file.close()
+
+        for field, labels in self._labels.items():
+            np.save(os.path.join(self.directory, f'{field}.labels.npy'), np.array(list(labels), dtype=str))
+
+
+def write_npy_columns(batches, directory: str, fields: tuple = RESULT_FIELDS) -> int:
+    """Writes result columns (from `evaluate_batches`) as .npy files, see `NpyColumnWriter`.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with NpyColumnWriter(directory, fields) as writer:
+        for batch in batches:
+            writer.write(batch)
+    return writer.count
+
+
+def format_from_path(path: str) -> str:
+    """Guesses the file format from the file extension ('csv' unless the file ends with .jsonl/.json)."""
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.json')) else 'csv'
+
+
+def run_batch(input_path: str, output, input_format: str | None = None, output_format: str = 'jsonl',
+              profile: ikiprofile.Profile | None = None, model: ikieval.Model = ikieval.IKIGAI_MODEL) -> int:
+    """Evaluates an answers file and writes the results.
+
+    Args:
+        input_path (str): Path to the CSV or JSONL answers file.
+        output: Text stream for 'csv' and 'jsonl' results, directory path for 'npy' results.
+        input_format (str | None): 'csv' or 'jsonl'; guessed from the extension if None.
+        output_format (str): 'csv', 'jsonl' or 'npy' (one .npy file per field, see `NpyColumnWriter`).
+        profile (ikiprofile.Profile | None): Scoring profile (default: the rules of the main module).
+        model (ikieval.Model): Model of the answers (default: the four dimensions of the main module).
+
+    Returns:
+        int: The number of records written.
+    """
+    input_format = input_format or format_from_path(input_path)
+    fields = result_fields(model)
+
+    with open(input_path, newline='', encoding='utf-8') as stream:
+        batches = evaluate_batches(read_answers(stream, input_format), profile=profile, model=model)
+        if output_format == 'npy':
+            return write_npy_columns(batches, output, fields)
+        return write_batches(batches, output, output_format, fields)
+
+
+def model_from_names(parser, names: str | None) -> ikieval.Model:
+    """Builds the model of a `--dimensions` option (the main module's model if it is not given)."""
+    if not names:
+        return ikieval.IKIGAI_MODEL
+    try:
+        return ikieval.make_model(name.strip() for name in names.split(','))
+    except ValueError as error:
+        parser.error(f'invalid dimensions: {error}')
+
+
+def main(argv: list | None = None) -> int:
+    """Command line entry point of the batch mode."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Evaluate an IKIGAI answers file without interaction.')
+    parser.add_argument('input', help='CSV or JSONL file with the answers')
+    parser.add_argument('-o', '--output', help='output file, or directory for npy (default: standard output)')
+    parser.add_argument('--input-format', choices=('csv', 'jsonl'), help='default: from the extension')
+    parser.add_argument('--output-format', choices=('csv', 'jsonl', 'npy'), help='default: from the extension')
+    parser.add_argument('--profile', metavar='PATH', help='JSON scoring profile (limits, thresholds and weights)')
+    parser.add_argument('--dimensions', metavar='NAMES',
+                        help='comma-separated answer columns of a model with other dimensions, in ring order '
+                             '(default: love,world,money,good)')
+    args = parser.parse_args(argv)
+
+    profile = None
+    if args.profile:
+        try:
+            profile = ikiprofile.load_profile(args.profile)
+        except (OSError, ValueError) as error:
+            parser.error(f'invalid profile: {error}')
+
+    model = model_from_names(parser, args.dimensions)
+
+    if args.output_format == 'npy':
+        if not args.output:
+            parser.error('the npy output format needs an output directory (-o)')
+        run_batch(args.input, args.output, args.input_format, 'npy', profile, model)
+    elif args.output:
+        output_format = args.output_format or format_from_path(args.output)
+        with open(args.output, 'w', newline='', encoding='utf-8', buffering=OUTPUT_BUFFER) as output:
+            run_batch(args.input, output, args.input_format, output_format, profile, model)
+    else:
+        run_batch(args.input, sys.stdout, args.input_format, args.output_format or 'jsonl', profile, model)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Render cache module.
+
+Scores are bounded and usually whole numbers, and the conclusion and advice texts come from a small
+set of messages, so many reports share the same drawing except for the name and date. This module
+caches the shared part of a rendering, keyed by a hash of everything it depends on, in a bounded
+in-memory LRU cache that can optionally be persisted to a directory.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+
+def render_key(value_love: float, value_good: float, value_money: float, value_world: float,
+               value_max: float, value_minTrue: float, text_conclusion: str, text_advice: str,
+               profile=None) -> str:
+    """Computes the cache key of the shared part of a drawing.
+
+    Values are hashed by their `repr`, because 7 and 7.0 are drawn differently ('7' and '7.0').
+    A scoring profile (`ikiprofile.Profile`) changes the values, colors and texts, so it is part
+    of the key.
+
+    Returns:
+        str: A hexadecimal SHA-256 digest.
+    """
+    content = repr((value_love, value_good, value_money, value_world, value_max, value_minTrue,
+                    text_conclusion, text_advice) + (() if profile is None else (tuple(profile),)))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """Bounded LRU cache of rendered drawings, optionally persisted to a directory.
+
+    Args:
+        max_entries (int): Maximum number of entries kept in memory.
+        directory (str | None): If given, entries are also stored in this directory (one file per
+            key) and read back from it when they are not in memory.
+        suffix (str): File suffix of persisted entries.
+    """
+
+    def __init__(self, max_entries: int = 1024, directory: str | None = None, suffix: str = '.svg'):
+        if max_entries < 1:
+            raise ValueError("The cache must hold at least one entry.")
+
+        self.max_entries = max_entries
+        self.directory = directory
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def get(self, key: str) -> str | None:
+        """Gets a cached entry and marks it as recently used.
+
+        Args:
+            key (str): The key from `render_key`.
+
+        Returns:
+            str | None: The cached entry, or None if it is not cached.
+        """
+        entry = self._entries.get(key)
+
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.directory is not None:
+            try:
+                with open(self._path(key), encoding='utf-8') as file:
+                    entry = file.read()
+            except FileNotFoundError:
+                pass
+            else:
+                self._remember(key, entry)
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: str):
+        """Stores an entry, evicting the least recently used one if the cache is full.
+
+        Args:
+            key (str): The key from `render_key`.
+            entry (str): The rendered part of the drawing.
+        """
+        self._remember(key, entry)
+
+        if self.directory is not None:
+            # Write to a temporary file first so readers never see a partial entry.
+            temporary = f'{self._path(key)}.{os.getpid()}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                file.write(entry)
+            os.replace(temporary, self._path(key))
+
+    def _remember(self, key: str, entry: str):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)  # Evict the least recently used entry.
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache (0 if nothing was looked up yet)."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
@@ -1,8 +1,15 @@
 """Function module for the main module."""
 
+try:
+    from src import ikimetrics
+except ImportError:
+    import ikimetrics  # Import for direct testing from the src folder.
+
+_statistics = None  # The statistics module, once a mean was needed (see `statistics_module`).
+
 # USER DATA -----------------------------------------------------------------------------------
 
-def input_limit(question: str, min_length: int, max_length: int) -> str:
+def input_limit(question: str, min_length: int, max_length: int, source=None, sink=None) -> str:
     """Gets user input with a defined minimum and maximum number of characters.
     
     A while loop is used to validate the input, with printed instructions for the user.
@@ -11,22 +18,32 @@ def input_limit(question: str, min_length: int, max_length: int) -> str:
         question (str): The question to prompt the user.
         min_length (int): The minimum number of characters allowed.
         max_length (int): The maximum number of characters allowed.
+        source (callable | None): Source of the answers, called with the question like `input`
+            (default: `input`). See `answers_from` and `Transcript`.
+        sink (callable | None): Output of the instructions, called like `print` (default: `print`).
 
     Returns:
         str: The validated user input.
     """
+    source = source or input
+    sink = sink or print
+
     question = question + ' '  # Add a space after the question for better formatting.
-    user_input = input(question)
+    user_input = source(question)
+    started = ikimetrics.clock()
     length_input = len(user_input)
+    ikimetrics.record('validation', started)
 
     while length_input < min_length or length_input > max_length:
         msg_length = (
             f"Your input must be between {min_length} and {max_length} characters long. "
             f"Your answer '{user_input}' is not. Try again."
         )
-        print(msg_length)
-        user_input = input(question)
+        sink(msg_length)
+        user_input = source(question)
+        started = ikimetrics.clock()
         length_input = len(user_input)
+        ikimetrics.record('validation', started)
     
     return user_input
 
@@ -83,33 +100,55 @@ def is_it_number(value, msg_value: str):
         return msg_value
 
 
-def ask_for_number(question: str, value_min: float, value_max: float) -> float:
+def ask_for_number(question: str, value_min: float, value_max: float, source=None, sink=None) -> float:
     """Prompts the user for a number within a specified range and returns the input as a float.
 
     Args:
         question (str): The question to prompt the user.
         value_min (float): The minimum allowable value.
         value_max (float): The maximum allowable value.
+        source (callable | None): Source of the answers, called with the question like `input`
+            (default: `input`).
+        sink (callable | None): Output of the error messages, called like `print` (default: `print`).
 
     Returns:
         float: The validated number input from the user.
     """
+    source = source or input
+    sink = sink or print
+
     while True:
         question = f'Answer within the range {value_min}-{value_max}: {question} '
-        value = input(question)
+        value = source(question)
+        started = ikimetrics.clock()  # Time the validation, not the wait for the answer.
         msg_value = f"You must enter a number. '{value}' is not a number! Try again."
         value = is_it_number(value, msg_value)
+        ikimetrics.record('validation', started)
 
         if value == msg_value:
-            print(msg_value)
+            sink(msg_value)
         else:
             if value_min <= value <= value_max:  # Check if the value is within the range.
                 return value
             
             msg_limit = f"Your answer '{value}' is out of range! Try again."
-            print(msg_limit)  # Notify the user if the value is out of range.
+            sink(msg_limit)  # Notify the user if the value is out of range.
+
+
+def statistics_module():
+    """Returns the `statistics` module, imported once per process on the first call.
+
+    The statistics module takes longer to import than the rest of the engine (see
+    `tests/test_main.py`), so it is only loaded when a mean is needed.
+    """
+    global _statistics
+    if _statistics is None:
+        import statistics
+        _statistics = statistics
+    return _statistics
 
 
+@ikimetrics.timed('scoring')
 def get_sum_avg_min(data: list | tuple) -> tuple[float, float, float]:
     """
     Calculates the sum, average, and minimum value from a list or tuple of numbers.
@@ -124,8 +163,6 @@ def get_sum_avg_min(data: list | tuple) -> tuple[float, float, float]:
         ValueError: If the input is not a list or tuple, or if it contains non-numeric elements.
         ValueError: If the input list or tuple is empty.
     """
-    from statistics import mean
-
     # Validate that the input is either a list or tuple
     if not isinstance(data, (list, tuple)):
         raise ValueError("Input must be a list or tuple of numbers.")
@@ -140,11 +177,12 @@ def get_sum_avg_min(data: list | tuple) -> tuple[float, float, float]:
 
     # Perform calculations: sum, average, and minimum
     data_sum = sum(data)
-    data_avr = mean(data)  
+    data_avr = statistics_module().mean(data)
     data_min = min(data)  
 
     return data_sum, data_avr, data_min
 
+@ikimetrics.timed('scoring')
 def consecutive_and_circular_averages(datalist: list| tuple) -> list:
     """
     Calculates the averages between every two consecutive elements in a tuple.
@@ -155,7 +193,7 @@ def consecutive_and_circular_averages(datalist: list| tuple) -> list:
     Returns:
         list: A list of averages between consecutive elements.
     """
-    from statistics import mean
+    mean = statistics_module().mean
 
     # Return an empty list if the tuple is too short to calculate averages
     if len(datalist) < 2:
@@ -198,7 +236,7 @@ def true_or_not(value: float, min_true: float) -> bool:
     return value >= min_true
 
 
-def ask_for_yn(yn_question: str, positive: str, negative: str, msg_error: str) -> bool:
+def ask_for_yn(yn_question: str, positive: str, negative: str, msg_error: str, source=None, sink=None) -> bool:
     """Prompts the user for a yes/no answer and returns True or False based on the response.
 
     Args:
@@ -206,17 +244,98 @@ def ask_for_yn(yn_question: str, positive: str, negative: str, msg_error: str) -
         positive (str): The string representing a positive response.
         negative (str): The string representing a negative response.
         msg_error (str): The error message to display for invalid input.
+        source (callable | None): Source of the answers, called with the question like `input`
+            (default: `input`).
+        sink (callable | None): Output of the error message, called like `print` (default: `print`).
 
     Returns:
         bool: True for a positive response, False for a negative response.
     """
+    source = source or input
+    sink = sink or print
+
     while True:
         yn_question = yn_question + ' '  # Add a space after the question for better formatting.
-        answer = input(yn_question)
+        answer = source(yn_question)
+        started = ikimetrics.clock()  # Time the validation, not the wait for the answer.
+        is_positive, is_negative = answer == positive, answer == negative
+        ikimetrics.record('validation', started)
 
-        if answer == positive:
+        if is_positive:
             return True
-        if answer == negative:
+        if is_negative:
             return False
         
-        print(msg_error)
+        sink(msg_error)
+
+
+# ANSWER SOURCES ------------------------------------------------------------------------------
+
+def answers_from(answers):
+    """Makes an answer source for the prompt functions from recorded answers.
+
+    Args:
+        answers: An iterable of answers, or a `queue.Queue` (or `queue.SimpleQueue`) filled by
+            another thread, read with its blocking `get`.
+
+    Returns:
+        callable: A source that takes the question (like `input`) and returns the next answer.
+
+    Raises:
+        TypeError: If the answers can only be read asynchronously (e.g. an `asyncio.Queue`): the
+            prompt functions cannot await them, use `ikiservice` instead.
+        EOFError: From the source, when the answers run out (like `input` at the end of a file).
+    """
+    import inspect
+    import queue
+
+    if isinstance(answers, (queue.Queue, queue.SimpleQueue)):
+        return lambda question='': answers.get()
+
+    if inspect.iscoroutinefunction(getattr(answers, 'get', None)) or hasattr(answers, '__aiter__'):
+        raise TypeError(f"{type(answers).__name__} answers can only be awaited; "
+                        "run asynchronous sessions with ikiservice instead.")
+
+    answers = iter(answers)
+
+    def source(question=''):
+        try:
+            return next(answers)
+        except StopIteration:
+            raise EOFError("No more answers.") from None
+
+    return source
+
+
+class Transcript:
+    """Records a session: every question asked, every answer given and everything printed.
+
+    Use `source` and `sink` with the prompt functions. A transcript can be replayed with
+    `answers_from(transcript.answers)`.
+
+    Args:
+        answers: Answers to give (an iterable or a queue, see `answers_from`). Without answers,
+            they are read with `input` and recorded.
+    """
+
+    def __init__(self, answers=None):
+        self._next_answer = input if answers is None else answers_from(answers)
+        self.questions = []
+        self.answers = []
+        self.lines = []  # Everything that was printed, as (sep-joined text, end) pairs.
+
+    def source(self, question: str = '') -> str:
+        """Gives the next answer and records it."""
+        self.questions.append(question)
+        answer = self._next_answer(question)
+        self.answers.append(answer)
+        return answer
+
+    def sink(self, *values, sep: str = ' ', end: str = '\n', **kwargs):
+        """Records printed values, with the arguments of `print`."""
+        self.lines.append((sep.join(map(str, values)), end))
+
+    @property
+    def output(self) -> str:
+        """Everything that was printed, as one text."""
+        return ''.join(text + end for text, end in self.lines)
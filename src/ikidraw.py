@@ -6,7 +6,8 @@ the user's evaluation in the form of overlapping circles, highlighting key areas
 
 def ikigai_draw(value_love: float, value_good: float, value_money: float, value_world: float, 
                 value_max: float, value_minTrue: float, text_conclusion: str, text_advice: str, 
-                your_name: str, test_date: str):
+                your_name: str, test_date: str, percentiles: dict | None = None, instant: bool = False,
+                profile=None):
     """Draws Ikigai circles based on user evaluation.
 
     This function uses the Turtle graphics library to create a visual representation of the user's 
@@ -24,34 +25,55 @@ def ikigai_draw(value_love: float, value_good: float, value_money: float, value_
         text_advice (str): Advice text to display in the drawing.
         your_name (str): Name of the user.
         test_date (str): Date of the evaluation.
+        percentiles (dict | None): If given, percentile ranks by dimension ('love', 'passion', ...)
+            shown under the values (see `ikistats.PercentileIndex.of`).
+        instant (bool): Whether the drawing appears at once instead of being animated (see `draw_layout`).
+        profile (ikiprofile.Profile | None): Scoring profile whose weights give the PMVP values and
+            the final score and whose thresholds give the colors; its name is shown under the date
+            (default: the means and `value_minTrue` of the main module, without a name).
     """
     import turtle
 
     if __name__ == '__main__':
         import drawdef  # Import for direct testing of this file.
+        import ikimetrics
     else:
         from src import drawdef  # Import for use within the main module.
+        from src import ikimetrics
+
+    started = ikimetrics.clock()  # The drawing stage ends before waiting for the click.
 
     msg_check_draw = 'Do not forget to check the Ikigai drawing with the results in the pop-up window.'
     print('\n\n', msg_check_draw)
 
-    # CALCULATIONS FOR EVALUATION --------------------------------------------------------
-    from statistics import mean
-
-    LWMG = (value_love, value_world, value_good, value_money)
-    score_LWMG_avr = mean(LWMG)
-
-    passion = (value_good, value_love)
-    value_passion = mean(passion)
-
-    mission = (value_world, value_love)
-    value_mission = mean(mission)
+    if instant:
+        layout = drawdef.ikigai_layout(value_love, value_good, value_money, value_world, value_max,
+                                       value_minTrue, text_conclusion, text_advice, your_name, test_date,
+                                       profile)
+        draw_layout(layout, percentiles)
+        ikimetrics.record('drawing', started)
+        turtle.exitonclick()
+        return
 
-    vocation = (value_world, value_money)
-    value_vocation = mean(vocation)
-
-    profession = (value_good, value_money)
-    value_profession = mean(profession)
+    # CALCULATIONS FOR EVALUATION --------------------------------------------------------
+    if __name__ == '__main__':
+        import ikiprofile
+    else:
+        from src import ikiprofile
+
+    # LWMG average and PMVP values (means of the neighbouring circles, unless a profile weighs them)
+    evaluator = ikiprofile.compile_profile(profile or ikiprofile.DEFAULT_PROFILE)
+    scores = evaluator.scores(value_love, value_world, value_money, value_good)
+    score_LWMG_avr = scores['score_LWMG_avr']
+    value_passion = scores['value_passion']
+    value_mission = scores['value_mission']
+    value_vocation = scores['value_vocation']
+    value_profession = scores['value_profession']
+
+    # Minimum acceptable value of every dimension (the thresholds of the scoring profile, if any)
+    limits = dict.fromkeys(evaluator.thresholds, value_minTrue)
+    if profile is not None:
+        limits.update(evaluator.thresholds)
 
     # DRAWING SETTINGS -------------------------------------------------------------------
     turtle.speed(0)  # 0 = fastest, 1 = slowest, 10 = fast.
@@ -143,10 +165,11 @@ def ikigai_draw(value_love: float, value_good: float, value_money: float, value_
     turtle.forward(under_names)
     turtle.left(90)
 
-    for ikig_ask in (value_love, value_good, value_money, value_world):
+    for ikig_ask, limit in zip((value_love, value_good, value_money, value_world),
+                               (limits['love'], limits['good'], limits['money'], limits['world'])):
         turtle.left(90)
         turtle.forward(dist * r)
-        drawdef.color_by_limits(ikig_ask, value_max, value_minTrue)
+        drawdef.color_by_limits(ikig_ask, value_max, limit)
         turtle.write(ikig_ask, font=('Arial', 18, 'normal'), align='center')
         turtle.back(dist * r)
 
@@ -176,13 +199,22 @@ def ikigai_draw(value_love: float, value_good: float, value_money: float, value_
     turtle.forward(total_center + under_names)
     turtle.left(45)
 
-    for side_values in (value_mission, value_passion, value_profession, value_vocation):
-        drawdef.color_by_limits(side_values, value_max, value_minTrue)
+    for side_values, side_limit in zip((value_mission, value_passion, value_profession, value_vocation),
+                                       (limits['mission'], limits['passion'], limits['profession'],
+                                        limits['vocation'])):
+        drawdef.color_by_limits(side_values, value_max, side_limit)
         turtle.left(90)
         turtle.forward(dist * r / 2)
         turtle.write(side_values, font=('Arial', 18, 'normal'), align='center')
         turtle.back(dist * r / 2)
 
+    # DISPLAYING PERCENTILES -----------------------------------------------------------
+    for text in drawdef.percentile_texts(percentiles or {}):
+        turtle.penup()
+        turtle.goto(text.x, text.y)
+        turtle.color(text.color)
+        turtle.write(text.text, font=('Arial', text.size, text.weight), align='center')
+
     # DISPLAYING TEXT AROUND CIRCLES -----------------------------------------------------
     turtle.home()
     turtle.forward(total_center)
@@ -192,7 +224,7 @@ def ikigai_draw(value_love: float, value_good: float, value_money: float, value_
     turtle.color('black')
 
     for leftright in (text_right_world, text_left_good):
-        drawdef.color_by_limits(side_values, value_max, value_minTrue)
+        drawdef.color_by_limits(side_values, value_max, side_limit)
         turtle.forward(LR_dist)
         turtle.write(leftright, font=('Arial', 12, 'normal'), align='center')
         turtle.back(LR_dist)
@@ -201,7 +233,7 @@ def ikigai_draw(value_love: float, value_good: float, value_money: float, value_
     turtle.left(90)
 
     for updown in (text_up_love, text_down_money):
-        drawdef.color_by_limits(side_values, value_max, value_minTrue)
+        drawdef.color_by_limits(side_values, value_max, side_limit)
         turtle.forward(UD_dist)
         turtle.write(updown, font=('Arial', 12, 'normal'), align='center')
         turtle.back(UD_dist)
@@ -220,6 +252,9 @@ def ikigai_draw(value_love: float, value_good: float, value_money: float, value_
     turtle.write(your_name, font=('Arial', 20, 'bold'), align='center')
     turtle.forward(50)
     turtle.write(test_date, font=('Arial', 20, 'bold'), align='center')
+    if profile is not None:
+        turtle.forward(50)
+        turtle.write(f'Profile: {profile.name}', font=('Arial', 12, 'bold'), align='center')
 
     # Conclusion and advice (lower-right corner).
     turtle.home()
@@ -228,9 +263,200 @@ def ikigai_draw(value_love: float, value_good: float, value_money: float, value_
     turtle.back(500)
     turtle.write(drawdef.max_line_length(text_final, 70), font=('Arial', 8, 'bold'), align='center')
 
+    ikimetrics.record('drawing', started)
     turtle.exitonclick()
 
 
+def ring_draw(model, values: list | tuple, value_max: float, value_minTrue: float, text_conclusion: str,
+              text_advice: str, your_name: str, test_date: str, percentiles: dict | None = None,
+              instant: bool = False, profile=None):
+    """Draws the circles of any model based on user evaluation.
+
+    The model of the main module is drawn by `ikigai_draw`; other models are drawn at once with
+    `draw_layout` (see `drawdef.model_layout`).
+
+    Args:
+        model (ikieval.Model): The model.
+        values (list | tuple): The answers, one per dimension of the model.
+        value_max (float): Maximum possible value for the evaluations.
+        value_minTrue (float): Minimum acceptable value for the evaluations.
+        text_conclusion (str): Conclusion text to display in the drawing.
+        text_advice (str): Advice text to display in the drawing.
+        your_name (str): Name of the user.
+        test_date (str): Date of the evaluation.
+        percentiles (dict | None): Percentile ranks by dimension, shown for the model of the main
+            module only (see `ikigai_draw`).
+        instant (bool): Whether the drawing of the main module's model appears at once.
+        profile (ikiprofile.Profile | None): Scoring profile (see `drawdef.model_layout`).
+    """
+    import turtle
+
+    if __name__ == '__main__':
+        import drawdef  # Import for direct testing of this file.
+        import ikieval
+        import ikimetrics
+    else:
+        from src import drawdef  # Import for use within the main module.
+        from src import ikieval
+        from src import ikimetrics
+
+    if model == ikieval.IKIGAI_MODEL:
+        value_love, value_world, value_money, value_good = values
+        ikigai_draw(value_love, value_good, value_money, value_world, value_max, value_minTrue, text_conclusion,
+                    text_advice, your_name, test_date, percentiles, instant, profile)
+        return
+
+    started = ikimetrics.clock()  # The drawing stage ends before waiting for the click.
+
+    msg_check_draw = 'Do not forget to check the Ikigai drawing with the results in the pop-up window.'
+    print('\n\n', msg_check_draw)
+
+    layout = drawdef.model_layout(model, values, value_max, value_minTrue, text_conclusion, text_advice,
+                                  your_name, test_date, profile)
+    draw_layout(layout)
+    ikimetrics.record('drawing', started)
+    turtle.exitonclick()
+
+
+def draw_layout(layout: dict, percentiles: dict | None = None):
+    """Draws a layout on the turtle screen in a single screen update.
+
+    Animation is turned off and the circles are drawn as precomputed polygons, so nothing is
+    redrawn while drawing; the finished picture is shown by one `turtle.update()`. This is much
+    faster than the animated drawing, especially on slow remote displays.
+
+    Args:
+        layout (dict): The layout from `drawdef.ikigai_layout` or `drawdef.ring_layout`.
+        percentiles (dict | None): If given, percentile ranks by dimension ('love', 'passion', ...)
+            shown under the values (see `drawdef.percentile_texts`).
+    """
+    import turtle
+
+    if __name__ == '__main__':
+        import drawdef  # Import for direct testing of this file.
+    else:
+        from src import drawdef  # Import for use within the main module.
+
+    turtle.tracer(0, 0)  # No animation: nothing is shown until `turtle.update`.
+    turtle.hideturtle()
+    turtle.penup()
+
+    polygons = [drawdef.circle_points(x, y, layout['radius']) for x, y in layout['circles']]
+
+    # Filled circles
+    turtle.color(drawdef.CIRCLE_FILL, drawdef.CIRCLE_FILL)
+    for points in polygons:
+        turtle.goto(points[0])
+        turtle.begin_fill()
+        for point in points[1:]:
+            turtle.goto(point)
+        turtle.end_fill()
+
+    # Outlines
+    turtle.color(drawdef.CIRCLE_OUTLINE)
+    turtle.pensize(drawdef.CIRCLE_OUTLINE_WIDTH)
+    for points in polygons:
+        turtle.goto(points[0])
+        turtle.pendown()
+        for point in points[1:]:
+            turtle.goto(point)
+        turtle.penup()
+
+    # Texts
+    for text in [*layout['texts'], *layout['personal'], *drawdef.percentile_texts(percentiles or {})]:
+        turtle.goto(text.x, text.y)
+        turtle.color(text.color)
+        turtle.write(text.text, font=(drawdef.FONT_FAMILY, text.size, text.weight), align='center')
+
+    turtle.update()
+
+
+# BULK RENDERING ----------------------------------------------------------------------------------
+
+_render_cache = None  # Render cache of the current (worker) process.
+
+
+def _render_chunk(chunk: list, out_dir: str, cache_size: int = 0) -> int:
+    """Renders a chunk of (file name, record) pairs as SVG files. Runs in a worker process.
+
+    Args:
+        chunk (list): Pairs of a file name and a record with the arguments of `ikigai_draw`.
+        out_dir (str): Directory for the files.
+        cache_size (int): Size of the render cache kept by the process (0 = no cache).
+
+    Returns:
+        int: The number of reports written.
+    """
+    global _render_cache
+    import os
+    from src import ikicache, ikisvg
+
+    if cache_size and (_render_cache is None or _render_cache.max_entries != cache_size):
+        _render_cache = ikicache.RenderCache(cache_size)
+    cache = _render_cache if cache_size else None
+
+    for file_name, record in chunk:
+        ikisvg.ikigai_svg(**record, path=os.path.join(out_dir, file_name), cache=cache)
+
+    return len(chunk)
+
+
+def ikigai_draw_many(records, out_dir: str, workers: int | None = None, chunk_size: int = 64,
+                     cache_size: int = 1024) -> dict:
+    """Renders many Ikigai reports as SVG files, in parallel on several cores.
+
+    Records are sent to a process pool in chunks; each worker writes its reports straight to disk,
+    so only the record data travels between processes. At most two chunks per worker are queued,
+    so `records` can be a lazy iterable of any size.
+
+    Args:
+        records: Iterable of dictionaries with the arguments of `ikigai_draw` (`value_love`, ...,
+            `your_name`, `test_date`) and an optional 'file' name.
+        out_dir (str): Directory for the SVG files (created if missing).
+        workers (int | None): Number of worker processes (default: number of CPUs). With 1 worker,
+            reports are rendered in the current process.
+        chunk_size (int): Number of records per chunk.
+        cache_size (int): Size of the render cache of each worker (0 = no cache); reports with the same
+            scores and texts then only differ in the name and date that are added to the cached drawing.
+
+    Returns:
+        dict: The number of 'reports', the elapsed 'seconds' and the throughput 'per_second'.
+    """
+    import os
+    import time
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from itertools import islice
+
+    os.makedirs(out_dir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+
+    # Chunks of (file name, record) pairs
+    named = ((record.pop('file', f'report_{index:06d}.svg'), record)
+             for index, record in enumerate(map(dict, records), start=1))
+    chunks = iter(lambda: list(islice(named, chunk_size)), [])
+
+    reports = 0
+    if workers == 1:
+        for chunk in chunks:
+            reports += _render_chunk(chunk, out_dir, cache_size)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            for chunk in chunks:
+                if len(pending) >= 2 * workers:  # Limit queued chunks to keep memory bounded.
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    reports += sum(future.result() for future in done)
+                pending.add(executor.submit(_render_chunk, chunk, out_dir, cache_size))
+            reports += sum(future.result() for future in wait(pending).done)
+
+    seconds = time.perf_counter() - start
+    per_second = reports / seconds if seconds else 0.0
+    print(f'Rendered {reports} reports in {seconds:.2f} s ({per_second:.0f} reports/s).')
+
+    return {'reports': reports, 'seconds': seconds, 'per_second': per_second}
+
+
 # Run the function for testing purposes if this file is executed directly.
 if __name__ == '__main__':
     ikigai_draw(5, 5, 2, 7, 10, 5, 
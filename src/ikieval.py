@@ -0,0 +1,437 @@
+"""Evaluation module.
+
+Holds the value limits, the result and advice messages of the main module and the branching that
+turns the scores and the yes/no answers into the conclusion and advice texts, as plain functions
+without any `input()` or `print()` calls.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+from src import ikimetrics
+
+# VALUE LIMITS --------------------------------------------------------------------------------
+
+value_minTrue = 5  # Threshold for a "true" evaluation
+value_max = 10  # Maximum possible value
+value_min = 0  # Minimum possible value
+
+positive = 'yes'
+negative = 'no'
+
+# MESSAGES ------------------------------------------------------------------------------------
+
+msg_congrat = "Congratulations! Keep doing what you're doing."
+msg_under_limit = "You have some values under the limit. You need to work on improving them."
+msg_improve = 'Still, you can make some improvements based on your lowest grade(s).'
+
+msg_try_love = 'You can try to improve your work environment.'
+msg_try_world = 'You can try to magnify the parts of your work that make someone happy.'
+msg_try_money = 'You can try to negotiate for more money.'
+msg_try_good = 'You can try to learn skills to improve your performance.'
+
+msg_under = "You cannot improve your essential grade(s) under the limit!"
+msg_change_job = "You might need to consider changing jobs!"
+
+msg_gaps = 'You have critical gaps in some areas, but you can address them!'
+msg_space = 'Your score is fine. Still, there is room for improvement if you wish.'
+msg_still_ok = "You cannot improve your lowest grade, but your score is fine."
+
+text_space = '   Optional space for improvement:'
+text_random = '   Just a random check:'
+temp_advice = '{adv}\n   - {plus}'  # Template for displaying each piece of advice on a new line
+
+msg_results = '\n{first_name}, your average rating is {score_avr}. Your lowest grade awarded is {score_min}. '
+msg_unexpected = 'Unexpected result. Please contact the developer!'
+msg_miss = '\nYou are missing in your current job:'
+msg_try = 'Try applying the advice given and retake this test. {first_name}, I know you can do it!'
+msg_sorry = "I'm sorry, {first_name}! " + msg_under + ' ' + msg_change_job
+
+# QUESTIONS -----------------------------------------------------------------------------------
+
+ask_name = 'What is your name?'
+name_min_length = 2
+name_max_length = 30
+
+ask_love = 'How much do you love your job?'
+ask_world = 'How much does your work help make the world a better place?'
+ask_money = 'How satisfied are you with your earnings?'
+ask_good = 'How good are you at it?'
+
+yn_instructions = f'Answer {positive}/{negative}'
+msg_error = f'{yn_instructions} as instructed. Write in lowercase!'
+
+ask_random = f'There is probably nothing to improve. {yn_instructions}: Do you want random advice to just check it?'
+ask_random_again = f'{yn_instructions}: Do you want another random message?'
+
+ask_love2 = f'{yn_instructions}: Can the environment you work in be improved (e.g., music, people, good tea during tasks)?'
+ask_world2 = f'{yn_instructions}: Is there a small part of your work that helps/makes someone happy, and could you do more of it?'
+ask_money2 = f'{yn_instructions}: Can you ask for more money?'
+ask_good2 = f'{yn_instructions}: Is there anything you could learn to improve your skills?'
+
+# Outcomes of the first evaluation (which follow-up questions are asked)
+OUTCOME_MAX = 'max'  # Everything at maximum, no follow-up questions.
+OUTCOME_IMPROVE = 'improve'  # Everything above the limit, ask about the lowest PMVP value(s).
+OUTCOME_UNDER = 'under'  # Some PMVP values under the limit, ask about them.
+OUTCOME_UNEXPECTED = 'unexpected'
+
+
+# MODELS --------------------------------------------------------------------------------------
+
+Model = namedtuple('Model', ['names', 'ring_names', 'questions', 'follow_ups', 'tries', 'value_order',
+                             'ring_order', 'advice_order', 'random_order'])
+Model.__doc__ = """The dimensions (circles) of a model and the texts of the questionnaire about them.
+
+    The dimensions form a ring: ring k is the overlap of dimension k and dimension k + 1 (the last
+    one with the first one). The scores of every model keep the names of the main module
+    (`value_<name>`, `ok_<name>`, `score_LWMG_avr` for the average of the answers and
+    `score_PWMP_min`/`score_PWMP_avr` for the rings). Use `make_model` to build a model.
+
+    names (tuple): Names of the N dimensions, in ring order.
+    ring_names (tuple): Names of the N rings.
+    questions (tuple): Question asked for the answer of each dimension.
+    follow_ups (tuple): Yes/no question asked about improving each dimension.
+    tries (tuple): Advice line shown for each dimension that can be improved.
+    value_order (tuple): Indices of the dimensions in the order their answers are summed.
+    ring_order (tuple): Indices of the rings in the order they are summed, checked and listed.
+    advice_order (tuple): Indices of the dimensions in the order their advice lines are listed.
+    random_order (tuple): Indices of the dimensions in the list random advice is chosen from.
+"""
+
+# The four dimensions of the main module: mission = love + world, vocation = world + money, ...
+IKIGAI_MODEL = Model(
+    names=('love', 'world', 'money', 'good'),
+    ring_names=('mission', 'vocation', 'profession', 'passion'),
+    questions=(ask_love, ask_world, ask_money, ask_good),
+    follow_ups=(ask_love2, ask_world2, ask_money2, ask_good2),
+    tries=(msg_try_love, msg_try_world, msg_try_money, msg_try_good),
+    value_order=(0, 1, 3, 2),  # love, world, good, money
+    ring_order=(3, 0, 1, 2),  # passion, mission, vocation, profession
+    advice_order=(0, 3, 1, 2),  # love, good, world, money
+    random_order=(3, 0, 2, 1),  # good, love, money, world
+)
+
+
+def make_model(names, ring_names=None, questions=None, follow_ups=None, tries=None, value_order=None,
+               ring_order=None, advice_order=None, random_order=None) -> Model:
+    """Builds a model with any number of dimensions.
+
+    Texts that are not given are written from the names; orders that are not given follow the
+    ring order of the dimensions.
+
+    Args:
+        names: Names of the N >= 2 dimensions, in ring order.
+        ring_names: Names of the N rings (default: '<name k>-<name k + 1>').
+        questions: Question of each dimension.
+        follow_ups: Yes/no follow-up question of each dimension.
+        tries: Advice line of each dimension.
+        value_order: Order in which the answers are summed.
+        ring_order: Order in which the rings are summed, checked and listed.
+        advice_order: Order in which the advice lines are listed.
+        random_order: Order of the list random advice is chosen from.
+
+    Returns:
+        Model: The model, with tuples only (so that its decision table is built once).
+
+    Raises:
+        ValueError: If there are fewer than two dimensions, a name is repeated, a list has the
+            wrong length or an order is not a permutation of the dimensions.
+    """
+    names = tuple(names)
+    count = len(names)
+    if count < 2:
+        raise ValueError("A model needs at least two dimensions.")
+
+    if ring_names is None:
+        ring_names = tuple(f'{name}-{names[(index + 1) % count]}' for index, name in enumerate(names))
+    texts = {
+        'ring_names': ring_names,
+        'questions': questions or tuple(f'How satisfied are you with {name}?' for name in names),
+        'follow_ups': follow_ups or tuple(f'{yn_instructions}: Can you improve {name}?' for name in names),
+        'tries': tries or tuple(f'You can try to improve {name}.' for name in names),
+    }
+    orders = {'value_order': value_order, 'ring_order': ring_order, 'advice_order': advice_order,
+              'random_order': random_order}
+
+    for field, value in texts.items():
+        texts[field] = tuple(value)
+        if len(texts[field]) != count:
+            raise ValueError(f"'{field}' must have {count} entries, one per dimension.")
+    for field, value in orders.items():
+        orders[field] = tuple(range(count)) if value is None else tuple(value)
+        if sorted(orders[field]) != list(range(count)):
+            raise ValueError(f"'{field}' must list the indices 0-{count - 1} once each.")
+
+    if len(set(names + texts['ring_names'])) != 2 * count:
+        raise ValueError("The names of the dimensions and rings must be different.")
+
+    return Model(names, **texts, **orders)
+
+
+# EVALUATION ----------------------------------------------------------------------------------
+
+def questions_to_ask(scores: dict, value_max: float = value_max, model: Model = IKIGAI_MODEL) -> tuple[str, tuple]:
+    """Decides which follow-up yes/no questions are asked, as in the main module.
+
+    Every ring that is under its threshold (or, if none is, that has the lowest value) leads to
+    the questions about its two dimensions.
+
+    Args:
+        scores (dict): Scores named after the variables of the main module
+            (`score_LWMG_avr`, `value_passion`, `ok_passion`, `score_PWMP_min`, `score_PWMP_avr`, ...).
+        value_max (float): Maximum possible value.
+        model (Model): Model of the scores.
+
+    Returns:
+        tuple[str, tuple]: The outcome and the flags of the questions to ask, one per dimension
+            ((love, world, money, good) for the main module).
+    """
+    count = len(model.names)
+    ok = [scores[f'ok_{name}'] for name in model.ring_names]
+    ask = [False] * count
+
+    if scores['score_LWMG_avr'] == value_max:
+        outcome = OUTCOME_MAX
+
+    elif all(ok) and scores['score_PWMP_avr'] < value_max:
+        outcome = OUTCOME_IMPROVE
+        score_PWMP_min = scores['score_PWMP_min']
+
+        for ring, name in enumerate(model.ring_names):
+            if score_PWMP_min == scores[f'value_{name}']:
+                ask[ring] = ask[(ring + 1) % count] = True
+
+    elif not all(ok):
+        outcome = OUTCOME_UNDER
+
+        for ring in range(count):
+            if not ok[ring]:
+                ask[ring] = ask[(ring + 1) % count] = True
+
+    else:
+        outcome = OUTCOME_UNEXPECTED
+
+    return outcome, tuple(ask)
+
+
+def conclusion_and_advice(scores: dict, make: tuple, value_max: float = value_max,
+                          model: Model = IKIGAI_MODEL) -> tuple[str, str, bool]:
+    """Builds the conclusion and advice texts from the scores and the yes/no answers.
+
+    Random advice is not part of this function: it corresponds to a respondent who declined it.
+
+    Args:
+        scores (dict): Scores named after the variables of the main module.
+        make (tuple): The yes/no answers, one per dimension ((love, world, money, good) for the
+            main module). Questions that were not asked must be False.
+        value_max (float): Maximum possible value.
+        model (Model): Model of the scores.
+
+    Returns:
+        tuple[str, str, bool]: The conclusion text, the advice text and whether the results are drawn.
+    """
+    count = len(model.names)
+    ok = [scores[f'ok_{name}'] for name in model.ring_names]
+
+    text_conclusion = '-'
+    text_advice = '-'
+    draw_iki = False
+
+    if scores['score_LWMG_avr'] == value_max:
+        text_conclusion = msg_congrat
+        draw_iki = True
+
+    if not all(ok):
+        # As in the main module, gaps that can all be addressed leave the texts unchanged.
+        if any(not ok[ring] and not make[ring] and not make[(ring + 1) % count] for ring in range(count)):
+            text_conclusion = msg_under
+            text_advice = msg_change_job
+            draw_iki = True
+
+    elif scores['score_LWMG_avr'] < value_max:
+        text_conclusion = msg_space
+        text_advice = text_space
+
+        # Advice is listed in the order of the model (love, good, world, money in the main module).
+        for index in model.advice_order:
+            if make[index]:
+                text_advice = temp_advice.format(adv=text_advice, plus=model.tries[index])
+
+        if not any(make):
+            text_conclusion = msg_still_ok
+            text_advice = ''
+
+        draw_iki = True
+
+    return text_conclusion, text_advice, draw_iki
+
+
+# DECISION TABLE ------------------------------------------------------------------------------
+
+# Bits of the decision key of the main module (see `key_bits` for other models)
+BIT_OK = {'passion': 0, 'mission': 1, 'vocation': 2, 'profession': 3}  # ok_* flags
+BIT_MIN = {'passion': 4, 'mission': 5, 'vocation': 6, 'profession': 7}  # PMVP value == score_PWMP_min
+BIT_LWMG_MAX = 8  # score_LWMG_avr == value_max
+BIT_LWMG_UNDER_MAX = 9  # score_LWMG_avr < value_max
+BIT_PMVP_UNDER_MAX = 10  # score_PWMP_avr < value_max
+BIT_MAKE = {'love': 11, 'world': 12, 'money': 13, 'good': 14}  # Yes/no answers
+KEY_BITS = 15
+
+KeyBits = namedtuple('KeyBits', ['ok', 'min', 'lwmg_max', 'lwmg_under_max', 'pmvp_under_max', 'make', 'size'])
+KeyBits.__doc__ = """Bits of the decision key of a model, laid out like the BIT_* constants.
+
+    ok (dict): Bit of the ok_* flag of every ring, in the ring order of the model.
+    min (dict): Bit of every ring that has the lowest ring value.
+    lwmg_max (int): Bit of score_LWMG_avr == value_max.
+    lwmg_under_max (int): Bit of score_LWMG_avr < value_max.
+    pmvp_under_max (int): Bit of score_PWMP_avr < value_max.
+    make (dict): Bit of the yes/no answer of every dimension.
+    size (int): Number of bits (3 * N + 3 for N dimensions).
+"""
+
+Decision = namedtuple('Decision', ['outcome', 'ask', 'tries', 'text_conclusion', 'text_advice', 'draw_iki'])
+Decision.__doc__ = """One entry of the decision table.
+
+    outcome (str): Outcome of the first evaluation (OUTCOME_MAX, OUTCOME_IMPROVE, ...).
+    ask (tuple): The follow-up questions to ask, one flag per dimension ((love, world, money, good)
+        for the main module).
+    tries (tuple): The `tries` lines of the model in the advice, one flag per dimension.
+    text_conclusion (str): The conclusion text.
+    text_advice (str): The advice text.
+    draw_iki (bool): Whether the results are drawn.
+"""
+
+
+@lru_cache(maxsize=None)
+def key_bits(model: Model = IKIGAI_MODEL) -> KeyBits:
+    """Lays out the decision key of a model (the BIT_* constants for the main module)."""
+    count = len(model.names)
+    rings = [model.ring_names[index] for index in model.ring_order]
+    return KeyBits(
+        ok={name: bit for bit, name in enumerate(rings)},
+        min={name: count + bit for bit, name in enumerate(rings)},
+        lwmg_max=2 * count,
+        lwmg_under_max=2 * count + 1,
+        pmvp_under_max=2 * count + 2,
+        make={name: 2 * count + 3 + bit for bit, name in enumerate(model.names)},
+        size=3 * count + 3,
+    )
+
+
+def decision_key(scores: dict, make: tuple = (), value_max: float = value_max, model: Model = IKIGAI_MODEL):
+    """Packs the flags that drive the conclusion and advice branching into a decision key.
+
+    Works on single scores as well as on the NumPy arrays of `ikiscore.score_batch`.
+
+    Args:
+        scores (dict): Scores named after the variables of the main module.
+        make (tuple): The yes/no answers, one per dimension ((love, world, money, good) for the
+            main module; none if empty). Answers to questions that are not asked are ignored by
+            the table.
+        value_max (float): Maximum possible value.
+        model (Model): Model of the scores.
+
+    Returns:
+        int or np.ndarray: The decision key(s).
+    """
+    bits = key_bits(model)
+    key = 0
+
+    for name, bit in bits.ok.items():
+        key = key + scores[f'ok_{name}'] * (1 << bit)
+    for name, bit in bits.min.items():
+        key = key + (scores[f'value_{name}'] == scores['score_PWMP_min']) * (1 << bit)
+
+    key = key + (scores['score_LWMG_avr'] == value_max) * (1 << bits.lwmg_max)
+    key = key + (scores['score_LWMG_avr'] < value_max) * (1 << bits.lwmg_under_max)
+    key = key + (scores['score_PWMP_avr'] < value_max) * (1 << bits.pmvp_under_max)
+
+    for make_it, bit in zip(make, bits.make.values()):
+        key = key + make_it * (1 << bit)
+
+    return key
+
+
+def _scores_from_key(key: int, model: Model = IKIGAI_MODEL) -> tuple[dict, tuple]:
+    """Builds scores and yes/no answers that produce the given decision key (with value_max = 1).
+
+    A key with both lwmg_max and lwmg_under_max bits set cannot occur; it is treated as at maximum.
+    """
+    bits = key_bits(model)
+    scores = {f'ok_{name}': bool(key >> bit & 1) for name, bit in bits.ok.items()}
+    scores.update({f'value_{name}': 0 if key >> bit & 1 else 1 for name, bit in bits.min.items()})
+    scores['score_PWMP_min'] = 0
+
+    if key >> bits.lwmg_max & 1:
+        scores['score_LWMG_avr'] = 1
+    else:
+        scores['score_LWMG_avr'] = 0 if key >> bits.lwmg_under_max & 1 else 2
+    scores['score_PWMP_avr'] = 0 if key >> bits.pmvp_under_max & 1 else 1
+
+    make = tuple(bool(key >> bit & 1) for bit in bits.make.values())
+    return scores, make
+
+
+@lru_cache(maxsize=None)
+def decision_table(model: Model = IKIGAI_MODEL) -> tuple:
+    """Compiles the conclusion and advice branching into a table indexed by the decision key.
+
+    The table is built once per process and model by running `questions_to_ask` and
+    `conclusion_and_advice` for every combination of flags. It has 2**(3 * N + 3) entries for N
+    dimensions: 2**15 for the main module, 2**21 (a few seconds to build) for six dimensions.
+
+    Args:
+        model (Model): Model of the scores.
+
+    Returns:
+        tuple[Decision, ...]: 2**key_bits(model).size decisions.
+    """
+    bits = key_bits(model)
+    count = len(model.names)
+    base_bits = min(bits.make.values())  # The yes/no answers are the highest bits of the key.
+    answers = [tuple(bool(make_key >> index & 1) for index in range(count)) for make_key in range(1 << count)]
+    # Bits the texts depend on (the ring minimum and average only decide the questions).
+    text_mask = sum(1 << bit for bit in bits.ok.values()) | 1 << bits.lwmg_max | 1 << bits.lwmg_under_max
+    no_tries = (False,) * count
+    texts = {}
+    table = [None] * (1 << bits.size)
+
+    for base_key in range(1 << base_bits):
+        scores, _ = _scores_from_key(base_key, model)
+        outcome, ask = questions_to_ask(scores, 1, model)
+        ask_key = sum(asked << index for index, asked in enumerate(ask))
+        decisions = {}  # Decisions of this base key, per answers to the asked questions.
+
+        for make_key in range(len(answers)):
+            answered_key = make_key & ask_key  # Only answers to asked questions count.
+
+            if answered_key not in decisions:
+                text_key = (base_key & text_mask, answered_key)
+                if text_key not in texts:
+                    texts[text_key] = conclusion_and_advice(scores, answers[answered_key], 1, model)
+
+                text_conclusion, text_advice, draw_iki = texts[text_key]
+                tries = answers[answered_key] if text_conclusion == msg_space else no_tries
+                decisions[answered_key] = Decision(outcome, ask, tries, text_conclusion, text_advice, draw_iki)
+
+            table[make_key << base_bits | base_key] = decisions[answered_key]
+
+    return tuple(table)
+
+
+@ikimetrics.timed('evaluation')
+def decide(scores: dict, make: tuple = (), value_max: float = value_max, model: Model = IKIGAI_MODEL) -> Decision:
+    """Looks up the decision for one respondent in the decision table.
+
+    Call it without `make` to get the follow-up questions, then with the answers to get the texts.
+
+    Args:
+        scores (dict): Scores named after the variables of the main module.
+        make (tuple): The yes/no answers, one per dimension.
+        value_max (float): Maximum possible value.
+        model (Model): Model of the scores.
+
+    Returns:
+        Decision: The outcome, questions, advice lines and texts.
+    """
+    return decision_table(model)[decision_key(scores, make, value_max, model)]
@@ -0,0 +1,466 @@
+"""Group-by aggregation module.
+
+Aggregates assessments per team, department or any other column of the answers: for every group the
+number of assessments, the mean and minimum of every LWMG and PMVP dimension and of the average
+rating, and the number of assessments per outcome. The input is split into chunks that are scored
+and aggregated in a process pool; the partial aggregates are then merged in a reduce step.
+
+Means are computed from exact sums: every float is a multiple of 2**-SHIFT, so the sums are kept as
+Python integers in units of 2**-SHIFT, which makes merging associative. The result does not depend
+on the chunking or the number of workers and equals `statistics.mean` of each group.
+
+Usage:
+    python -m src.ikigroup answers.csv --by team -o teams.csv
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+from collections import deque
+from functools import lru_cache
+from itertools import islice
+
+import numpy as np
+
+from src import ikieval, ikiprofile, ikiscore
+from src.ikirecord import OUTCOMES
+
+
+def group_dimensions(model: ikieval.Model = ikieval.IKIGAI_MODEL) -> tuple:
+    """Aggregated dimensions of a model, named after the fields of `ikibatch.result_fields`.
+
+    The answers, the rings (in the order of the model) and the average rating.
+    """
+    return model.names + tuple(model.ring_names[index] for index in model.ring_order) + ('score_LWMG_avr',)
+
+
+def _score_names(dimensions: tuple) -> tuple:
+    """Names of the aggregated dimensions in the scores of `ikiscore.score_batch`."""
+    return tuple(name if name.startswith('score_') else f'value_{name}' for name in dimensions)
+
+
+# Aggregated dimensions of the main module
+DIMENSIONS = group_dimensions()  # love, world, money, good, passion, mission, vocation, profession, score_LWMG_avr
+SCORE_NAMES = _score_names(DIMENSIONS)
+
+SHIFT = 1126  # A float is m * 2**e with an integer m < 2**53 and e >= -1126 (subnormals included).
+EXPONENTS = 2200  # Exponents shifted by SHIFT are 0 to 2097; keys combine them with a group and column.
+SPLIT = 26  # Mantissas are summed in two halves of at most 27 bits, so float64 partial sums stay exact.
+
+CHUNK_SIZE = 4096  # Number of rows scored together.
+BLOCK_SIZE = 1 << 24  # Bytes of a file read by one task.
+
+
+class GroupStats:
+    """Exact aggregates of the assessments of one group.
+
+    Args:
+        dimensions (tuple): The aggregated dimensions (`group_dimensions` of the model).
+
+    Attributes:
+        dimensions (tuple): The aggregated dimensions.
+        count (int): Number of valid assessments.
+        invalid (int): Number of rows with invalid answers (not aggregated).
+        totals (list): Exact sums of every dimension in units of 2**-SHIFT.
+        minimums (list): Minimum of every dimension.
+        outcomes (dict): Number of assessments per outcome (`ikieval.OUTCOME_MAX`, ...).
+    """
+
+    __slots__ = ('dimensions', 'count', 'invalid', 'totals', 'minimums', 'outcomes')
+
+    def __init__(self, dimensions: tuple = DIMENSIONS):
+        self.dimensions = dimensions
+        self.count = 0
+        self.invalid = 0
+        self.totals = [0] * len(dimensions)
+        self.minimums = [float('inf')] * len(dimensions)
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, GroupStats):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def merge(self, other: 'GroupStats') -> 'GroupStats':
+        """Adds the aggregates of another chunk of the same group.
+
+        Args:
+            other (GroupStats): Aggregates of the other chunk.
+
+        Returns:
+            GroupStats: This object, updated.
+        """
+        self.count += other.count
+        self.invalid += other.invalid
+        self.totals = [a + b for a, b in zip(self.totals, other.totals)]
+        self.minimums = [min(a, b) for a, b in zip(self.minimums, other.minimums)]
+        for outcome, count in other.outcomes.items():
+            self.outcomes[outcome] += count
+        return self
+
+    # RESULTS -------------------------------------------------------------------------------------
+
+    def mean(self, dimension: str) -> float:
+        """Mean of a dimension ('love', 'passion', 'score_LWMG_avr', ...), correctly rounded (NaN if empty)."""
+        if not self.count:
+            return float('nan')
+        # Integer division is correctly rounded, like `statistics.mean`.
+        return self.totals[self.dimensions.index(dimension)] / (self.count << SHIFT)
+
+    def minimum(self, dimension: str) -> float:
+        """Minimum of a dimension (NaN if empty)."""
+        return self.minimums[self.dimensions.index(dimension)] if self.count else float('nan')
+
+    def to_dict(self) -> dict:
+        """Returns the aggregates as a JSON-compatible dictionary (means and minimums are None if empty)."""
+        return {
+            'count': self.count,
+            'invalid': self.invalid,
+            'mean': {name: self.mean(name) if self.count else None for name in self.dimensions},
+            'min': {name: self.minimum(name) if self.count else None for name in self.dimensions},
+            'outcomes': dict(self.outcomes),
+        }
+
+
+def merge_groups(partials) -> dict:
+    """Merges partial aggregates (the reduce step).
+
+    Args:
+        partials: Iterable of {group: GroupStats} dictionaries, e.g. one per chunk.
+
+    Returns:
+        dict: {group: GroupStats}, groups in the order they first appear.
+    """
+    merged = {}
+    for partial in partials:
+        for group, stats in partial.items():
+            if group in merged:
+                merged[group].merge(stats)
+            else:
+                merged[group] = stats
+    return merged
+
+
+# PARTIAL AGGREGATES --------------------------------------------------------------------------
+
+@lru_cache(maxsize=None)
+def _outcome_codes(model: ikieval.Model = ikieval.IKIGAI_MODEL) -> np.ndarray:
+    """Index into `OUTCOMES` of the outcome of every decision key of a model."""
+    codes = {outcome: code for code, outcome in enumerate(OUTCOMES)}
+    return np.array([codes[decision.outcome] for decision in ikieval.decision_table(model)], dtype=np.int64)
+
+
+def _exact_sums(values: np.ndarray, codes: np.ndarray, groups: int) -> list:
+    """Sums the columns of `values` per group code exactly.
+
+    Every value is split into its integer mantissa and exponent (`np.frexp`). The mantissas are
+    summed per group, column and exponent with float64 `np.bincount`, which is exact because the
+    mantissas are split into halves that are too small to round; only the few sums per group are
+    then shifted into Python integers.
+
+    Args:
+        values (np.ndarray): Float array of shape (N, D).
+        codes (np.ndarray): Group code (0 to groups - 1) of every row.
+        groups (int): Number of groups.
+
+    Returns:
+        list: For every group, the D sums in units of 2**-SHIFT.
+    """
+    mantissas, exponents = np.frexp(values)
+    mantissas = (mantissas * 2.0 ** 53).astype(np.int64)
+    exponents = exponents.astype(np.int64) + (SHIFT - 53)  # Non-negative for every float.
+
+    columns = values.shape[1]
+    cells = (codes[:, None] * columns + np.arange(columns)).ravel()  # Group and column of every value.
+    keys, inverse = np.unique(cells * EXPONENTS + exponents.ravel(), return_inverse=True)
+
+    flat = mantissas.ravel()
+    high = np.bincount(inverse, weights=flat >> SPLIT, minlength=len(keys)).astype(np.int64).tolist()
+    low = np.bincount(inverse, weights=flat & ((1 << SPLIT) - 1), minlength=len(keys)).astype(np.int64).tolist()
+
+    sums = [[0] * columns for _ in range(groups)]
+    for key, high_sum, low_sum in zip(keys.tolist(), high, low):
+        cell, exponent = divmod(key, EXPONENTS)
+        group, column = divmod(cell, columns)
+        sums[group][column] += ((high_sum << SPLIT) + low_sum) << exponent
+    return sums
+
+
+def aggregate_chunk(rows, by: str, profile: ikiprofile.Profile = ikiprofile.DEFAULT_PROFILE,
+                    model: ikieval.Model = ikieval.IKIGAI_MODEL) -> dict:
+    """Scores one chunk of rows and aggregates it per group (the map step).
+
+    Answers are validated with the rules of `ikidef.ask_for_number` and scored with the evaluator
+    of the profile, like in `ikibatch`; rows with invalid answers are only counted.
+
+    Args:
+        rows: Sequence of dictionaries with the answers (one per dimension of the model, e.g.
+            'love', 'world', 'money', 'good') and the group column.
+        by (str): Name of the group column (a missing value is the group '').
+        profile (ikiprofile.Profile): Scoring profile.
+        model (ikieval.Model): Model of the answers (see `ikiprofile.compile_model`).
+
+    Returns:
+        dict: {group: GroupStats}, groups in the order they first appear.
+    """
+    evaluator = ikiprofile.compile_model(model, profile)
+    dimensions = group_dimensions(model)
+
+    index = {}
+    codes = np.array([index.setdefault(row.get(by, ''), len(index)) for row in rows], dtype=np.int64)
+    groups = list(index)
+
+    valid = np.ones(len(codes), dtype=bool)
+    columns = []
+    for field in model.names:
+        validation = ikiscore.validate_answers([row.get(field) for row in rows], evaluator.value_min,
+                                               evaluator.value_max)
+        valid &= validation.in_range
+        columns.append(validation.values)
+
+    stats = {}
+    for group, invalid in zip(groups, np.bincount(codes[~valid], minlength=len(groups)).tolist()):
+        stats[group] = GroupStats(dimensions)
+        stats[group].invalid = invalid
+
+    codes = codes[valid]
+    if not len(codes):
+        return stats
+
+    scores = evaluator.score_batch(np.column_stack(columns)[valid])
+    values = np.column_stack([scores[name] for name in _score_names(dimensions)])
+    sums = _exact_sums(values, codes, len(groups))
+
+    # Minimums of the rows sorted by group, for the groups with valid rows
+    counts = np.bincount(codes, minlength=len(groups))
+    present = np.flatnonzero(counts)
+    starts = (np.cumsum(counts) - counts)[present]
+    minimums = np.minimum.reduceat(values[np.argsort(codes, kind='stable')], starts, axis=0).tolist()
+
+    outcomes = _outcome_codes(model)[ikieval.decision_key(scores, value_max=evaluator.value_max, model=model)]
+    outcome_counts = np.bincount(codes * len(OUTCOMES) + outcomes, minlength=len(groups) * len(OUTCOMES))
+    outcome_counts = outcome_counts.reshape(-1, len(OUTCOMES)).tolist()
+
+    for code, group_minimums in zip(present.tolist(), minimums):
+        group_stats = stats[groups[code]]
+        group_stats.count = int(counts[code])
+        group_stats.totals = sums[code]
+        group_stats.minimums = group_minimums
+        group_stats.outcomes = dict(zip(OUTCOMES, outcome_counts[code]))
+
+    return stats
+
+
+def _chunks(rows, chunk_size: int):
+    rows = iter(rows)
+    while chunk := list(islice(rows, chunk_size)):
+        yield chunk
+
+
+def _line_start(file, offset: int) -> int:
+    """Offset of the first line of a binary file that starts at or after `offset`."""
+    if offset == 0:
+        return 0
+    file.seek(offset - 1)
+    file.readline()  # The rest of the line that crosses the offset.
+    return file.tell()
+
+
+def aggregate_block(path: str, start: int, end: int, input_format: str, by: str,
+                    profile: ikiprofile.Profile = ikiprofile.DEFAULT_PROFILE, chunk_size: int = CHUNK_SIZE,
+                    model: ikieval.Model = ikieval.IKIGAI_MODEL) -> dict:
+    """Aggregates the lines of a CSV or JSONL file that start between two byte offsets.
+
+    Every task reads only its own part of the file, so the workers do not wait for one reader.
+    CSV fields must not contain line breaks.
+
+    Args:
+        path (str): Path to the answers file.
+        start (int): First byte offset of the block.
+        end (int): Byte offset after the block.
+        input_format (str): 'csv' (with a header line) or 'jsonl'.
+        by (str): Name of the group column.
+        profile (ikiprofile.Profile): Scoring profile.
+        chunk_size (int): Number of rows scored together.
+        model (ikieval.Model): Model of the answers.
+
+    Returns:
+        dict: {group: GroupStats}.
+    """
+    from src import ikibatch
+
+    with open(path, 'rb') as file:
+        header = file.readline() if input_format == 'csv' else b''
+        begin = max(_line_start(file, start), len(header))  # The header is added to every block.
+        finish = _line_start(file, end)
+        file.seek(begin)
+        block = file.read(max(finish - begin, 0))
+
+    stream = io.StringIO((header + block).decode('utf-8'), newline='')
+    rows = ikibatch.read_answers(stream, input_format)
+    return merge_groups(aggregate_chunk(chunk, by, profile, model) for chunk in _chunks(rows, chunk_size))
+
+
+# PARALLEL AGGREGATION ------------------------------------------------------------------------
+
+def _map(function, tasks, workers: int):
+    """Runs `function(*task)` for every task in a process pool and yields the results in order.
+
+    At most two tasks per worker are pending, so the input is consumed as the workers progress.
+    With one worker, the tasks run in this process.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield function(*task)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(function, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def aggregate(rows, by: str, profile: ikiprofile.Profile | None = None, workers: int | None = None,
+              chunk_size: int = CHUNK_SIZE, model: ikieval.Model = ikieval.IKIGAI_MODEL) -> dict:
+    """Aggregates rows of answers per group, with the chunks aggregated in parallel.
+
+    Args:
+        rows: Iterable of dictionaries with the answers and the group column.
+        by (str): Name of the group column ('team', 'department', ...).
+        profile (ikiprofile.Profile | None): Scoring profile (default: the rules of the main module).
+        workers (int | None): Number of worker processes (default: one per core; 1 = no pool).
+        chunk_size (int): Number of rows aggregated by one task.
+        model (ikieval.Model): Model of the answers (default: the four dimensions of the main module).
+
+    Returns:
+        dict: {group: GroupStats}, groups in the order they first appear. The result is the same
+            for any chunk size and number of workers.
+    """
+    profile = profile or ikiprofile.DEFAULT_PROFILE
+    tasks = ((chunk, by, profile, model) for chunk in _chunks(rows, chunk_size))
+    return merge_groups(_map(aggregate_chunk, tasks, workers or os.cpu_count() or 1))
+
+
+def aggregate_file(path: str, by: str, input_format: str | None = None, profile: ikiprofile.Profile | None = None,
+                   workers: int | None = None, chunk_size: int = CHUNK_SIZE, block_size: int = BLOCK_SIZE,
+                   model: ikieval.Model = ikieval.IKIGAI_MODEL) -> dict:
+    """Aggregates a CSV or JSONL answers file per group, with blocks of the file read in parallel.
+
+    Args:
+        path (str): Path to the answers file.
+        by (str): Name of the group column ('team', 'department', ...).
+        input_format (str | None): 'csv' or 'jsonl'; guessed from the extension if None.
+        profile (ikiprofile.Profile | None): Scoring profile (default: the rules of the main module).
+        workers (int | None): Number of worker processes (default: one per core; 1 = no pool).
+        chunk_size (int): Number of rows scored together.
+        block_size (int): Maximum number of bytes read by one task.
+        model (ikieval.Model): Model of the answers (default: the four dimensions of the main module).
+
+    Returns:
+        dict: {group: GroupStats}, as returned by `aggregate` for the rows of the file.
+    """
+    from src import ikibatch
+
+    input_format = input_format or ikibatch.format_from_path(path)
+    if input_format not in ('csv', 'jsonl'):
+        raise ValueError(f"Unsupported file format '{input_format}'. Use 'csv' or 'jsonl'.")
+
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(path)
+    blocks = max(4 * workers, -(-size // block_size))  # Several blocks per worker balance the load.
+    bounds = [size * index // blocks for index in range(blocks + 1)]
+
+    tasks = ((path, start, end, input_format, by, profile or ikiprofile.DEFAULT_PROFILE, chunk_size, model)
+             for start, end in zip(bounds, bounds[1:]))
+    return merge_groups(_map(aggregate_block, tasks, workers))
+
+
+# WRITING -------------------------------------------------------------------------------------
+
+def group_fields(by: str, dimensions: tuple = DIMENSIONS) -> tuple:
+    """Columns of the CSV output of `write_groups`."""
+    return (by, 'count', 'invalid', *(f'mean_{name}' for name in dimensions),
+            *(f'min_{name}' for name in dimensions), *(f'outcome_{outcome}' for outcome in OUTCOMES))
+
+
+def write_groups(groups: dict, stream, file_format: str, by: str = 'group') -> int:
+    """Writes the aggregates of every group as CSV or JSONL.
+
+    Args:
+        groups (dict): {group: GroupStats} from `aggregate` or `aggregate_file`.
+        stream: Text stream to write to.
+        file_format (str): 'csv' (one column per aggregate) or 'jsonl' (`GroupStats.to_dict`).
+        by (str): Name of the group column.
+
+    Returns:
+        int: The number of groups written.
+
+    Raises:
+        ValueError: If the file format is not supported.
+    """
+    if file_format == 'csv':
+        dimensions = next(iter(groups.values())).dimensions if groups else DIMENSIONS
+        writer = csv.writer(stream)
+        writer.writerow(group_fields(by, dimensions))
+        for group, stats in groups.items():
+            data = stats.to_dict()
+            writer.writerow((group, data['count'], data['invalid'], *data['mean'].values(), *data['min'].values(),
+                             *data['outcomes'].values()))
+    elif file_format == 'jsonl':
+        for group, stats in groups.items():
+            stream.write(json.dumps({by: group, **stats.to_dict()}, ensure_ascii=False) + '\n')
+    else:
+        raise ValueError(f"Unsupported file format '{file_format}'. Use 'csv' or 'jsonl'.")
+
+    return len(groups)
+
+
+def main(argv: list | None = None) -> int:
+    """Command line entry point of the group-by aggregation."""
+    import argparse
+
+    from src import ikibatch
+
+    parser = argparse.ArgumentParser(description='Aggregate an IKIGAI answers file per team or department.')
+    parser.add_argument('input', help='CSV or JSONL file with the answers')
+    parser.add_argument('--by', required=True, help='column with the group of every respondent (e.g. team)')
+    parser.add_argument('-o', '--output', help='output file (default: standard output)')
+    parser.add_argument('--input-format', choices=('csv', 'jsonl'), help='default: from the extension')
+    parser.add_argument('--output-format', choices=('csv', 'jsonl'), help='default: from the extension')
+    parser.add_argument('-j', '--workers', type=int, help='worker processes (default: one per core)')
+    parser.add_argument('--profile', metavar='PATH', help='JSON scoring profile (limits, thresholds and weights)')
+    parser.add_argument('--dimensions', metavar='NAMES',
+                        help='comma-separated answer columns of a model with other dimensions, in ring order '
+                             '(default: love,world,money,good)')
+    args = parser.parse_args(argv)
+
+    profile = None
+    if args.profile:
+        try:
+            profile = ikiprofile.load_profile(args.profile)
+        except (OSError, ValueError) as error:
+            parser.error(f'invalid profile: {error}')
+
+    model = ikibatch.model_from_names(parser, args.dimensions)
+    groups = aggregate_file(args.input, args.by, args.input_format, profile, args.workers, model=model)
+
+    if args.output:
+        output_format = args.output_format or ikibatch.format_from_path(args.output)
+        with open(args.output, 'w', newline='', encoding='utf-8') as output:
+            write_groups(groups, output, output_format, args.by)
+    else:
+        write_groups(groups, sys.stdout, args.output_format or 'jsonl', args.by)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""History module.
+
+Keeps every assessment of a person so that retaking the test shows the progress. The results are
+stored in an SQLite database keyed by a normalized identity (case, spacing and Unicode forms of the
+name do not matter) and the date as an integer (days since 1970-01-01, as in `ikistore`), so that
+a person's results are sorted by date in the primary key and their whole history is read with one
+index lookup.
+
+When an assessment is added, the change since the previous result of the same person is computed
+for every LWMG and PMVP dimension.
+"""
+
+import sqlite3
+import unicodedata
+from collections import namedtuple
+
+from src import ikiprofile
+from src.ikirecord import PMVP_NAMES, VALUE_NAMES
+from src.ikistore import date_to_days, days_to_date
+
+DIMENSIONS = VALUE_NAMES + PMVP_NAMES  # love, world, money, good, passion, mission, vocation, profession
+
+ENTRY_FIELDS = ('identity', 'day', 'sequence', 'name', *DIMENSIONS, 'profile')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS assessments (
+    identity TEXT NOT NULL,
+    day INTEGER NOT NULL,
+    sequence INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    {', '.join(f'{name} REAL NOT NULL' for name in DIMENSIONS)},
+    profile TEXT NOT NULL,
+    PRIMARY KEY (identity, day, sequence)
+) WITHOUT ROWID
+"""
+
+HistoryEntry = namedtuple('HistoryEntry', ENTRY_FIELDS)
+HistoryEntry.__doc__ = """One stored assessment.
+
+    identity (str): The normalized name (see `normalize_identity`).
+    day (int): Date of the assessment as days since 1970-01-01 (`ikistore.NO_DATE` if unknown).
+    sequence (int): Number of earlier assessments of the person on the same day.
+    name (str): The name as it was entered.
+    love, world, money, good (float): The answers.
+    passion, mission, vocation, profession (float): The PMVP values of the profile.
+    profile (str): Name of the scoring profile.
+"""
+
+Change = namedtuple('Change', ['entry', 'previous', 'deltas'])
+Change.__doc__ = """Result of adding an assessment to the history.
+
+    entry (HistoryEntry): The added assessment.
+    previous (HistoryEntry | None): The previous assessment of the person, if any.
+    deltas (dict | None): Change of every dimension since the previous assessment
+        (entry - previous), None for a first assessment.
+"""
+
+
+def normalize_identity(name: str) -> str:
+    """Normalizes a name into the identity of a person.
+
+    Unicode compatibility forms are unified (NFKC), the name is case-folded and runs of whitespace
+    become single spaces, so 'Jane  Doe' and 'jane doe' are the same person.
+
+    Raises:
+        ValueError: If the name is empty.
+    """
+    identity = ' '.join(unicodedata.normalize('NFKC', name).casefold().split())
+    if not identity:
+        raise ValueError("A name is needed to keep a history.")
+    return identity
+
+
+def entry_date(entry: HistoryEntry) -> str:
+    """Date of an entry as 'DD.MM.YYYY' ('' if unknown)."""
+    return days_to_date(entry.day)
+
+
+class HistoryStore:
+    """Per-person history of assessments in an SQLite database.
+
+    Args:
+        path (str): Path to the database file (created if missing), or ':memory:'.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection = sqlite3.connect(path)
+        with self._connection:
+            self._connection.execute(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute('SELECT COUNT(*) FROM assessments').fetchone()[0]
+
+    def close(self):
+        """Closes the database."""
+        self._connection.close()
+
+    def _previous(self, identity: str, day: int) -> HistoryEntry | None:
+        """The latest assessment of a person on or before a day."""
+        row = self._connection.execute(
+            f'SELECT {", ".join(ENTRY_FIELDS)} FROM assessments WHERE identity = ? AND day <= ? '
+            'ORDER BY day DESC, sequence DESC LIMIT 1', (identity, day)).fetchone()
+        return None if row is None else HistoryEntry(*row)
+
+    def add(self, name: str, date: str | int, love: float, world: float, money: float, good: float,
+            profile: ikiprofile.Profile | None = None) -> Change:
+        """Adds an assessment and computes the change since the previous one of the same person.
+
+        Assessments may be added out of order: the previous assessment is the latest one on or
+        before the date (on the same day, the one added last).
+
+        Args:
+            name (str): Name of the user.
+            date (str | int): Date of the evaluation ('DD.MM.YYYY', as `ikidef.current_date`, or
+                days since 1970-01-01).
+            love (float): Answer to "What you love."
+            world (float): Answer to "What the world needs."
+            money (float): Answer to "What you can be paid for."
+            good (float): Answer to "What you're good at."
+            profile (ikiprofile.Profile | None): Scoring profile of the PMVP values (default: the
+                rules of the main module).
+
+        Returns:
+            Change: The new entry, the previous entry and the changes of every dimension.
+        """
+        evaluator = ikiprofile.compile_profile(profile or ikiprofile.DEFAULT_PROFILE)
+        scores = evaluator.scores(love, world, money, good)
+
+        identity = normalize_identity(name)
+        day = date_to_days(date) if isinstance(date, str) else int(date)
+
+        with self._connection:  # Commits the new entry.
+            previous = self._previous(identity, day)
+            sequence = previous.sequence + 1 if previous is not None and previous.day == day else 0
+            entry = HistoryEntry(identity, day, sequence, name,
+                                 *(float(scores[f'value_{dimension}']) for dimension in DIMENSIONS),
+                                 evaluator.name)
+            self._connection.execute(
+                f'INSERT INTO assessments ({", ".join(ENTRY_FIELDS)}) '
+                f'VALUES ({", ".join("?" * len(ENTRY_FIELDS))})', entry)
+
+        return Change(entry, previous, None if previous is None else deltas(previous, entry))
+
+    def add_result(self, result: dict, profile: ikiprofile.Profile | None = None) -> Change:
+        """Adds the result of `IKIGAI_PRO_WORK.questionnaire` (see `add`)."""
+        return self.add(result['user_name'], result['test_date'], result['love'], result['world'],
+                        result['money'], result['good'], profile)
+
+    def history(self, name: str) -> list:
+        """All assessments of a person, oldest first, read with one lookup of the primary key.
+
+        Args:
+            name (str): Name of the user (normalized like in `add`).
+
+        Returns:
+            list[HistoryEntry]: The assessments sorted by date and, on the same day, by the order
+                in which they were added.
+        """
+        rows = self._connection.execute(
+            f'SELECT {", ".join(ENTRY_FIELDS)} FROM assessments WHERE identity = ? ORDER BY day, sequence',
+            (normalize_identity(name),))
+        return [HistoryEntry(*row) for row in rows]
+
+    def changes(self, name: str) -> list:
+        """The change of every dimension between consecutive assessments of a person.
+
+        Returns:
+            list[dict]: One dictionary of deltas per assessment after the first one.
+        """
+        entries = self.history(name)
+        return [deltas(previous, entry) for previous, entry in zip(entries, entries[1:])]
+
+
+def deltas(previous: HistoryEntry, entry: HistoryEntry) -> dict:
+    """Change of every LWMG and PMVP dimension from one entry to another (entry - previous)."""
+    return {dimension: getattr(entry, dimension) - getattr(previous, dimension) for dimension in DIMENSIONS}
+
+
+def format_change(change: Change) -> str:
+    """Describes the change since the previous assessment for the user.
+
+    Args:
+        change (Change): The result of `HistoryStore.add`.
+
+    Returns:
+        str: The changes of the dimensions that changed, or a note that this is the first test.
+    """
+    if change.previous is None:
+        return 'This is your first result. Retake the test later to see your progress.'
+
+    since = entry_date(change.previous) or 'your last test'
+    moved = [f'{dimension.capitalize()} {delta:+g}' for dimension, delta in change.deltas.items() if delta]
+    if not moved:
+        return f'No changes since {since}.'
+    return f'Changes since {since}: ' + ', '.join(moved) + '.'
@@ -0,0 +1,199 @@
+"""Timing instrumentation module.
+
+Records how often each stage of an assessment runs (input validation, scoring, evaluation, advice,
+drawing) and how long it takes, as latency histograms that can be written in the Prometheus text
+format or as JSON, to a file or a local HTTP endpoint.
+
+Instrumentation is disabled by default and then costs one flag check per instrumented call. Enable
+it with `enable()` or by setting the environment variable IKIGAI_METRICS=1.
+
+Usage:
+    @ikimetrics.timed('scoring')
+    def get_sum_avg_min(data): ...
+
+    started = ikimetrics.clock()
+    ...  # Code of the stage
+    ikimetrics.record('advice', started)
+"""
+
+import os
+from functools import wraps
+from time import perf_counter
+
+# Upper bounds of the latency histogram buckets in seconds (Prometheus 'le' labels)
+BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0, float('inf'))
+METRIC = 'ikigai_stage_seconds'
+
+_enabled = os.environ.get('IKIGAI_METRICS', '') not in ('', '0')
+_stages = {}  # Stage name: [count, sum of seconds, counts per bucket]
+
+
+# RECORDING -----------------------------------------------------------------------------------
+
+def enable():
+    """Starts recording."""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Stops recording (recorded metrics are kept)."""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def reset():
+    """Forgets all recorded metrics."""
+    _stages.clear()
+
+
+def observe(stage: str, seconds: float):
+    """Records one run of a stage.
+
+    Args:
+        stage (str): Name of the stage.
+        seconds (float): Duration of the run.
+    """
+    metrics = _stages.get(stage)
+    if metrics is None:
+        metrics = _stages[stage] = [0, 0.0, [0] * len(BUCKETS)]
+
+    metrics[0] += 1
+    metrics[1] += seconds
+    for index, bound in enumerate(BUCKETS):
+        if seconds <= bound:
+            metrics[2][index] += 1
+            break
+
+
+def clock() -> float | None:
+    """Starts timing a stage: returns the current time, or None when recording is disabled."""
+    return perf_counter() if _enabled else None
+
+
+def record(stage: str, started: float | None):
+    """Finishes timing a stage started with `clock` (nothing happens when it returned None)."""
+    if started is not None:
+        observe(stage, perf_counter() - started)
+
+
+def timed(stage: str):
+    """Decorator that records every call of a function as a run of a stage.
+
+    Args:
+        stage (str): Name of the stage.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+
+            started = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(stage, perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+# EXPORT --------------------------------------------------------------------------------------
+
+def snapshot() -> dict:
+    """Returns the recorded metrics as a JSON-compatible dictionary.
+
+    Returns:
+        dict: For every stage its 'count', 'sum' (seconds) and cumulative 'buckets' by upper bound.
+    """
+    result = {}
+    for stage, (count, total, buckets) in sorted(_stages.items()):
+        cumulative, running = {}, 0
+        for bound, bucket_count in zip(BUCKETS, buckets):
+            running += bucket_count
+            cumulative['+Inf' if bound == float('inf') else repr(bound)] = running
+        result[stage] = {'count': count, 'sum': total, 'buckets': cumulative}
+    return result
+
+
+def prometheus_text() -> str:
+    """Returns the recorded metrics in the Prometheus text exposition format."""
+    lines = [f'# HELP {METRIC} Time spent in each stage of an assessment.', f'# TYPE {METRIC} histogram']
+    for stage, metrics in snapshot().items():
+        for bound, count in metrics['buckets'].items():
+            lines.append(f'{METRIC}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+        lines.append(f'{METRIC}_sum{{stage="{stage}"}} {metrics["sum"]!r}')
+        lines.append(f'{METRIC}_count{{stage="{stage}"}} {metrics["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def dump(path: str, file_format: str | None = None):
+    """Writes the recorded metrics to a file.
+
+    Args:
+        path (str): The file. It is replaced at once, so readers never see a partial file.
+        file_format (str | None): 'prometheus' or 'json' (default: 'json' for '.json' files,
+            'prometheus' otherwise).
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    import json
+
+    file_format = file_format or ('json' if path.endswith('.json') else 'prometheus')
+    if file_format == 'json':
+        content = json.dumps(snapshot(), indent=2) + '\n'
+    elif file_format == 'prometheus':
+        content = prometheus_text()
+    else:
+        raise ValueError(f"Unsupported metrics format '{file_format}'.")
+
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.write(content)
+    os.replace(temporary, path)
+
+
+def serve(port: int = 9464, host: str = '127.0.0.1'):
+    """Serves the metrics over HTTP in a background thread ('/metrics': Prometheus, '/metrics.json': JSON).
+
+    Args:
+        port (int): Port to listen on (0 picks a free port).
+        host (str): Interface to listen on (loopback by default).
+
+    Returns:
+        http.server.ThreadingHTTPServer: The running server (call `shutdown()` to stop it).
+    """
+    import json
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == '/metrics':
+                body, content_type = prometheus_text(), 'text/plain; version=0.0.4'
+            elif self.path == '/metrics.json':
+                body, content_type = json.dumps(snapshot()), 'application/json'
+            else:
+                self.send_error(404)
+                return
+
+            body = body.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass  # No log line per scrape.
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
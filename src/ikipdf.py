@@ -0,0 +1,293 @@
+"""Module to write Ikigai reports into one multi-page PDF file.
+
+The writer streams: every page is written to disk as soon as it is added, and only the file
+offsets of the objects are kept for the cross-reference table at the end. All pages share one
+resource dictionary with the two standard fonts (Helvetica and Helvetica-Bold, which need no
+embedding) and one form XObject with the static artwork (the circles and their labels), so a page
+only holds its own values and texts.
+
+Usage:
+    with ikipdf.PdfWriter('reports.pdf') as pdf:
+        for record in records:
+            pdf.add_report(**record)
+"""
+
+import zlib
+from array import array
+
+from src import drawdef
+from src.ikisvg import HEIGHT, LINE_HEIGHT, TAB, WIDTH
+
+PAGE_SIZE = (842, 595)  # A4 landscape in points.
+
+# Advance widths (1/1000 of the font size) of the characters ' ' to '~' in WinAnsiEncoding
+HELVETICA_WIDTHS = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+HELVETICA_BOLD_WIDTHS = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+DEFAULT_WIDTH = 556  # Width of characters outside ' ' to '~'.
+
+# Font resource names and widths by text weight
+FONTS = {'normal': ('F1', 'Helvetica', HELVETICA_WIDTHS), 'bold': ('F2', 'Helvetica-Bold', HELVETICA_BOLD_WIDTHS)}
+
+# Numbers of the shared objects; the objects of page i are 7 + 2i (content) and 8 + 2i (page).
+CATALOG, PAGES, FONT_NORMAL, FONT_BOLD, ARTWORK, RESOURCES = range(1, 7)
+FIRST_PAGE_OBJECT = 7
+
+BEZIER_CIRCLE = 0.5523  # Control point distance of a circle quarter drawn as a cubic Bezier curve.
+
+
+# HELPERS -------------------------------------------------------------------------------------
+
+def text_width(text: str, size: float, weight: str = 'normal') -> float:
+    """Width of a line of text in the standard font of a weight.
+
+    Args:
+        text (str): The text (one line).
+        size (float): Font size.
+        weight (str): 'normal' or 'bold'.
+
+    Returns:
+        float: The width in the units of the font size.
+    """
+    widths = FONTS[weight][2]
+    total = 0
+    for character in text:
+        code = ord(character) - 32
+        total += widths[code] if 0 <= code < len(widths) else DEFAULT_WIDTH
+    return total * size / 1000
+
+
+def pdf_string(text: str) -> bytes:
+    """Encodes a text as a PDF string literal in WinAnsiEncoding."""
+    encoded = text.encode('cp1252', errors='replace')
+    return b'(' + encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)') + b')'
+
+
+def _color(color: str, operator: str) -> str:
+    r, g, b = drawdef.rgb(color)
+    return f'{r / 255:.3g} {g / 255:.3g} {b / 255:.3g} {operator}'
+
+
+def _circle_path(x: float, y: float, r: float) -> str:
+    """Path of a circle as four cubic Bezier curves."""
+    k = BEZIER_CIRCLE * r
+    return (
+        f'{x + r:.2f} {y:.2f} m '
+        f'{x + r:.2f} {y + k:.2f} {x + k:.2f} {y + r:.2f} {x:.2f} {y + r:.2f} c '
+        f'{x - k:.2f} {y + r:.2f} {x - r:.2f} {y + k:.2f} {x - r:.2f} {y:.2f} c '
+        f'{x - r:.2f} {y - k:.2f} {x - k:.2f} {y - r:.2f} {x:.2f} {y - r:.2f} c '
+        f'{x + k:.2f} {y - r:.2f} {x + r:.2f} {y - k:.2f} {x + r:.2f} {y:.2f} c'
+    )
+
+
+def text_operators(texts) -> bytes:
+    """Content stream operators that write texts like `turtle.write(..., align='center')`.
+
+    Multi-line texts grow upwards from their anchor, as in `ikisvg.svg_text`.
+
+    Args:
+        texts: Iterable of `drawdef.Text` in turtle coordinates.
+
+    Returns:
+        bytes: One BT ... ET block.
+    """
+    parts = [b'BT']
+    for text in texts:
+        font, _, _ = FONTS[text.weight]
+        size = text.size * 4 / 3  # Tk font points at 96 dpi, in turtle units (pixels).
+        lines = text.text.split('\n')
+        parts.append(f'/{font} {size:.2f} Tf {_color(text.color, "rg")}'.encode())
+        for index, line in enumerate(lines):
+            line = line.replace('\t', TAB)
+            x = text.x - text_width(line, size, text.weight) / 2
+            y = text.y + size * 0.25 + (len(lines) - 1 - index) * size * LINE_HEIGHT
+            parts.append(f'1 0 0 1 {x:.2f} {y:.2f} Tm '.encode() + pdf_string(line) + b' Tj')
+    parts.append(b'ET')
+    return b'\n'.join(parts)
+
+
+def _is_static(text: drawdef.Text) -> bool:
+    """Whether a text of `drawdef.ikigai_layout` is the same on every page (the circle labels)."""
+    return text.color in (drawdef.CIRCLE_OUTLINE, 'white')
+
+
+# WRITING -------------------------------------------------------------------------------------
+
+class PdfWriter:
+    """Writes Ikigai reports into a PDF file, one page per report, as they are added.
+
+    Args:
+        path (str): The PDF file (overwritten).
+        page_size (tuple): Width and height of the pages in points. The drawing is scaled to fit.
+        compress (bool): Whether the page contents are compressed with zlib.
+    """
+
+    def __init__(self, path: str, page_size: tuple = PAGE_SIZE, compress: bool = True):
+        self.path = path
+        self.page_size = page_size
+        self.compress = compress
+        self.pages = 0
+        self._offsets = array('Q')  # File offsets of the objects, by object number - 1.
+        self._position = 0
+
+        width, height = page_size
+        scale = min(width / WIDTH, height / HEIGHT)
+        # Page coordinates from turtle coordinates (origin in the center, y pointing up)
+        self._transform = f'{scale:.5f} 0 0 {scale:.5f} {width / 2:.2f} {height / 2:.2f} cm'.encode()
+
+        self._file = open(path, 'wb')
+        self._write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        self._write_shared_objects()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()  # Leave the incomplete file; it is not a valid PDF.
+
+    def _write(self, data: bytes):
+        self._file.write(data)
+        self._position += len(data)
+
+    def _object(self, number: int, content: bytes, stream: bytes | None = None):
+        """Writes an indirect object (a dictionary followed by a stream, if given)."""
+        # Objects after the catalog and the page tree are written in the order of their numbers.
+        self._offsets.append(self._position)
+        if stream is not None:
+            if self.compress:
+                stream = zlib.compress(stream)
+                content = content[:-2] + b' /Filter /FlateDecode>>'
+            content = content[:-2] + f' /Length {len(stream)}>>'.encode() + b'\nstream\n' + stream + b'\nendstream'
+        self._write(f'{number} 0 obj\n'.encode() + content + b'\nendobj\n')
+
+    def _write_shared_objects(self):
+        self._offsets.extend((0, 0))  # The catalog and the page tree are written by `close`.
+
+        for number, weight in ((FONT_NORMAL, 'normal'), (FONT_BOLD, 'bold')):
+            name = FONTS[weight][1]
+            self._object(number, f'<</Type /Font /Subtype /Type1 /BaseFont /{name} '
+                                 f'/Encoding /WinAnsiEncoding>>'.encode())
+
+        # Static artwork: the circles (filled, then outlined) and their labels, as on every page
+        layout = drawdef.ikigai_layout(0, 0, 0, 0, 10, 5, '', '', '', '')
+        paths = [_circle_path(x, y, layout['radius']) for x, y in layout['circles']]
+        artwork = '\n'.join([
+            _color(drawdef.CIRCLE_FILL, 'rg'), *(f'{path} f' for path in paths),
+            _color(drawdef.CIRCLE_OUTLINE, 'RG'), f'{drawdef.CIRCLE_OUTLINE_WIDTH} w',
+            *(f'{path} S' for path in paths),
+        ]).encode() + b'\n' + text_operators(text for text in layout['texts'] if _is_static(text))
+        self._object(ARTWORK, f'<</Type /XObject /Subtype /Form /BBox [{-WIDTH / 2:g} {-HEIGHT / 2:g} '
+                              f'{WIDTH / 2:g} {HEIGHT / 2:g}] /Resources {RESOURCES} 0 R>>'.encode(), artwork)
+
+        self._object(RESOURCES, f'<</Font <</F1 {FONT_NORMAL} 0 R /F2 {FONT_BOLD} 0 R>> '
+                                f'/XObject <</Artwork {ARTWORK} 0 R>>>>'.encode())
+
+    def add_page(self, texts):
+        """Adds a page with the shared artwork and texts.
+
+        Args:
+            texts: Iterable of `drawdef.Text` in turtle coordinates.
+        """
+        content_number = FIRST_PAGE_OBJECT + 2 * self.pages
+        content = b'q ' + self._transform + b' /Artwork Do\n' + text_operators(texts) + b'\nQ'
+        self._object(content_number, b'<<>>', content)
+
+        width, height = self.page_size
+        self._object(content_number + 1, f'<</Type /Page /Parent {PAGES} 0 R /MediaBox [0 0 {width} {height}] '
+                                         f'/Resources {RESOURCES} 0 R /Contents {content_number} 0 R>>'.encode())
+        self.pages += 1
+
+    def add_report(self, value_love: float, value_good: float, value_money: float, value_world: float,
+                   value_max: float, value_minTrue: float, text_conclusion: str, text_advice: str,
+                   your_name: str, test_date: str, percentiles: dict | None = None, profile=None):
+        """Adds the page of one report, with the contents of `ikidraw.ikigai_draw`.
+
+        Args:
+            value_love (float): User's evaluation for "What you love."
+            value_good (float): User's evaluation for "What you're good at."
+            value_money (float): User's evaluation for "What you can be paid for."
+            value_world (float): User's evaluation for "What the world needs."
+            value_max (float): Maximum possible value for the evaluations.
+            value_minTrue (float): Minimum acceptable value for the evaluations.
+            text_conclusion (str): Conclusion text (wrapped by `drawdef.max_line_length`).
+            text_advice (str): Advice text.
+            your_name (str): Name of the user.
+            test_date (str): Date of the evaluation.
+            percentiles (dict | None): If given, percentile ranks by dimension ('love', 'passion', ...)
+                shown under the values (see `ikistats.PercentileIndex.of`).
+            profile (ikiprofile.Profile | None): Scoring profile of the values, colors and name (see
+                `drawdef.ikigai_layout`).
+        """
+        layout = drawdef.ikigai_layout(value_love, value_good, value_money, value_world, value_max,
+                                       value_minTrue, text_conclusion, text_advice, your_name, test_date,
+                                       profile)
+        texts = [text for text in layout['texts'] if not _is_static(text)] + layout['personal']
+        if percentiles:
+            texts += drawdef.percentile_texts(percentiles)
+        self.add_page(texts)
+
+    def close(self):
+        """Writes the page tree, the cross-reference table and the trailer, and closes the file."""
+        if self._file.closed:
+            return
+
+        # Page tree, with the page objects written in pieces
+        self._offsets[PAGES - 1] = self._position
+        self._write(f'{PAGES} 0 obj\n<</Type /Pages /Count {self.pages} /Kids ['.encode())
+        for start in range(0, self.pages, 1000):
+            self._write(' '.join(f'{FIRST_PAGE_OBJECT + 2 * index + 1} 0 R'
+                                 for index in range(start, min(start + 1000, self.pages))).encode() + b' ')
+        self._write(b']>>\nendobj\n')
+
+        self._offsets[CATALOG - 1] = self._position
+        self._write(f'{CATALOG} 0 obj\n<</Type /Catalog /Pages {PAGES} 0 R>>\nendobj\n'.encode())
+
+        xref = self._position
+        count = len(self._offsets) + 1
+        self._write(f'xref\n0 {count}\n0000000000 65535 f \n'.encode())
+        for start in range(0, len(self._offsets), 1000):
+            self._write(b''.join(b'%010d 00000 n \n' % offset for offset in self._offsets[start:start + 1000]))
+        self._write(f'trailer\n<</Size {count} /Root {CATALOG} 0 R>>\nstartxref\n{xref}\n%%EOF\n'.encode())
+        self._file.close()
+
+
+def ikigai_pdf(records, path: str, **options) -> int:
+    """Writes the reports of many records into one PDF file.
+
+    Args:
+        records: Iterable of dictionaries with the arguments of `ikidraw.ikigai_draw` (`value_love`,
+            ..., `your_name`, `test_date`, optionally `percentiles` and `profile`). It is read lazily, so it can be
+            a generator of any size.
+        path (str): The PDF file.
+        **options: Options of `PdfWriter` (`page_size`, `compress`).
+
+    Returns:
+        int: The number of pages.
+    """
+    with PdfWriter(path, **options) as pdf:
+        for record in records:
+            pdf.add_report(**record)
+    return pdf.pages
+
+
+# Write an example if this file is executed directly.
+if __name__ == '__main__':
+    ikigai_pdf([dict(value_love=5, value_good=5, value_money=2, value_world=7, value_max=10, value_minTrue=5,
+                     text_conclusion='text_conclusion', text_advice='text_advice', your_name='your_name',
+                     test_date='test_date')], 'ikigai.pdf')
@@ -0,0 +1,215 @@
+"""Module to render the Ikigai drawing as a PNG bitmap.
+
+The rasterizer needs neither Tk nor an imaging library: shapes are computed analytically into one
+preallocated NumPy pixel buffer and the PNG is encoded with `zlib`. It draws the filled and outlined
+circles of `ikidraw.ikigai_draw` and a marker in the color of `drawdef.color_name_by_limits` at
+every value; texts are left to the vector renderers (see `ikisvg`), as there are no fonts here.
+"""
+
+import struct
+import zlib
+from functools import lru_cache
+
+import numpy as np
+
+from src import drawdef
+from src.drawdef import rgb
+
+SIZE = 800  # Default width and height in pixels.
+EXTENT = 900  # Turtle units shown across the image (the circles and values, not the side texts).
+MARKER_RADIUS = 14  # Radius of the value markers in turtle units.
+COMPRESSION = 6  # zlib level (1 = fastest, 9 = smallest).
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def _chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+
+
+class Canvas:
+    """RGB pixel buffer in turtle coordinates (origin in the center, y pointing up).
+
+    The rows are stored with the PNG filter byte in front of them, so the buffer is compressed
+    as it is, without copying. A canvas can be reused for many images (see `clear`).
+
+    Args:
+        width (int): Width in pixels.
+        height (int): Height in pixels.
+        scale (float): Pixels per turtle unit.
+    """
+
+    def __init__(self, width: int, height: int, scale: float):
+        self.width = width
+        self.height = height
+        self.scale = scale
+        self._rows = np.zeros((height, 1 + 3 * width), dtype=np.uint8)  # Filter byte 0 (None) per row.
+        self.pixels = self._rows[:, 1:].reshape(height, width, 3)  # A view into the rows.
+        self.clear()
+
+    def clear(self, color: str = 'white'):
+        """Fills the whole canvas with a color."""
+        self._rows[:, 1:] = np.tile(np.array(rgb(color), dtype=np.uint8), self.width)
+
+    def load(self, rows: np.ndarray):
+        """Replaces the contents of the canvas with rows saved from a canvas of the same size (`rows`)."""
+        self._rows[...] = rows
+
+    @property
+    def rows(self) -> np.ndarray:
+        """The pixel rows, each with the PNG filter byte in front of it."""
+        return self._rows
+
+    def _disc(self, x: float, y: float, outer: float, inner: float | None, color: str):
+        """Blends a disc (or a ring with an inner radius) with anti-aliased edges into the buffer."""
+        cx = self.width / 2 + x * self.scale
+        cy = self.height / 2 - y * self.scale
+        outer *= self.scale
+
+        left, right = max(int(cx - outer - 1), 0), min(int(cx + outer + 2), self.width)
+        top, bottom = max(int(cy - outer - 1), 0), min(int(cy + outer + 2), self.height)
+        if left >= right or top >= bottom:
+            return
+
+        # Distance of every pixel center in the bounding box from the center
+        dy, dx = np.ogrid[top + 0.5 - cy:bottom + 0.5 - cy, left + 0.5 - cx:right + 0.5 - cx]
+        distance = np.sqrt(dx * dx + dy * dy, dtype=np.float32)
+
+        coverage = np.clip(outer + 0.5 - distance, 0, 1)
+        if inner is not None:
+            coverage *= np.clip(distance - inner * self.scale + 0.5, 0, 1)
+
+        region = self.pixels[top:bottom, left:right]
+        alpha = coverage[..., None]
+        region[...] = region + alpha * (np.array(rgb(color), dtype=np.float32) - region) + 0.5
+
+    def fill_circle(self, x: float, y: float, r: float, color: str):
+        """Draws a filled circle.
+
+        Args:
+            x (float): Horizontal position of the center.
+            y (float): Vertical position of the center.
+            r (float): Radius in turtle units.
+            color (str): Tk color name or '#RRGGBB'.
+        """
+        self._disc(x, y, r, None, color)
+
+    def stroke_circle(self, x: float, y: float, r: float, width: float, color: str):
+        """Draws the outline of a circle, centered on the radius.
+
+        Args:
+            x (float): Horizontal position of the center.
+            y (float): Vertical position of the center.
+            r (float): Radius in turtle units.
+            width (float): Line width in pixels (like `turtle.pensize`).
+            color (str): Tk color name or '#RRGGBB'.
+        """
+        half = width / 2 / self.scale
+        self._disc(x, y, r + half, r - half, color)
+
+    def png(self, compression: int = COMPRESSION) -> bytes:
+        """Encodes the canvas as a PNG file (8-bit RGB)."""
+        header = struct.pack('>IIBBBBB', self.width, self.height, 8, 2, 0, 0, 0)
+        return b''.join((
+            PNG_SIGNATURE,
+            _chunk(b'IHDR', header),
+            _chunk(b'IDAT', zlib.compress(self._rows, compression)),
+            _chunk(b'IEND', b''),
+        ))
+
+
+def draw_circles(canvas: Canvas, circles: list | tuple, r: float):
+    """Draws the filled circles and then their outlines, like `ikidraw.ikigai_draw`.
+
+    Args:
+        canvas (Canvas): The canvas to draw on.
+        circles (list | tuple): The (x, y) circle centers (`layout['circles']`).
+        r (float): The radius of the circles.
+    """
+    for x, y in circles:
+        canvas.fill_circle(x, y, r, drawdef.CIRCLE_FILL)
+    for x, y in circles:
+        canvas.stroke_circle(x, y, r, drawdef.CIRCLE_OUTLINE_WIDTH, drawdef.CIRCLE_OUTLINE)
+
+
+def draw_values(canvas: Canvas, layout: dict):
+    """Draws a marker in the threshold color of every value, where the value's text would be.
+
+    Args:
+        canvas (Canvas): The canvas to draw on.
+        layout (dict): The layout from `drawdef.ikigai_layout` or `drawdef.ring_layout`.
+    """
+    for text in layout['texts']:
+        if text.color in ('green', 'dark goldenrod', 'red') and text.size == 18:  # The value texts.
+            canvas.fill_circle(text.x, text.y + MARKER_RADIUS, MARKER_RADIUS, text.color)
+
+
+def draw_layout(canvas: Canvas, layout: dict):
+    """Draws the circles of a layout and a color marker for every value.
+
+    Args:
+        canvas (Canvas): The canvas to draw on.
+        layout (dict): The layout from `drawdef.ikigai_layout` or `drawdef.ring_layout`.
+    """
+    draw_circles(canvas, layout['circles'], layout['radius'])
+    draw_values(canvas, layout)
+
+
+@lru_cache(maxsize=8)
+def _circles_rows(size: int, circles: tuple, r: float) -> np.ndarray:
+    """The rows of a canvas with only the circles, which are the same in every report."""
+    canvas = Canvas(size, size, size / EXTENT)
+    draw_circles(canvas, circles, r)
+    rows = canvas.rows
+    rows.flags.writeable = False
+    return rows
+
+
+def ikigai_png(value_love: float, value_good: float, value_money: float, value_world: float,
+               value_max: float, value_minTrue: float, text_conclusion: str = '', text_advice: str = '',
+               your_name: str = '', test_date: str = '', path: str | None = None, size: int = SIZE,
+               canvas: Canvas | None = None, profile=None) -> bytes:
+    """Renders the Ikigai drawing of `ikidraw.ikigai_draw` as a PNG bitmap (without the texts).
+
+    Args:
+        value_love (float): User's evaluation for "What you love."
+        value_good (float): User's evaluation for "What you're good at."
+        value_money (float): User's evaluation for "What you can be paid for."
+        value_world (float): User's evaluation for "What the world needs."
+        value_max (float): Maximum possible value for the evaluations.
+        value_minTrue (float): Minimum acceptable value for the evaluations.
+        text_conclusion (str): Conclusion text (not drawn; accepted like in `ikisvg.ikigai_svg`).
+        text_advice (str): Advice text (not drawn).
+        your_name (str): Name of the user (not drawn).
+        test_date (str): Date of the evaluation (not drawn).
+        path (str | None): If given, the PNG is also written to this file.
+        size (int): Width and height in pixels.
+        canvas (Canvas | None): A square canvas of this size to reuse, to avoid allocating a
+            buffer per image. Its contents are replaced.
+        profile (ikiprofile.Profile | None): Scoring profile of the values and colors (see
+            `drawdef.ikigai_layout`).
+
+    Returns:
+        bytes: The PNG file.
+    """
+    layout = drawdef.ikigai_layout(value_love, value_good, value_money, value_world, value_max, value_minTrue,
+                                   text_conclusion, text_advice, your_name, test_date, profile)
+
+    if canvas is None:
+        canvas = Canvas(size, size, size / EXTENT)
+
+    # The circles are drawn once per size and copied; only the value markers differ between reports.
+    canvas.load(_circles_rows(canvas.width, tuple(layout['circles']), layout['radius']))
+    draw_values(canvas, layout)
+    png = canvas.png()
+
+    if path is not None:
+        with open(path, 'wb') as file:
+            file.write(png)
+
+    return png
+
+
+# Render an example if this file is executed directly.
+if __name__ == '__main__':
+    ikigai_png(5, 5, 2, 7, 10, 5, path='ikigai.png')
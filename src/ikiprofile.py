@@ -0,0 +1,412 @@
+"""Scoring profile module.
+
+The main module scores every respondent with the same rules: answers from 0 to 10, a threshold of 5,
+equal weights for the LWMG average and the PMVP values as the means of fixed pairs (passion = good +
+love, ...). A scoring profile replaces these rules for an organization. Profiles are loaded from JSON
+files, validated once and compiled into an evaluator: the default rules keep the exact means of the
+main module, other weights are precomputed into a weight matrix.
+
+Example profile file (every key is optional; the weights are relative):
+    {
+        "name": "acme",
+        "value_minTrue": 6,
+        "weights": {"love": 2, "world": 1, "money": 1, "good": 1},
+        "rings": {"profession": {"good": 2, "money": 1}},
+        "thresholds": {"money": 4}
+    }
+"""
+
+import json
+import math
+import os
+from collections import namedtuple
+from functools import lru_cache
+
+from src import ikieval
+
+# Names of the answers and of the PMVP values, as in `ikirecord`
+VALUE_NAMES = ('love', 'world', 'money', 'good')
+PMVP_NAMES = ('passion', 'mission', 'vocation', 'profession')
+
+# Answers averaged into each PMVP value by the main module
+RING_PAIRS = {
+    'passion': ('good', 'love'),
+    'mission': ('world', 'love'),
+    'vocation': ('world', 'money'),
+    'profession': ('good', 'money'),
+}
+
+# Order in which the main module builds the LWMG tuple (matters for the floating point sums)
+LWMG_ORDER = ('love', 'world', 'good', 'money')
+
+PROFILE_KEYS = ('name', 'value_min', 'value_max', 'value_minTrue', 'weights', 'rings', 'thresholds')
+
+Profile = namedtuple('Profile', ['name', 'value_min', 'value_max', 'value_minTrue', 'weights', 'rings',
+                                 'thresholds'])
+Profile.__doc__ = """A validated scoring profile (hashable, so that it is compiled only once).
+
+    name (str): Name shown in the results.
+    value_min (float): The minimum allowable value.
+    value_max (float): The maximum allowable value.
+    value_minTrue (float): Default threshold for a "true" evaluation.
+    weights (tuple): Relative weights of the (love, world, money, good) answers in the LWMG average.
+    rings (tuple): For each of (passion, mission, vocation, profession), the relative weights of
+        the (love, world, money, good) answers.
+    thresholds (tuple): Thresholds of (love, world, money, good, passion, mission, vocation, profession).
+"""
+
+
+# PROFILES ------------------------------------------------------------------------------------
+
+def _weights(weights: dict, what: str) -> tuple:
+    """Checks a {answer name: weight} mapping and returns the weights in `VALUE_NAMES` order."""
+    if not isinstance(weights, dict):
+        raise ValueError(f"The weights of {what} must be an object of answer names and numbers.")
+
+    unknown = set(weights) - set(VALUE_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown answer(s) in the weights of {what}: {', '.join(sorted(unknown))}.")
+
+    row = []
+    for name in VALUE_NAMES:
+        weight = weights.get(name, 0)
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 <= weight < math.inf:
+            raise ValueError(f"The weight of '{name}' in {what} must be a non-negative number, not {weight!r}.")
+        row.append(float(weight))
+
+    if not sum(row):
+        raise ValueError(f"The weights of {what} must not all be zero.")
+    return tuple(row)
+
+
+def _number(data: dict, key: str, default: float) -> float:
+    value = data.get(key, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"'{key}' must be a number, not {value!r}.")
+    return value
+
+
+def profile_from_dict(data: dict, name: str = 'custom') -> Profile:
+    """Validates a profile given as a dictionary (e.g. loaded from JSON).
+
+    Missing keys take the values of the main module: limits from `ikieval`, equal weights, the
+    pairs of `RING_PAIRS` and `value_minTrue` as the threshold of every dimension.
+
+    Args:
+        data (dict): The profile, with the keys of `PROFILE_KEYS`.
+        name (str): Name used if the profile has none.
+
+    Returns:
+        Profile: The validated profile.
+
+    Raises:
+        ValueError: If a key is unknown or a value is invalid.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("A profile must be an object.")
+
+    unknown = set(data) - set(PROFILE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown profile key(s): {', '.join(sorted(unknown))}.")
+
+    name = data.get('name', name)
+    if not isinstance(name, str) or not name:
+        raise ValueError("'name' must be a non-empty string.")
+
+    value_min = _number(data, 'value_min', ikieval.value_min)
+    value_max = _number(data, 'value_max', ikieval.value_max)
+    value_minTrue = _number(data, 'value_minTrue', ikieval.value_minTrue)
+    if not value_min < value_max:
+        raise ValueError(f"'value_min' ({value_min}) must be less than 'value_max' ({value_max}).")
+
+    weights = _weights(data.get('weights', dict.fromkeys(VALUE_NAMES, 1)), 'the average')
+
+    rings = data.get('rings', {})
+    if not isinstance(rings, dict) or set(rings) - set(PMVP_NAMES):
+        raise ValueError(f"'rings' must be an object with the keys {', '.join(PMVP_NAMES)}.")
+    rings = tuple(_weights(rings.get(ring, dict.fromkeys(RING_PAIRS[ring], 1)), ring) for ring in PMVP_NAMES)
+
+    limits = data.get('thresholds', {})
+    if not isinstance(limits, dict) or set(limits) - set(VALUE_NAMES + PMVP_NAMES):
+        raise ValueError("'thresholds' must be an object of answer and PMVP names.")
+    thresholds = tuple(_number(limits, key, value_minTrue) for key in VALUE_NAMES + PMVP_NAMES)
+
+    for key, threshold in zip(('value_minTrue', *VALUE_NAMES, *PMVP_NAMES), (value_minTrue, *thresholds)):
+        if not value_min <= threshold <= value_max:
+            raise ValueError(f"The threshold of '{key}' ({threshold}) is out of the range {value_min}-{value_max}.")
+
+    return Profile(name, value_min, value_max, value_minTrue, weights, rings, thresholds)
+
+
+def load_profile(path: str) -> Profile:
+    """Loads and validates a profile from a JSON file, named after the file if it has no name.
+
+    Raises:
+        ValueError: If the file is not valid JSON or the profile is invalid.
+    """
+    with open(path, encoding='utf-8') as file:
+        try:
+            data = json.load(file)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"The profile {path} is not valid JSON: {error}") from None
+
+    return profile_from_dict(data, name=os.path.splitext(os.path.basename(path))[0])
+
+
+DEFAULT_PROFILE = profile_from_dict({}, name='default')  # The rules of the main module.
+
+
+# EVALUATORS ----------------------------------------------------------------------------------
+
+class Evaluator:
+    """Scores respondents with the equal weights of the main module (`statistics.mean`).
+
+    Only the limits and thresholds may differ from the main module, so the scores are the same as
+    those of `IKIGAI_PRO_WORK` and of `ikiscore.score_batch`. Use `compile_profile` to get the
+    evaluator of a profile.
+
+    Args:
+        profile (Profile): The validated profile.
+    """
+
+    model = ikieval.IKIGAI_MODEL  # Dimensions and rings of the scores.
+
+    def __init__(self, profile: Profile):
+        self.profile = profile
+        self.value_min = profile.value_min
+        self.value_max = profile.value_max
+        self.thresholds = dict(zip(VALUE_NAMES + PMVP_NAMES, profile.thresholds))
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.profile.name!r})'
+
+    @property
+    def name(self) -> str:
+        """Name of the profile, shown in the results."""
+        return self.profile.name
+
+    def _pmvp(self, values: dict) -> tuple:
+        from statistics import mean
+
+        return tuple(mean(tuple(values[name] for name in RING_PAIRS[ring])) for ring in PMVP_NAMES)
+
+    def _average(self, values: dict) -> float:
+        from statistics import mean
+
+        return mean(tuple(values[name] for name in LWMG_ORDER))
+
+    def scores(self, love: float, world: float, money: float, good: float) -> dict:
+        """Scores one respondent.
+
+        Args:
+            love (float): Answer to "What you love."
+            world (float): Answer to "What the world needs."
+            money (float): Answer to "What you can be paid for."
+            good (float): Answer to "What you're good at."
+
+        Returns:
+            dict: Scores named after the variables of the main module (`score_LWMG_avr`,
+                `value_passion`, `ok_passion`, `score_PWMP_min`, ...).
+        """
+        from statistics import mean
+
+        values = {'love': love, 'world': world, 'money': money, 'good': good}
+        LWMG = tuple(values[name] for name in LWMG_ORDER)
+        PMVP = self._pmvp(values)
+
+        scores = {'score_LWMG_sum': sum(LWMG), 'score_LWMG_avr': self._average(values),
+                  'score_LWMG_min': min(LWMG)}
+        for name, value in zip(VALUE_NAMES + PMVP_NAMES, tuple(values.values()) + PMVP):
+            scores[f'value_{name}'] = value
+            scores[f'ok_{name}'] = value >= self.thresholds[name]
+
+        scores['score_PWMP_min'] = min(PMVP)
+        scores['score_PWMP_sum'] = sum(PMVP)
+        scores['score_PWMP_avr'] = mean(PMVP)
+        return scores
+
+    def score_batch(self, answers) -> dict:
+        """Scores many respondents, like `scores` row by row.
+
+        Args:
+            answers: Array-like of shape (N, 4) with the (love, world, money, good) answers.
+
+        Returns:
+            dict: Arrays of length N with the keys of `scores`.
+        """
+        from src import ikiscore
+
+        scores = ikiscore.score_batch(answers)
+        self._apply_thresholds(scores)
+        return scores
+
+    def _apply_thresholds(self, scores: dict):
+        for name, threshold in self.thresholds.items():
+            scores[f'ok_{name}'] = scores[f'value_{name}'] >= threshold
+
+    def decide(self, scores: dict, make: tuple = ()) -> ikieval.Decision:
+        """Looks up the decision for the scores of one respondent (see `ikieval.decide`)."""
+        return ikieval.decide(scores, make, self.value_max, self.model)
+
+
+class WeightedEvaluator(Evaluator):
+    """Scores respondents with the weights of a profile.
+
+    The relative weights are compiled into a weight matrix once: row 0 holds the weights of the
+    LWMG average and rows 1-4 those of the PMVP values, each row in `VALUE_NAMES` order, with the
+    totals to divide by. A weighted value is the sum of the products of the nonzero weights in
+    `VALUE_NAMES` order, divided by the total, both for one respondent and for a batch.
+
+    Args:
+        profile (Profile): The validated profile.
+    """
+
+    def __init__(self, profile: Profile):
+        super().__init__(profile)
+        self.matrix = (profile.weights,) + profile.rings
+        self.totals = tuple(sum(row) for row in self.matrix)
+        # Only the nonzero weights are multiplied: (column index, weight) per row.
+        self._terms = tuple(tuple((index, weight) for index, weight in enumerate(row) if weight)
+                            for row in self.matrix)
+
+    def _weighted(self, row: int, values: tuple) -> float:
+        return sum(weight * values[index] for index, weight in self._terms[row]) / self.totals[row]
+
+    def _pmvp(self, values: dict) -> tuple:
+        values = tuple(values.values())
+        return tuple(self._weighted(row, values) for row in range(1, len(self.matrix)))
+
+    def _average(self, values: dict) -> float:
+        return self._weighted(0, tuple(values.values()))
+
+    def score_batch(self, answers) -> dict:
+        import numpy as np
+
+        from src import ikiscore
+
+        answers = np.asarray(answers, dtype=np.float64)
+        scores = ikiscore.score_batch(answers)  # The answers, sums and minimums of the LWMG values.
+
+        weighted = []
+        for terms, total in zip(self._terms, self.totals):
+            column = sum(weight * answers[:, index] for index, weight in terms)
+            weighted.append(column / total)
+
+        scores['score_LWMG_avr'] = weighted[0]
+        for name, column in zip(PMVP_NAMES, weighted[1:]):
+            scores[f'value_{name}'] = column
+
+        PMVP = weighted[1:]
+        scores['score_PWMP_min'] = np.minimum.reduce(PMVP)
+        scores['score_PWMP_sum'], scores['score_PWMP_avr'] = ikiscore._sum_and_mean(PMVP)
+        self._apply_thresholds(scores)
+        return scores
+
+
+class ModelEvaluator(Evaluator):
+    """Scores respondents of a model with other dimensions than those of the main module.
+
+    The values, rings and averages are computed like in the main module (`statistics.mean` of the
+    answers and of every pair of neighbouring answers), so the scores equal those of
+    `ikiscore.score_batch` for the model. Use `compile_model` to get the evaluator of a model.
+
+    Args:
+        profile (Profile): The validated profile (only its limits are used).
+        model (ikieval.Model): The model.
+    """
+
+    def __init__(self, profile: Profile, model: ikieval.Model):
+        super().__init__(profile)
+        self.model = model
+        self.thresholds = dict.fromkeys(model.names + model.ring_names, profile.value_minTrue)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.profile.name!r}, {self.model.names!r})'
+
+    def scores(self, *values: float) -> dict:
+        """Scores one respondent.
+
+        Args:
+            *values (float): The answers, one per dimension of the model.
+
+        Returns:
+            dict: Scores named after the variables of the main module (`value_<name>`,
+                `ok_<name>`, `score_LWMG_avr`, `score_PWMP_min`, ...).
+        """
+        from src import ikidef
+
+        mean = ikidef.statistics_module().mean
+        model = self.model
+        rings = ikidef.consecutive_and_circular_averages(values)
+        LWMG = tuple(values[index] for index in model.value_order)
+        PMVP = tuple(rings[index] for index in model.ring_order)
+
+        scores = {'score_LWMG_sum': sum(LWMG), 'score_LWMG_avr': mean(LWMG), 'score_LWMG_min': min(LWMG)}
+        for name, value in zip(model.names + model.ring_names, tuple(values) + tuple(rings)):
+            scores[f'value_{name}'] = value
+            scores[f'ok_{name}'] = value >= self.thresholds[name]
+
+        scores['score_PWMP_min'] = min(PMVP)
+        scores['score_PWMP_sum'] = sum(PMVP)
+        scores['score_PWMP_avr'] = mean(PMVP)
+        return scores
+
+    def score_batch(self, answers) -> dict:
+        """Scores many respondents, like `scores` row by row.
+
+        Args:
+            answers: Array-like of shape (N, D) with the answers of the D dimensions of the model.
+
+        Returns:
+            dict: Arrays of length N with the keys of `scores`.
+        """
+        from src import ikiscore
+
+        scores = ikiscore.score_batch(answers, model=self.model)
+        self._apply_thresholds(scores)
+        return scores
+
+
+@lru_cache(maxsize=32)
+def compile_profile(profile: Profile = DEFAULT_PROFILE) -> Evaluator:
+    """Compiles a profile into an evaluator, once per profile.
+
+    Profiles with the weights of the main module get an `Evaluator` with its exact means, all
+    others a `WeightedEvaluator`.
+
+    Args:
+        profile (Profile): The validated profile.
+
+    Returns:
+        Evaluator: The evaluator of the profile.
+    """
+    equal = (profile.weights == DEFAULT_PROFILE.weights and profile.rings == DEFAULT_PROFILE.rings)
+    return Evaluator(profile) if equal else WeightedEvaluator(profile)
+
+
+@lru_cache(maxsize=32)
+def compile_model(model: ikieval.Model = ikieval.IKIGAI_MODEL, profile: Profile = DEFAULT_PROFILE) -> Evaluator:
+    """Compiles a profile into the evaluator of a model, once per model and profile.
+
+    The model of the main module gets the evaluator of `compile_profile`. The weights and
+    thresholds of a profile name the four dimensions of the main module, so other models get a
+    `ModelEvaluator` that only takes the limits of the profile.
+
+    Args:
+        model (ikieval.Model): The model.
+        profile (Profile): The validated profile.
+
+    Returns:
+        Evaluator: The evaluator of the model.
+
+    Raises:
+        ValueError: If the profile sets weights or thresholds for a model with other dimensions.
+    """
+    if model == ikieval.IKIGAI_MODEL:
+        return compile_profile(profile)
+
+    equal = (profile.weights == DEFAULT_PROFILE.weights and profile.rings == DEFAULT_PROFILE.rings)
+    if not equal or set(profile.thresholds) != {profile.value_minTrue}:
+        raise ValueError(f"The profile '{profile.name}' sets weights or thresholds of the main module's "
+                         f"dimensions, which a model with the dimensions {', '.join(model.names)} cannot use.")
+    return ModelEvaluator(profile, model)
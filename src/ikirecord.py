@@ -0,0 +1,282 @@
+"""Assessment record module.
+
+One run of the main module leaves dozens of loose variables behind (values, `ok_*`, `make_*` and
+`try_*` flags, texts). This module keeps everything that describes one assessment in a compact
+`Assessment` record: the four answers as floats, every boolean flag packed into one integer and
+references to the shared conclusion and advice texts. The PMVP values and the LWMG and PMVP scores
+are derived from the answers when they are needed.
+"""
+
+from src import ikieval
+
+# Names of the answers, in the column order of `ikiscore.ANSWER_COLUMNS`
+VALUE_NAMES = ('love', 'world', 'money', 'good')
+PMVP_NAMES = ('passion', 'mission', 'vocation', 'profession')
+
+# Outcomes of the first evaluation, stored as an index in the flags
+OUTCOMES = (ikieval.OUTCOME_MAX, ikieval.OUTCOME_IMPROVE, ikieval.OUTCOME_UNDER, ikieval.OUTCOME_UNEXPECTED)
+
+# Bits of the flags
+FLAG_BITS = {}
+for _prefix, _names in (('ok', VALUE_NAMES + PMVP_NAMES), ('ask', VALUE_NAMES), ('make', VALUE_NAMES),
+                        ('try', VALUE_NAMES)):
+    for _name in _names:
+        FLAG_BITS[f'{_prefix}_{_name}'] = len(FLAG_BITS)
+FLAG_BITS['draw_iki'] = len(FLAG_BITS)
+OUTCOME_SHIFT = len(FLAG_BITS)  # The outcome index is stored above the boolean flags.
+OUTCOME_MASK = 0b11
+
+
+def pack_flags(**flags) -> int:
+    """Packs boolean flags into an integer.
+
+    Args:
+        **flags: Flags named after `FLAG_BITS` ('ok_love', 'make_money', 'draw_iki', ...).
+
+    Returns:
+        int: The bitfield of the flags that are set.
+
+    Raises:
+        KeyError: If a flag name is unknown.
+    """
+    bits = 0
+    for name, value in flags.items():
+        if value:
+            bits |= 1 << FLAG_BITS[name]
+    return bits
+
+
+def _pack_group(prefix: str, names: tuple, values) -> int:
+    """Packs a group of flags ('ask', VALUE_NAMES, (True, False, ...)) into an integer."""
+    bits = 0
+    for name, value in zip(names, values):
+        if value:
+            bits |= 1 << FLAG_BITS[f'{prefix}_{name}']
+    return bits
+
+
+class Assessment:
+    """Compact record of one assessment.
+
+    Args:
+        love (float): Answer to "What you love."
+        world (float): Answer to "What the world needs."
+        money (float): Answer to "What you can be paid for."
+        good (float): Answer to "What you're good at."
+        flags (int): Bitfield of the boolean flags (see `FLAG_BITS`) and the outcome index.
+        text_conclusion (str): The conclusion text.
+        text_advice (str): The advice text.
+        name (str): Name of the user.
+        date (str): Date of the evaluation.
+
+    Flags are read as attributes (`assessment.ok_passion`, `assessment.make_money`, ...).
+    """
+
+    __slots__ = ('love', 'world', 'money', 'good', 'flags', 'text_conclusion', 'text_advice', 'name', 'date')
+
+    def __init__(self, love: float, world: float, money: float, good: float, flags: int = 0,
+                 text_conclusion: str = '-', text_advice: str = '-', name: str = '', date: str = ''):
+        self.love = float(love)
+        self.world = float(world)
+        self.money = float(money)
+        self.good = float(good)
+        self.flags = flags
+        self.text_conclusion = text_conclusion
+        self.text_advice = text_advice
+        self.name = name
+        self.date = date
+
+    @classmethod
+    def evaluate(cls, love: float, world: float, money: float, good: float,
+                 make: tuple = (False, False, False, False), name: str = '', date: str = '',
+                 value_max: float = ikieval.value_max, value_minTrue: float = ikieval.value_minTrue):
+        """Evaluates answers like the main module and records the result.
+
+        Args:
+            love (float): Answer to "What you love."
+            world (float): Answer to "What the world needs."
+            money (float): Answer to "What you can be paid for."
+            good (float): Answer to "What you're good at."
+            make (tuple): The (love, world, money, good) yes/no answers. Answers to questions that
+                are not asked are not recorded.
+            name (str): Name of the user.
+            date (str): Date of the evaluation.
+            value_max (float): Maximum possible value.
+            value_minTrue (float): Threshold for a "true" evaluation.
+
+        Returns:
+            Assessment: The recorded assessment.
+        """
+        assessment = cls(love, world, money, good, name=name, date=date)
+        scores = assessment.scores(value_minTrue)
+        decision = ikieval.decide(scores, make, value_max)
+
+        names = VALUE_NAMES + PMVP_NAMES
+        flags = _pack_group('ok', names, (scores[f'ok_{key}'] for key in names))
+        flags |= _pack_group('ask', VALUE_NAMES, decision.ask)
+        flags |= _pack_group('make', VALUE_NAMES, (made and asked for made, asked in zip(make, decision.ask)))
+        flags |= _pack_group('try', VALUE_NAMES, decision.tries)
+        if decision.draw_iki:
+            flags |= 1 << FLAG_BITS['draw_iki']
+        flags |= OUTCOMES.index(decision.outcome) << OUTCOME_SHIFT
+
+        assessment.flags = flags
+        assessment.text_conclusion = decision.text_conclusion
+        assessment.text_advice = decision.text_advice
+        return assessment
+
+    # DERIVED VALUES ------------------------------------------------------------------------------
+
+    @property
+    def values(self) -> tuple[float, float, float, float]:
+        """The (love, world, money, good) answers."""
+        return self.love, self.world, self.money, self.good
+
+    @property
+    def pmvp(self) -> tuple[float, float, float, float]:
+        """The (passion, mission, vocation, profession) values, computed like the main module."""
+        from statistics import mean
+
+        return (mean((self.good, self.love)), mean((self.world, self.love)),
+                mean((self.world, self.money)), mean((self.good, self.money)))
+
+    @property
+    def outcome(self) -> str:
+        """Outcome of the first evaluation (`ikieval.OUTCOME_MAX`, ...)."""
+        return OUTCOMES[self.flags >> OUTCOME_SHIFT & OUTCOME_MASK]
+
+    def scores(self, value_minTrue: float = ikieval.value_minTrue) -> dict:
+        """Computes the scores of the main module (`score_LWMG_avr`, `value_passion`, `ok_passion`, ...).
+
+        Args:
+            value_minTrue (float): Threshold for a "true" evaluation.
+
+        Returns:
+            dict: Scores named after the variables of the main module.
+        """
+        from src import ikidef
+
+        pmvp = self.pmvp
+        scores = {}
+        scores['score_LWMG_sum'], scores['score_LWMG_avr'], scores['score_LWMG_min'] = \
+            ikidef.get_sum_avg_min((self.love, self.world, self.good, self.money))
+        scores['score_PWMP_sum'], scores['score_PWMP_avr'], scores['score_PWMP_min'] = ikidef.get_sum_avg_min(pmvp)
+
+        for key, value in zip(VALUE_NAMES + PMVP_NAMES, self.values + pmvp):
+            scores[f'value_{key}'] = value
+            scores[f'ok_{key}'] = ikidef.true_or_not(value, value_minTrue)
+
+        return scores
+
+    # SERIALIZATION -------------------------------------------------------------------------------
+
+    def to_tuple(self) -> tuple:
+        """Returns the stored fields, in the order of the constructor arguments."""
+        return (self.love, self.world, self.money, self.good, self.flags, self.text_conclusion,
+                self.text_advice, self.name, self.date)
+
+    @classmethod
+    def from_tuple(cls, fields: tuple):
+        """Rebuilds an assessment from `to_tuple`."""
+        return cls(*fields)
+
+    def to_dict(self) -> dict:
+        """Returns the answers, the flags by name, the outcome and the texts (e.g. for JSON)."""
+        record = {'name': self.name, 'date': self.date}
+        record.update(zip(VALUE_NAMES, self.values))
+        record.update((name, bool(self.flags >> bit & 1)) for name, bit in FLAG_BITS.items())
+        record['outcome'] = self.outcome
+        record['conclusion'] = self.text_conclusion
+        record['advice'] = self.text_advice
+        return record
+
+    @classmethod
+    def from_dict(cls, record: dict):
+        """Rebuilds an assessment from `to_dict`."""
+        flags = pack_flags(**{name: record[name] for name in FLAG_BITS})
+        flags |= OUTCOMES.index(record['outcome']) << OUTCOME_SHIFT
+        return cls(*(record[name] for name in VALUE_NAMES), flags, record['conclusion'], record['advice'],
+                   record['name'], record['date'])
+
+    def __reduce__(self):
+        return self.__class__, self.to_tuple()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Assessment):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f'{self.__class__.__name__}(love={self.love}, world={self.world}, money={self.money}, '
+                f'good={self.good}, flags={self.flags:#x}, name={self.name!r}, date={self.date!r})')
+
+
+# Flags are read as attributes: `assessment.ok_love`, `assessment.try_money`, ...
+def _flag_property(name: str, bit: int) -> property:
+    return property(lambda self: bool(self.flags >> bit & 1), doc=f'Flag `{name}` of the main module.')
+
+
+for _name, _bit in FLAG_BITS.items():
+    setattr(Assessment, _name, _flag_property(_name, _bit))
+
+del _prefix, _names, _name, _bit
+
+
+def memory_comparison(count: int = 1_000_000) -> dict:
+    """Measures the memory of `count` assessments against the same data as dictionaries.
+
+    The dictionaries hold the variables the main module creates for one run (answers, PMVP
+    values, scores, flags and texts).
+
+    Args:
+        count (int): Number of assessments.
+
+    Returns:
+        dict: 'records' and 'dicts' (bytes allocated for each) and their 'ratio'.
+    """
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    answers = [[rng.randint(0, 10) for _ in range(4)] for _ in range(256)]
+    templates = [Assessment.evaluate(*row, make=(True, False, True, False)) for row in answers]
+
+    def variables(assessment):
+        record = assessment.scores()
+        record.update(assessment.to_dict())
+        return record
+
+    dict_templates = [variables(assessment) for assessment in templates]
+
+    def as_dict(index):
+        # Fresh floats (`+ 0.0` makes a new object), as every run of the main module creates them.
+        record = {key: value + 0.0 if type(value) is float else value
+                  for key, value in dict_templates[index % len(templates)].items()}
+        record['name'] = f'Person {index}'
+        record['date'] = f'{index % 28 + 1:02d}.10.2026'
+        return record
+
+    def as_record(index):
+        fields = templates[index % len(templates)].to_tuple()
+        return Assessment(*(value + 0.0 for value in fields[:4]), *fields[4:7],
+                          f'Person {index}', f'{index % 28 + 1:02d}.10.2026')
+
+    memory = {}
+    for key, build in (('records', as_record), ('dicts', as_dict)):
+        tracemalloc.start()
+        items = [build(index) for index in range(count)]
+        memory[key] = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del items
+
+    memory['ratio'] = memory['records'] / memory['dicts']
+    return memory
+
+
+# Compare the memory use if this file is executed directly.
+if __name__ == '__main__':
+    result = memory_comparison()
+    print(f"1,000,000 assessments: {result['records'] / 2**20:.0f} MiB as records, "
+          f"{result['dicts'] / 2**20:.0f} MiB as dicts ({result['ratio']:.1%}).")
@@ -0,0 +1,288 @@
+"""Batch scoring module.
+
+This module computes the same metrics as the main module (LWMG sum/average/minimum, PMVP values and
+the `ok_*` threshold flags) for many respondents at once, using NumPy arrays instead of one
+`statistics.mean` call per value.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Column order of the answers array: one row per respondent. Neighbouring columns (and the last
+# and first one) form the rings: love+world = mission, world+money = vocation, ...
+ANSWER_COLUMNS = ('love', 'world', 'money', 'good')
+RING_NAMES = ('mission', 'vocation', 'profession', 'passion')
+
+# Order in which the main module builds the LWMG and PMVP tuples (matters for the floating point sums).
+LWMG_ORDER = (0, 1, 3, 2)  # love, world, good, money
+PMVP_ORDER = (3, 0, 1, 2)  # passion, mission, vocation, profession
+
+# Exact powers of ten for parsing decimals
+INTEGER_POWERS_OF_TEN = 10 ** np.arange(16, dtype=np.int64)
+POWERS_OF_TEN = INTEGER_POWERS_OF_TEN.astype(np.float64)
+
+# Smallest normal float: a quotient by a power of two that is at least this large is exact
+MIN_EXACT_QUOTIENT = 2.0 ** -1022
+
+Validation = namedtuple('Validation', ['values', 'valid', 'in_range', 'errors'])
+Validation.__doc__ = """Result of `validate_answers`.
+
+    values (np.ndarray): The answers as floats (NaN where not a number).
+    valid (np.ndarray): Mask of the answers that are numbers.
+    in_range (np.ndarray): Mask of the answers that are numbers within the range.
+    errors (list): (row, raw answer, message) for the rows that fail, with the messages of
+        `ikidef.ask_for_number`.
+"""
+
+
+# HELPERS -------------------------------------------------------------------------------------
+
+def _sum_and_mean(columns: list) -> tuple:
+    """Sums the columns left to right and derives their mean, exactly like `sum` and `statistics.mean`.
+
+    The sum is accumulated column by column with an error-free transformation (TwoSum). Rows where
+    no rounding happened have an exact sum, so `sum / n` is the correctly rounded mean, which is what
+    `statistics.mean` returns. The remaining rows (rare, e.g. 0.1 + 0.2) are recomputed in Python.
+
+    Args:
+        columns (list): 1-D float arrays of equal length, in summation order.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The row sums and row means.
+    """
+    from math import fsum
+    from statistics import mean
+
+    total = columns[0].copy()
+    exact = np.isfinite(total)
+
+    for column in columns[1:]:
+        new_total = total + column
+        back = new_total - total
+        error = (total - (new_total - back)) + (column - back)  # TwoSum rounding error.
+        exact &= error == 0
+        total = new_total
+
+    count = len(columns)
+    avr = total / count
+
+    # Fallback for rows with a rounding error: use the same functions as `ikidef.get_sum_avg_min`.
+    # For a power of two, dividing the correctly rounded `math.fsum` is exact and gives the same
+    # mean much faster (unless the result is so small that the division rounds).
+    halving = count & (count - 1) == 0
+    for row in np.flatnonzero(~exact):
+        values = [float(column[row]) for column in columns]
+        total[row] = sum(values)
+        average = fsum(values) / count if halving else 0.0
+        avr[row] = average if abs(average) >= MIN_EXACT_QUOTIENT else mean(values)
+
+    return total, avr
+
+
+# SCORING -------------------------------------------------------------------------------------
+
+def ring_averages(values) -> np.ndarray:
+    """Averages every value with its right neighbour, the last one with the first one.
+
+    This is `ikidef.consecutive_and_circular_averages` for a whole batch: halving a sum is exact, so
+    the results equal `statistics.mean` of each pair (for values that are not subnormal).
+
+    Args:
+        values: Array-like of shape (M, N), one row per respondent.
+
+    Returns:
+        np.ndarray: The (M, N) ring averages.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    return (values + np.roll(values, -1, axis=1)) / 2
+
+
+def score_ring(answers, value_minTrue: float = 5, value_order=None, ring_order=None) -> dict:
+    """Scores many respondents of a model with any number of dimensions (circles).
+
+    Args:
+        answers: Array-like of shape (M, N) with the answers of M respondents in N >= 2 dimensions,
+            in ring order (each dimension overlaps with its neighbours).
+        value_minTrue (float): Threshold for a "true" evaluation.
+        value_order (tuple | None): Order in which the answers are summed (default: column order).
+        ring_order (tuple | None): Order in which the ring averages are summed (default: column order).
+
+    Returns:
+        dict: 'values' and 'ring' arrays of shape (M, N), their 'ok_values' and 'ok_ring' threshold
+            flags, and the per-respondent 'values_sum', 'values_avr', 'values_min', 'ring_sum',
+            'ring_avr' and 'ring_min'.
+
+    Raises:
+        ValueError: If the answers are not a two-dimensional array with at least two columns.
+    """
+    answers = np.asarray(answers, dtype=np.float64)
+
+    if answers.ndim != 2 or answers.shape[1] < 2:
+        raise ValueError("Answers must have shape (M, N) with N >= 2.")
+
+    ring = ring_averages(answers)
+    scores = {}
+
+    for name, array, order in (('values', answers, value_order), ('ring', ring, ring_order)):
+        order = range(array.shape[1]) if order is None else order
+        scores[name] = array
+        scores[f'ok_{name}'] = array >= value_minTrue
+        scores[f'{name}_sum'], scores[f'{name}_avr'] = _sum_and_mean([array[:, index] for index in order])
+        scores[f'{name}_min'] = array.min(axis=1)
+
+    return scores
+
+
+def score_batch(answers, value_minTrue: float = 5, model=None) -> dict:
+    """Scores many respondents in one pass.
+
+    The results match `ikidef.get_sum_avg_min` and `ikidef.true_or_not` applied row by row.
+
+    Args:
+        answers: Array-like of shape (N, D) with the answers of the D dimensions of the model
+            ((love, world, money, good) for the main module).
+        value_minTrue (float): Threshold for a "true" evaluation.
+        model (ikieval.Model | None): Model of the answers (default: the four dimensions of the
+            main module). Its rings are scored like the PMVP values.
+
+    Returns:
+        dict: Arrays of length N named after the variables of the main module
+            (`value_love`, `score_LWMG_avr`, `value_passion`, `ok_passion`, `score_PWMP_min`, ...).
+
+    Raises:
+        ValueError: If the answers are not a two-dimensional array with one column per dimension.
+    """
+    names, ring_names, value_order, ring_order = ANSWER_COLUMNS, RING_NAMES, LWMG_ORDER, PMVP_ORDER
+    if model is not None:
+        names, ring_names, value_order, ring_order = model.names, model.ring_names, model.value_order, model.ring_order
+
+    answers = np.asarray(answers, dtype=np.float64)
+
+    if answers.ndim != 2 or answers.shape[1] != len(names):
+        raise ValueError(f"Answers must have shape (N, {len(names)}).")
+
+    ring = score_ring(answers, value_minTrue, value_order, ring_order)
+    scores = {}
+
+    # LWMG values and threshold flags
+    for index, name in enumerate(names):
+        scores[f'value_{name}'] = ring['values'][:, index]
+        scores[f'ok_{name}'] = ring['ok_values'][:, index]
+
+    scores['score_LWMG_sum'] = ring['values_sum']
+    scores['score_LWMG_avr'] = ring['values_avr']
+    scores['score_LWMG_min'] = ring['values_min']
+
+    # PMVP values and threshold flags
+    for index, name in enumerate(ring_names):
+        scores[f'value_{name}'] = ring['ring'][:, index]
+        scores[f'ok_{name}'] = ring['ok_ring'][:, index]
+
+    scores['score_PWMP_min'] = ring['ring_min']
+    scores['score_PWMP_sum'] = ring['ring_sum']
+    scores['score_PWMP_avr'] = ring['ring_avr']
+
+    return scores
+
+
+# VALIDATION ----------------------------------------------------------------------------------
+
+def _parse_decimals(raw) -> tuple[np.ndarray, np.ndarray]:
+    """Parses plain decimal answers ('7', '-2', '7.5', '7,5') of a whole column with array operations.
+
+    The answers are joined into one byte buffer and parsed character by character with NumPy: the
+    digits of a row form an integer mantissa (exact up to 15 digits) that is divided once by a power
+    of ten, which gives the same correctly rounded float as `float()`. Rows in any other format
+    (exponents, spaces, words, ...) are reported as not parsed.
+
+    Args:
+        raw: Sequence of raw answers.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The values and the mask of parsed rows.
+    """
+    rows = len(raw)
+    values = np.full(rows, np.nan)
+
+    try:
+        text = '\n'.join(raw)
+    except TypeError:  # Not only strings.
+        text = '\n'.join(map(str, raw))
+    # Every row ends with a line break, so no row is empty.
+    chars = np.frombuffer((text + '\n').encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+
+    newline = chars == ord('\n')
+    line_ends = np.flatnonzero(newline)
+    if len(line_ends) != rows:  # An answer contains a line break.
+        return values, np.zeros(rows, dtype=bool)
+
+    starts = np.concatenate(([0], line_ends[:-1] + 1))
+    lengths = line_ends + 1 - starts
+
+    def per_row(weights):
+        # Differences of the running total at the row ends. The int64 running total may wrap
+        # around for huge columns, but the differences stay exact.
+        totals = np.cumsum(weights, dtype=np.int64)[line_ends]
+        return np.diff(totals, prepend=0)
+
+    digit = (chars >= ord('0')) & (chars <= ord('9'))
+    separator = (chars == ord('.')) | (chars == ord(','))
+    sign = (chars == ord('-')) | (chars == ord('+'))
+    first_sign = sign[starts]  # A sign is only allowed as the first character.
+
+    digits = per_row(digit)
+    separators = per_row(separator)
+    parsed = ((per_row(~(digit | separator | sign | newline)) == 0) & (per_row(sign) == first_sign)
+              & (separators <= 1) & (digits >= 1) & (digits <= 15))
+
+    # Digits that follow each character in its row
+    digit_count = np.cumsum(digit, dtype=np.int32)
+    following = np.repeat(digit_count[line_ends], lengths) - digit_count
+
+    # Mantissa: every digit weighted by the power of ten of the digits that follow it
+    weights = np.where(digit, (chars - ord('0')) * INTEGER_POWERS_OF_TEN[np.minimum(following, 15)], 0)
+    mantissa = per_row(weights)
+    decimals = per_row(np.where(separator, following, 0))
+
+    values[parsed] = mantissa[parsed] / POWERS_OF_TEN[decimals[parsed]]
+    values[parsed & (chars[starts] == ord('-'))] *= -1
+    return values, parsed
+
+
+def validate_answers(raw, value_min: float, value_max: float) -> Validation:
+    """Validates a whole column of raw answers with the rules of `ikidef.ask_for_number`.
+
+    Both ',' and '.' are accepted as decimal separators, as in `ikidef.is_it_number`. Plain decimals
+    are parsed with array operations; only answers in other formats are checked one by one.
+
+    Args:
+        raw: Sequence of raw answers (usually strings).
+        value_min (float): The minimum allowable value.
+        value_max (float): The maximum allowable value.
+
+    Returns:
+        Validation: The float values, the validity and range masks and the errors of failing rows.
+    """
+    from src import ikidef
+
+    values, valid = _parse_decimals(raw)
+
+    msg_value = object()  # Marker that cannot be confused with a number.
+    for row in np.flatnonzero(~valid).tolist():
+        value = ikidef.is_it_number(raw[row], msg_value)
+        if value is not msg_value:
+            values[row] = value
+            valid[row] = True
+
+    in_range = valid & (values >= value_min) & (values <= value_max)
+
+    errors = []
+    for row in np.flatnonzero(~in_range).tolist():
+        if valid[row]:
+            message = f"Your answer '{values[row]}' is out of range! Try again."
+        else:
+            message = f"You must enter a number. '{raw[row]}' is not a number! Try again."
+        errors.append((row, raw[row], message))
+
+    return Validation(values, valid, in_range, errors)
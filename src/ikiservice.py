@@ -0,0 +1,318 @@
+"""Questionnaire service module.
+
+Runs the questionnaire of the main module for many respondents at once with asyncio. Every
+connection to the service is one session: the question flow is a state machine (`Session`) that
+takes one answer at a time, so no session ever waits on `input()` and thousands of sessions can be
+open on a single core.
+
+Protocol (one line per message, UTF-8):
+    - The service sends one JSON object per turn: {"messages": [...], "prompt": "..."}, or
+      {"messages": [...], "result": {...}} when the questionnaire is finished.
+    - The respondent sends one answer per line.
+
+Usage:
+    python -m src.ikiservice --port 8765 --timeout 300
+"""
+
+import asyncio
+import json
+import random
+
+from src import ikidef, ikieval
+from src.ikirecord import PMVP_NAMES, VALUE_NAMES, Assessment
+
+DEFAULT_HOST = '127.0.0.1'  # The service only listens on the loopback interface by default.
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 300  # Seconds a session may wait for an answer.
+MAX_LINE = 4096  # Maximum length of an answer in bytes.
+BACKLOG = 4096  # Connections waiting to be accepted (thousands of respondents may connect at once).
+
+# Questions in the order they are asked, by answer name
+NUMBER_QUESTIONS = {'love': ikieval.ask_love, 'world': ikieval.ask_world,
+                    'money': ikieval.ask_money, 'good': ikieval.ask_good}
+YN_QUESTIONS = {'love': ikieval.ask_love2, 'world': ikieval.ask_world2,
+                'money': ikieval.ask_money2, 'good': ikieval.ask_good2}
+RANDOM_ADVICE = (ikieval.msg_try_good, ikieval.msg_try_love, ikieval.msg_try_money, ikieval.msg_try_world)
+
+# States of a session
+STATE_NAME = 'name'
+STATE_NUMBER = 'number'
+STATE_YN = 'yn'
+STATE_RANDOM = 'random'
+STATE_DONE = 'done'
+
+
+# SESSION -------------------------------------------------------------------------------------
+
+class Session:
+    """The question flow of the main module as a state machine, one answer at a time.
+
+    Answers are validated with the rules of `ikidef.input_limit`, `ikidef.ask_for_number` and
+    `ikidef.ask_for_yn`, and the texts come from `ikieval`.
+
+    Args:
+        value_min (float): The minimum allowable value.
+        value_max (float): The maximum allowable value.
+        value_minTrue (float): Threshold for a "true" evaluation.
+        rng (random.Random | None): Random generator for the random advice.
+    """
+
+    def __init__(self, value_min: float = ikieval.value_min, value_max: float = ikieval.value_max,
+                 value_minTrue: float = ikieval.value_minTrue, rng: random.Random | None = None):
+        self.value_min = value_min
+        self.value_max = value_max
+        self.value_minTrue = value_minTrue
+        self.rng = rng or random.Random()
+
+        self.state = STATE_NAME
+        self.prompt = ikieval.ask_name
+        self.user_name = ''
+        self.first_name = ''
+        self.test_date = ikidef.current_date()
+        self.values = {}
+        self.scores = None
+        self.decision = None
+        self.pending = []  # Names of the yes/no questions still to ask.
+        self.make = dict.fromkeys(VALUE_NAMES, False)
+        self.random_advice = None
+        self.result = None  # The `Assessment` when the questionnaire is finished.
+
+    @property
+    def done(self) -> bool:
+        return self.state == STATE_DONE
+
+    def start(self) -> dict:
+        """Returns the first turn: the name question."""
+        return {'messages': [], 'prompt': self.prompt}
+
+    def answer(self, text: str) -> dict:
+        """Takes one answer and returns the next turn.
+
+        Args:
+            text (str): The answer, without the line break.
+
+        Returns:
+            dict: 'messages' (list of str) and either the next 'prompt' or, when the questionnaire
+                is finished, the 'result' (see `Assessment.to_dict`).
+
+        Raises:
+            RuntimeError: If the questionnaire is already finished.
+        """
+        if self.done:
+            raise RuntimeError("The questionnaire is already finished.")
+
+        messages = []
+        getattr(self, f'_answer_{self.state}')(text, messages)
+
+        if self.done:
+            return {'messages': messages, 'result': self.result.to_dict()}
+        return {'messages': messages, 'prompt': self.prompt}
+
+    # STATES --------------------------------------------------------------------------------------
+
+    def _answer_name(self, text: str, messages: list):
+        # Same rule and message as `ikidef.input_limit`
+        if not ikieval.name_min_length <= len(text) <= ikieval.name_max_length:
+            messages.append(
+                f"Your input must be between {ikieval.name_min_length} and {ikieval.name_max_length} characters "
+                f"long. Your answer '{text}' is not. Try again."
+            )
+            return
+
+        self.user_name = text
+        self.first_name = ikidef.first_word(text, ' ')
+        self._ask_number()
+
+    def _ask_number(self):
+        name = VALUE_NAMES[len(self.values)]
+        self.state = STATE_NUMBER
+        self.prompt = f'Answer within the range {self.value_min}-{self.value_max}: {NUMBER_QUESTIONS[name]}'
+
+    def _answer_number(self, text: str, messages: list):
+        # Same rules and messages as `ikidef.ask_for_number`
+        msg_value = f"You must enter a number. '{text}' is not a number! Try again."
+        value = ikidef.is_it_number(text, msg_value)
+
+        if value == msg_value:
+            messages.append(msg_value)
+        elif not self.value_min <= value <= self.value_max:
+            messages.append(f"Your answer '{value}' is out of range! Try again.")
+        else:
+            self.values[VALUE_NAMES[len(self.values)]] = value
+            if len(self.values) < len(VALUE_NAMES):
+                self._ask_number()
+            else:
+                self._evaluate(messages)
+
+    def _evaluate(self, messages: list):
+        record = Assessment(*(self.values[name] for name in VALUE_NAMES))
+        self.scores = record.scores(self.value_minTrue)
+        self.decision = ikieval.decide(self.scores, value_max=self.value_max)
+
+        results = ikieval.msg_results.format(first_name=self.first_name, score_avr=self.scores['score_LWMG_avr'],
+                                             score_min=self.scores['score_LWMG_min'])
+        outcome = self.decision.outcome
+
+        if outcome == ikieval.OUTCOME_MAX:
+            messages.append(results + ikieval.msg_congrat)
+            self.state = STATE_RANDOM
+            self.prompt = ikieval.ask_random
+            return
+
+        if outcome == ikieval.OUTCOME_IMPROVE:
+            messages.append(results + ikieval.msg_congrat + ikieval.msg_improve)
+        elif outcome == ikieval.OUTCOME_UNDER:
+            messages.append(results + ikieval.msg_under_limit)
+        else:
+            messages.append(ikieval.msg_unexpected)
+
+        self.pending = [name for name, ask in zip(VALUE_NAMES, self.decision.ask) if ask]
+        self._ask_yn(messages)
+
+    def _yes_or_no(self, text: str, messages: list) -> bool | None:
+        # Same rule and message as `ikidef.ask_for_yn`
+        if text == ikieval.positive:
+            return True
+        if text == ikieval.negative:
+            return False
+        messages.append(ikieval.msg_error)
+        return None
+
+    def _ask_yn(self, messages: list):
+        if self.pending:
+            self.state = STATE_YN
+            self.prompt = YN_QUESTIONS[self.pending[0]]
+        else:
+            self._finish(messages)
+
+    def _answer_yn(self, text: str, messages: list):
+        answer = self._yes_or_no(text, messages)
+        if answer is not None:
+            self.make[self.pending.pop(0)] = answer
+            self._ask_yn(messages)
+
+    def _answer_random(self, text: str, messages: list):
+        answer = self._yes_or_no(text, messages)
+        if answer is None:
+            return
+
+        if answer:
+            self.random_advice = self.rng.choice(RANDOM_ADVICE)
+            messages.append(self.random_advice)
+            self.prompt = ikieval.ask_random_again
+        else:
+            self._finish(messages)
+
+    def _finish(self, messages: list):
+        make = tuple(self.make[name] for name in VALUE_NAMES)
+        self.result = Assessment.evaluate(*(self.values[name] for name in VALUE_NAMES), make=make,
+                                          name=self.user_name, date=self.test_date, value_max=self.value_max,
+                                          value_minTrue=self.value_minTrue)
+
+        if self.random_advice is not None:
+            self.result.text_advice = ikieval.temp_advice.format(adv=ikieval.text_random, plus=self.random_advice)
+
+        missing = [name for name in PMVP_NAMES if not self.scores[f'ok_{name}']]
+        if missing:
+            messages.append(ikieval.msg_miss + ''.join(f'\n\t - {name.capitalize()}' for name in missing))
+        if self.result.text_conclusion == ikieval.msg_under:
+            messages.append(ikieval.msg_sorry.format(first_name=self.first_name))
+        else:
+            messages.extend(text for text in (self.result.text_conclusion, self.result.text_advice)
+                            if text not in ('-', ''))
+
+        self.state = STATE_DONE
+
+
+# SERVICE -------------------------------------------------------------------------------------
+
+async def handle_session(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                         timeout: float = DEFAULT_TIMEOUT, **session_options):
+    """Runs one session on a connection until it is finished, times out or is closed.
+
+    Args:
+        reader (asyncio.StreamReader): The connection's reader.
+        writer (asyncio.StreamWriter): The connection's writer.
+        timeout (float): Seconds to wait for each answer.
+        **session_options: Arguments of `Session`.
+    """
+    session = Session(**session_options)
+
+    def send(turn):
+        writer.write(json.dumps(turn).encode('utf-8') + b'\n')
+
+    try:
+        send(session.start())
+
+        while not session.done:
+            await writer.drain()
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+            except asyncio.TimeoutError:
+                send({'messages': ['Session timed out.'], 'error': 'timeout'})
+                break
+            except ValueError:  # The answer is longer than the limit of the stream.
+                send({'messages': ['Your answer is too long.'], 'error': 'too long'})
+                break
+
+            if not line:  # The respondent closed the connection.
+                break
+            send(session.answer(line.decode('utf-8', 'replace').rstrip('\r\n')))
+
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, timeout: float = DEFAULT_TIMEOUT,
+                **session_options) -> asyncio.AbstractServer:
+    """Starts the questionnaire service.
+
+    Args:
+        host (str): Interface to listen on (loopback by default).
+        port (int): Port to listen on (0 picks a free port).
+        timeout (float): Seconds a session may wait for each answer.
+        **session_options: Arguments of `Session`.
+
+    Returns:
+        asyncio.AbstractServer: The running server.
+    """
+    ikieval.decision_table()  # Build the table before the first session, not during it.
+
+    async def handler(reader, writer):
+        await handle_session(reader, writer, timeout, **session_options)
+
+    return await asyncio.start_server(handler, host, port, limit=MAX_LINE, backlog=BACKLOG)
+
+
+def main(argv: list | None = None):
+    """Command line entry point of the questionnaire service."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Serve the IKIGAI questionnaire on a local socket.')
+    parser.add_argument('--host', default=DEFAULT_HOST, help='interface to listen on (default: %(default)s)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='port (default: %(default)s)')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help='seconds to wait for each answer (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    async def run():
+        server = await serve(args.host, args.port, args.timeout)
+        print(f"Serving the questionnaire on {args.host}:{server.sockets[0].getsockname()[1]}.")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,338 @@
+"""Population statistics module.
+
+Keeps running aggregates of many assessments for dashboards: for every LWMG and PMVP dimension the
+count, mean and variance (Welford's algorithm), minimum, maximum and a fixed-bin histogram, plus the
+number of assessments per outcome. Adding an assessment costs the same however many were added
+before, and aggregates of different shards (files, workers, days) can be merged.
+
+`PercentileIndex` ranks a respondent against the population ("your Passion is in the 73rd
+percentile") from a cumulative histogram of every dimension.
+"""
+
+from src import ikieval
+from src.ikirecord import OUTCOME_MASK, OUTCOME_SHIFT, OUTCOMES, PMVP_NAMES, VALUE_NAMES
+
+DIMENSIONS = VALUE_NAMES + PMVP_NAMES  # love, world, money, good, passion, mission, vocation, profession
+BINS = 10  # Default number of histogram bins over 0-value_max.
+
+
+class PopulationStats:
+    """Running aggregates of assessments.
+
+    Args:
+        value_max (float): Maximum possible value (upper end of the histograms).
+        bins (int): Number of histogram bins of equal width over 0-value_max. The last bin
+            includes value_max.
+    """
+
+    def __init__(self, value_max: float = ikieval.value_max, bins: int = BINS):
+        if bins < 1:
+            raise ValueError("The histograms need at least one bin.")
+
+        self.value_max = value_max
+        self.bins = bins
+        self.count = 0
+        self.means = [0.0] * len(DIMENSIONS)
+        self.m2 = [0.0] * len(DIMENSIONS)  # Sums of squared differences from the mean (Welford).
+        self.minimums = [float('inf')] * len(DIMENSIONS)
+        self.maximums = [float('-inf')] * len(DIMENSIONS)
+        self.histograms = [[0] * bins for _ in DIMENSIONS]
+        self.outcomes = dict.fromkeys(OUTCOMES, 0)
+
+    def _bin(self, value: float) -> int:
+        return min(max(int(value * self.bins / self.value_max), 0), self.bins - 1)
+
+    # UPDATES -------------------------------------------------------------------------------------
+
+    def add_values(self, love: float, world: float, money: float, good: float, outcome: str | None = None):
+        """Adds one assessment given by its answers.
+
+        Args:
+            love (float): Answer to "What you love."
+            world (float): Answer to "What the world needs."
+            money (float): Answer to "What you can be paid for."
+            good (float): Answer to "What you're good at."
+            outcome (str | None): Outcome of the assessment (`ikieval.OUTCOME_MAX`, ...), if known.
+        """
+        # PMVP values as in the main module; halving a sum is exact, so this equals `statistics.mean`.
+        values = (love, world, money, good, (good + love) / 2, (world + love) / 2, (world + money) / 2,
+                  (good + money) / 2)
+
+        self.count += 1
+        count = self.count
+
+        for index, value in enumerate(values):
+            delta = value - self.means[index]
+            self.means[index] += delta / count
+            self.m2[index] += delta * (value - self.means[index])
+            if value < self.minimums[index]:
+                self.minimums[index] = value
+            if value > self.maximums[index]:
+                self.maximums[index] = value
+            self.histograms[index][self._bin(value)] += 1
+
+        if outcome is not None:
+            self.outcomes[outcome] += 1
+
+    def add(self, assessment):
+        """Adds one `ikirecord.Assessment`."""
+        self.add_values(*assessment.values, assessment.outcome)
+
+    def add_records(self, records):
+        """Adds the records of a results store (`ikistore.read_results(path).records`) in one pass.
+
+        Args:
+            records: Array of `ikistore.RECORD_DTYPE` records.
+        """
+        import numpy as np
+
+        from src import ikiscore, ikistore
+
+        if not len(records):
+            return
+
+        values = ikistore.values(records)
+        columns = np.column_stack((values, ikiscore.ring_averages(values)[:, list(ikiscore.PMVP_ORDER)]))
+
+        batch = PopulationStats(self.value_max, self.bins)
+        batch.count = len(columns)
+        batch.means = columns.mean(axis=0).tolist()
+        batch.m2 = ((columns - columns.mean(axis=0)) ** 2).sum(axis=0).tolist()
+        batch.minimums = columns.min(axis=0).tolist()
+        batch.maximums = columns.max(axis=0).tolist()
+
+        bins = np.clip((columns * self.bins / self.value_max).astype(np.int64), 0, self.bins - 1)
+        batch.histograms = [np.bincount(column, minlength=self.bins).tolist() for column in bins.T]
+
+        outcome_codes = np.asarray(records['flags']) >> OUTCOME_SHIFT & OUTCOME_MASK
+        counts = np.bincount(outcome_codes, minlength=len(OUTCOMES))
+        batch.outcomes = {outcome: int(count) for outcome, count in zip(OUTCOMES, counts)}
+
+        self.merge(batch)
+
+    def merge(self, other: 'PopulationStats') -> 'PopulationStats':
+        """Adds the aggregates of another shard (Chan et al.'s parallel variance formula).
+
+        Args:
+            other (PopulationStats): Aggregates with the same value_max and bins.
+
+        Returns:
+            PopulationStats: This object, updated.
+
+        Raises:
+            ValueError: If the histograms of the shards differ.
+        """
+        if (other.value_max, other.bins) != (self.value_max, self.bins):
+            raise ValueError("Only aggregates with the same value_max and bins can be merged.")
+
+        count = self.count + other.count
+        if other.count:
+            for index in range(len(DIMENSIONS)):
+                delta = other.means[index] - self.means[index]
+                self.means[index] += delta * other.count / count
+                self.m2[index] += other.m2[index] + delta * delta * self.count * other.count / count
+                self.minimums[index] = min(self.minimums[index], other.minimums[index])
+                self.maximums[index] = max(self.maximums[index], other.maximums[index])
+                self.histograms[index] = [a + b for a, b in zip(self.histograms[index], other.histograms[index])]
+
+            for outcome, outcome_count in other.outcomes.items():
+                self.outcomes[outcome] += outcome_count
+
+        self.count = count
+        return self
+
+    @classmethod
+    def combine(cls, shards) -> 'PopulationStats':
+        """Merges the aggregates of several shards into a new object.
+
+        Args:
+            shards: Iterable of PopulationStats with the same value_max and bins (at least one).
+
+        Returns:
+            PopulationStats: The combined aggregates.
+        """
+        shards = iter(shards)
+        first = next(shards)
+        combined = cls(first.value_max, first.bins).merge(first)
+        for shard in shards:
+            combined.merge(shard)
+        return combined
+
+    # RESULTS -------------------------------------------------------------------------------------
+
+    def mean(self, dimension: str) -> float:
+        """Mean of a dimension ('love', 'passion', ...)."""
+        return self.means[DIMENSIONS.index(dimension)]
+
+    def variance(self, dimension: str) -> float:
+        """Population variance of a dimension (0 with fewer than two assessments)."""
+        if self.count < 2:
+            return 0.0
+        return self.m2[DIMENSIONS.index(dimension)] / self.count
+
+    def minimum(self, dimension: str) -> float:
+        """Minimum of a dimension."""
+        return self.minimums[DIMENSIONS.index(dimension)]
+
+    def histogram(self, dimension: str) -> list:
+        """Counts of a dimension per bin of width value_max / bins."""
+        return self.histograms[DIMENSIONS.index(dimension)]
+
+    def to_dict(self) -> dict:
+        """Returns the aggregates as a JSON-compatible dictionary (e.g. to send a shard to a merger).
+
+        The minimum and maximum of an empty shard are None (infinities are not valid JSON).
+        """
+        empty = not self.count
+        return {
+            'value_max': self.value_max,
+            'bins': self.bins,
+            'count': self.count,
+            'dimensions': {
+                name: {'mean': self.means[index], 'm2': self.m2[index],
+                       'min': None if empty else self.minimums[index],
+                       'max': None if empty else self.maximums[index],
+                       'histogram': list(self.histograms[index])}
+                for index, name in enumerate(DIMENSIONS)
+            },
+            'outcomes': dict(self.outcomes),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'PopulationStats':
+        """Rebuilds aggregates from `to_dict`."""
+        stats = cls(data['value_max'], data['bins'])
+        stats.count = data['count']
+        for index, name in enumerate(DIMENSIONS):
+            dimension = data['dimensions'][name]
+            stats.means[index] = dimension['mean']
+            stats.m2[index] = dimension['m2']
+            if dimension['min'] is not None:
+                stats.minimums[index] = dimension['min']
+            if dimension['max'] is not None:
+                stats.maximums[index] = dimension['max']
+            stats.histograms[index] = list(dimension['histogram'])
+        stats.outcomes.update(data['outcomes'])
+        return stats
+
+
+# PERCENTILES ---------------------------------------------------------------------------------
+
+RESOLUTION = 0.005  # Answers in hundredths (`ikistore.SCALE`) give PMVP values in half-hundredths.
+
+
+class PercentileIndex:
+    """Percentile ranks of scores in a population, looked up in constant time.
+
+    Scores are bounded and have a fixed resolution, so the index counts the population per score
+    step and derives a cumulative histogram from the counts. Percentiles are mid-ranks: the share of
+    the population with a lower score plus half of the share with the same score, in percent.
+
+    New results update the counts and the cumulative histogram in place, so lookups never rebuild it:
+    one respondent adds one to the steps above their score, a batch adds the cumulative sum of its
+    counts.
+
+    Args:
+        value_min (float): The minimum possible value.
+        value_max (float): The maximum possible value.
+        resolution (float): Width of a score step. Scores are rounded to the nearest step.
+    """
+
+    def __init__(self, value_min: float = ikieval.value_min, value_max: float = ikieval.value_max,
+                 resolution: float = RESOLUTION):
+        import numpy as np
+
+        self.value_min = value_min
+        self.value_max = value_max
+        self.resolution = resolution
+        self.steps = round((value_max - value_min) / resolution) + 1
+        self.count = 0
+        self.counts = np.zeros((len(DIMENSIONS), self.steps), dtype=np.int64)
+        self._below = np.zeros_like(self.counts)  # Population below each step.
+
+    def _steps(self, values):
+        import numpy as np
+
+        steps = np.rint((np.asarray(values, dtype=np.float64) - self.value_min) / self.resolution)
+        return np.clip(steps, 0, self.steps - 1).astype(np.intp)
+
+    # UPDATES -------------------------------------------------------------------------------------
+
+    def add_values(self, love: float, world: float, money: float, good: float):
+        """Adds one respondent given by the answers."""
+        values = (love, world, money, good, (good + love) / 2, (world + love) / 2, (world + money) / 2,
+                  (good + money) / 2)
+        for index, value in enumerate(values):
+            step = min(max(round((value - self.value_min) / self.resolution), 0), self.steps - 1)
+            self.counts[index, step] += 1
+            self._below[index, step + 1:] += 1
+        self.count += 1
+
+    def add(self, assessment):
+        """Adds one `ikirecord.Assessment`."""
+        self.add_values(*assessment.values)
+
+    def add_records(self, records):
+        """Adds the records of a results store (`ikistore.read_results(path).records`) in one pass."""
+        import numpy as np
+
+        from src import ikiscore, ikistore
+
+        if not len(records):
+            return
+
+        values = ikistore.values(records)
+        columns = np.column_stack((values, ikiscore.ring_averages(values)[:, list(ikiscore.PMVP_ORDER)]))
+        for index, steps in enumerate(self._steps(columns).T):
+            counts = np.bincount(steps, minlength=self.steps)
+            self.counts[index] += counts
+            self._below[index, 1:] += np.cumsum(counts[:-1])
+        self.count += len(columns)
+
+    # LOOKUPS -------------------------------------------------------------------------------------
+
+    def percentile(self, dimension: str, value: float) -> float:
+        """Percentile rank of one score.
+
+        Args:
+            dimension (str): The dimension ('love', 'passion', ...).
+            value (float): The score.
+
+        Returns:
+            float: The percentile rank (0-100), or NaN for an empty population.
+        """
+        if not self.count:
+            return float('nan')
+
+        index = DIMENSIONS.index(dimension)
+        step = min(max(round((value - self.value_min) / self.resolution), 0), self.steps - 1)
+        below = self._below[index, step]
+        return float((below + self.counts[index, step] / 2) * 100 / self.count)
+
+    def percentiles(self, dimension: str, values):
+        """Percentile ranks of many scores of one dimension.
+
+        Args:
+            dimension (str): The dimension ('love', 'passion', ...).
+            values: Array-like of scores.
+
+        Returns:
+            np.ndarray: The percentile ranks (0-100), NaN for an empty population.
+        """
+        import numpy as np
+
+        steps = self._steps(values)
+        if not self.count:
+            return np.full(steps.shape, np.nan)
+
+        index = DIMENSIONS.index(dimension)
+        return (self._below[index, steps] + self.counts[index, steps] / 2) * 100 / self.count
+
+    def of(self, assessment) -> dict:
+        """Percentile ranks of all dimensions of an `ikirecord.Assessment`, for renderers.
+
+        Returns:
+            dict: Percentile rank by dimension name ('love', ..., 'passion', ...).
+        """
+        values = assessment.values + assessment.pmvp
+        return {name: self.percentile(name, value) for name, value in zip(DIMENSIONS, values)}
@@ -0,0 +1,272 @@
+"""Results store module.
+
+Keeps finished assessments in an append-only binary file of fixed-width records, so that millions
+of historical results can be scanned without parsing text. Every record holds the four answers
+quantized to hundredths, the flags of `ikirecord.Assessment`, the date as days since 1970-01-01 and
+an index into the message table (the distinct conclusion and advice texts), which is kept in a
+JSON lines file next to the store.
+
+File layout:
+    - A header of HEADER_SIZE bytes: magic, version, record size and the number of committed records.
+    - The records, RECORD_DTYPE.itemsize bytes each.
+
+Appends are crash-safe: new messages are written first, then the records, and only after they are
+on disk the record count in the header is updated. Readers never look past the committed count and
+the writer cuts off anything after it when it opens the file again.
+"""
+
+import json
+import math
+import os
+import struct
+from collections import namedtuple
+from datetime import date, datetime
+
+import numpy as np
+
+from src.ikirecord import VALUE_NAMES, Assessment
+
+MAGIC = b'IKIS'
+VERSION = 1
+SCALE = 100  # Answers are stored in hundredths.
+DATE_FORMAT = '%d.%m.%Y'  # Format of `ikidef.current_date`.
+EPOCH = date(1970, 1, 1)
+NO_DATE = -2**31  # Day number of assessments without a date.
+
+HEADER = struct.Struct('<4sII8xQ')  # Magic, version, record size, (reserved), committed records.
+HEADER_SIZE = 64
+
+RECORD_DTYPE = np.dtype([
+    ('flags', '<u4'),  # `Assessment.flags`
+    ('date', '<i4'),  # Days since 1970-01-01
+    *((name, '<u2') for name in VALUE_NAMES),  # Answers in hundredths
+    ('message', '<u2'),  # Index into the message table
+    ('reserved', '<u2'),
+])
+
+MESSAGES_SUFFIX = '.messages.jsonl'
+
+Results = namedtuple('Results', ['records', 'messages'])
+Results.__doc__ = """Contents of a results store (see `read_results`).
+
+    records (np.memmap): The committed records (RECORD_DTYPE), mapped read-only from the file.
+    messages (list): The message table, (conclusion, advice) pairs by index.
+"""
+
+
+# HELPERS -------------------------------------------------------------------------------------
+
+def date_to_days(text: str) -> int:
+    """Converts a 'DD.MM.YYYY' date into days since 1970-01-01 (NO_DATE for an empty date)."""
+    if not text:
+        return NO_DATE
+    return (datetime.strptime(text, DATE_FORMAT).date() - EPOCH).days
+
+
+def days_to_date(days: int) -> str:
+    """Converts days since 1970-01-01 into a 'DD.MM.YYYY' date ('' for NO_DATE)."""
+    if days == NO_DATE:
+        return ''
+    return date.fromordinal(EPOCH.toordinal() + int(days)).strftime(DATE_FORMAT)
+
+
+def quantize(value: float) -> int:
+    """Converts an answer into hundredths.
+
+    Raises:
+        ValueError: If the answer is not finite, negative or too large for the record.
+    """
+    if not math.isfinite(value):
+        raise ValueError(f"The answer '{value}' cannot be stored.")
+    quantized = round(value * SCALE)
+    if not 0 <= quantized <= np.iinfo(np.uint16).max:
+        raise ValueError(f"The answer '{value}' cannot be stored.")
+    return quantized
+
+
+def _messages_path(path: str) -> str:
+    return path + MESSAGES_SUFFIX
+
+
+def _read_header(file) -> int:
+    """Checks the header of an open store and returns the number of committed records."""
+    header = file.read(HEADER.size)
+    if len(header) < HEADER.size:  # A truncated file.
+        raise ValueError("Not a results store of this version.")
+    magic, version, record_size, count = HEADER.unpack(header)
+    if magic != MAGIC or version != VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError("Not a results store of this version.")
+    return count
+
+
+def _read_messages(path: str, repair: bool = False) -> list:
+    """Reads the complete lines of a message table.
+
+    Args:
+        path (str): Path of the store file.
+        repair (bool): Whether a torn last line (from an interrupted append) is cut off the file.
+            Readers just ignore it.
+
+    Returns:
+        list: (conclusion, advice) pairs by index.
+    """
+    try:
+        with open(_messages_path(path), 'rb') as file:
+            content = file.read()
+    except FileNotFoundError:
+        return []
+
+    complete = content.rfind(b'\n') + 1
+    if repair and complete < len(content):
+        os.truncate(_messages_path(path), complete)
+
+    return [tuple(json.loads(line)) for line in content[:complete].splitlines()]
+
+
+# WRITING -------------------------------------------------------------------------------------
+
+class ResultStore:
+    """Appends assessments to a results store, creating it if needed.
+
+    Args:
+        path (str): Path of the store file. The message table is kept in `path + MESSAGES_SUFFIX`.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.messages = _read_messages(path, repair=True)
+        self._message_index = {message: index for index, message in enumerate(self.messages)}
+
+        self._file = open(path, 'r+b' if os.path.exists(path) else 'w+b')
+
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, 0).ljust(HEADER_SIZE, b'\0'))
+            self._sync()
+            self._count = 0
+        else:
+            self._count = _read_header(self._file)
+            # Drop records that were written but never committed.
+            self._file.truncate(HEADER_SIZE + self._count * RECORD_DTYPE.itemsize)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Closes the store file."""
+        self._file.close()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _message(self, conclusion: str, advice: str, new_messages: list) -> int:
+        """Returns the index of a message, adding it to the table if it is new."""
+        message = (conclusion, advice)
+        index = self._message_index.get(message)
+        if index is None:
+            index = len(self.messages)
+            if index > np.iinfo(np.uint16).max:
+                raise ValueError("The message table is full.")
+            self.messages.append(message)
+            self._message_index[message] = index
+            new_messages.append(message)
+        return index
+
+    def append(self, assessments) -> int:
+        """Appends assessments in one crash-safe commit.
+
+        Args:
+            assessments: An `ikirecord.Assessment` or an iterable of them.
+
+        Returns:
+            int: The number of records in the store.
+        """
+        if isinstance(assessments, Assessment):
+            assessments = [assessments]
+        assessments = list(assessments)
+
+        records = np.zeros(len(assessments), dtype=RECORD_DTYPE)
+        new_messages = []
+
+        try:
+            for index, assessment in enumerate(assessments):
+                records[index] = (
+                    assessment.flags,
+                    date_to_days(assessment.date),
+                    *(quantize(value) for value in assessment.values),
+                    self._message(assessment.text_conclusion, assessment.text_advice, new_messages),
+                    0,
+                )
+        except Exception:
+            # Nothing was written: forget the messages of this batch, whatever the error.
+            for message in new_messages:
+                del self._message_index[message]
+            del self.messages[len(self.messages) - len(new_messages):]
+            raise
+
+        # 1. Messages, so that every committed record points to a message on disk.
+        if new_messages:
+            with open(_messages_path(self.path), 'a', encoding='utf-8') as file:
+                file.writelines(json.dumps(message) + '\n' for message in new_messages)
+                file.flush()
+                os.fsync(file.fileno())
+
+        # 2. Records after the committed ones.
+        self._file.seek(HEADER_SIZE + self._count * RECORD_DTYPE.itemsize)
+        self._file.write(records.tobytes())
+        self._sync()
+
+        # 3. Commit: the new record count in the header.
+        self._count += len(records)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize, self._count))
+        self._sync()
+
+        return self._count
+
+
+# READING -------------------------------------------------------------------------------------
+
+def read_results(path: str) -> Results:
+    """Maps the committed records of a results store into memory.
+
+    The records are a read-only view of the file: nothing is parsed or copied until a column is
+    used, so scans of millions of records cost only the columns they touch.
+
+    Args:
+        path (str): Path of the store file.
+
+    Returns:
+        Results: The records and the message table.
+
+    Raises:
+        ValueError: If the file is not a results store.
+    """
+    with open(path, 'rb') as file:
+        count = _read_header(file)
+
+    if count:
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+    else:
+        records = np.zeros(0, dtype=RECORD_DTYPE)  # An empty file region cannot be mapped.
+
+    return Results(records, _read_messages(path))
+
+
+def values(records) -> np.ndarray:
+    """Returns the (love, world, money, good) answers of records as an (N, 4) float array."""
+    return np.column_stack([records[name] for name in VALUE_NAMES]) / SCALE
+
+
+def to_assessment(results: Results, index: int) -> Assessment:
+    """Rebuilds the `ikirecord.Assessment` of one record (without the name, which is not stored)."""
+    record = results.records[index]
+    text_conclusion, text_advice = results.messages[record['message']]
+    return Assessment(*(int(record[name]) / SCALE for name in VALUE_NAMES), int(record['flags']),
+                      text_conclusion, text_advice, date=days_to_date(record['date']))
@@ -0,0 +1,184 @@
+"""Module to render the Ikigai drawing as SVG.
+
+This module produces the same picture as `ikidraw.ikigai_draw` as an SVG document, without Tk or
+turtle, so that results can be rendered on machines without a display.
+"""
+
+from src import drawdef
+
+# Visible area in turtle coordinates (the origin is the center of the drawing).
+WIDTH = 1300
+HEIGHT = 900
+
+LINE_HEIGHT = 1.2  # Line height for multi-line texts, relative to the font size.
+TAB = '    '  # Tabs of wrapped texts are shown as spaces.
+
+
+def escape(text: str) -> str:
+    """Escapes '&', '<' and '>' in text content (like `xml.sax.saxutils.escape`, which imports urllib)."""
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def font_px(size: float) -> float:
+    """Converts a Tk font size in points to pixels."""
+    return size * 4 / 3
+
+
+def svg_color(color: str) -> str:
+    """Converts a Tk color name ('dark goldenrod') to an SVG color name ('darkgoldenrod')."""
+    return color.replace(' ', '')
+
+
+def svg_text(text: drawdef.Text) -> str:
+    """Renders a text anchored at its bottom center, like `turtle.write(..., align='center')`.
+
+    Args:
+        text (drawdef.Text): The text to render.
+
+    Returns:
+        str: The SVG <text> element.
+    """
+    size = font_px(text.size)
+    lines = text.text.split('\n')
+    # Multi-line texts grow upwards from the anchor; the last baseline sits a descent above it.
+    y = -text.y - size * 0.25 - (len(lines) - 1) * size * LINE_HEIGHT
+    tspans = ''.join(
+        f'<tspan x="{text.x:.1f}" dy="{0 if index == 0 else size * LINE_HEIGHT:.1f}">'
+        f'{escape(line.replace(chr(9), TAB)) or " "}</tspan>'
+        for index, line in enumerate(lines)
+    )
+    return (
+        f'<text y="{y:.1f}" fill="{svg_color(text.color)}" font-size="{size:.1f}" '
+        f'font-weight="{text.weight}">{tspans}</text>'
+    )
+
+
+def svg_body(layout: dict) -> str:
+    """Renders the circles and texts of a layout, everything except the name and date.
+
+    Args:
+        layout (dict): The layout from `drawdef.ikigai_layout`.
+
+    Returns:
+        str: The SVG elements.
+    """
+    r = layout['radius']
+    # SVG y points down, turtle y points up.
+    circles = [f'<circle cx="{x:.1f}" cy="{-y:.1f}" r="{r}"/>' for x, y in layout['circles']]
+
+    parts = [
+        f'<g fill="{drawdef.CIRCLE_FILL}">', *circles, '</g>',
+        f'<g fill="none" stroke="{drawdef.CIRCLE_OUTLINE}" stroke-width="{drawdef.CIRCLE_OUTLINE_WIDTH}">',
+        *circles, '</g>',
+        *(svg_text(text) for text in layout['texts']),
+    ]
+    return ''.join(parts)
+
+
+def svg_personal(personal: list) -> str:
+    """Renders the name and date texts (`layout['personal']` or `drawdef.personal_texts`)."""
+    return ''.join(svg_text(text) for text in personal)
+
+
+def svg_document(body: str) -> str:
+    """Wraps SVG elements into a standalone SVG document."""
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{HEIGHT}" '
+        f'viewBox="{-WIDTH / 2:g} {-HEIGHT / 2:g} {WIDTH} {HEIGHT}">'
+        f'<rect x="{-WIDTH / 2:g}" y="{-HEIGHT / 2:g}" width="100%" height="100%" fill="white"/>'
+        f'<g font-family="{drawdef.FONT_FAMILY}" text-anchor="middle" xml:space="preserve">'
+        f'{body}</g></svg>\n'
+    )
+
+
+def ikigai_svg(value_love: float, value_good: float, value_money: float, value_world: float,
+               value_max: float, value_minTrue: float, text_conclusion: str, text_advice: str,
+               your_name: str, test_date: str, path: str | None = None, cache=None,
+               percentiles: dict | None = None, profile=None) -> str:
+    """Renders the Ikigai drawing of `ikidraw.ikigai_draw` as SVG.
+
+    Args:
+        value_love (float): User's evaluation for "What you love."
+        value_good (float): User's evaluation for "What you're good at."
+        value_money (float): User's evaluation for "What you can be paid for."
+        value_world (float): User's evaluation for "What the world needs."
+        value_max (float): Maximum possible value for the evaluations.
+        value_minTrue (float): Minimum acceptable value for the evaluations.
+        text_conclusion (str): Conclusion text to display in the drawing.
+        text_advice (str): Advice text to display in the drawing.
+        your_name (str): Name of the user.
+        test_date (str): Date of the evaluation.
+        path (str | None): If given, the SVG is also written to this file.
+        cache (ikicache.RenderCache | None): If given, the drawing without the name and date is
+            taken from this cache (or rendered and stored in it).
+        percentiles (dict | None): If given, percentile ranks by dimension ('love', 'passion', ...)
+            shown under the values (see `ikistats.PercentileIndex.of`).
+        profile (ikiprofile.Profile | None): Scoring profile of the values, colors and name (see
+            `drawdef.ikigai_layout`).
+
+    Returns:
+        str: The SVG document.
+    """
+    args = (value_love, value_good, value_money, value_world, value_max, value_minTrue,
+            text_conclusion, text_advice)
+
+    if cache is None:
+        body = svg_body(drawdef.ikigai_layout(*args, your_name, test_date, profile))
+    else:
+        from src import ikicache
+
+        key = ikicache.render_key(*args, profile)
+        body = cache.get(key)
+        if body is None:
+            body = svg_body(drawdef.ikigai_layout(*args, your_name, test_date, profile))
+            cache.put(key, body)
+
+    # Percentiles depend on the population, so they are rendered outside the cached part.
+    extra = drawdef.personal_texts(your_name, test_date)
+    if percentiles:
+        extra += drawdef.percentile_texts(percentiles)
+
+    svg = svg_document(body + svg_personal(extra))
+
+    if path is not None:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(svg)
+
+    return svg
+
+
+def ring_svg(values: list | tuple, names: list | tuple, ring_names: list | tuple, hints: list | tuple,
+             value_max: float, value_minTrue: float, text_conclusion: str, text_advice: str,
+             your_name: str, test_date: str, path: str | None = None) -> str:
+    """Renders a model with any number of circles as SVG (see `drawdef.ring_layout`).
+
+    Args:
+        values (list | tuple): The N values, counterclockwise starting at the top.
+        names (list | tuple): The N circle labels.
+        ring_names (list | tuple): The N labels of the overlaps.
+        hints (list | tuple): The N advice hints shown outside the circles.
+        value_max (float): Maximum possible value for the evaluations.
+        value_minTrue (float): Minimum acceptable value for the evaluations.
+        text_conclusion (str): Conclusion text to display in the drawing.
+        text_advice (str): Advice text to display in the drawing.
+        your_name (str): Name of the user.
+        test_date (str): Date of the evaluation.
+        path (str | None): If given, the SVG is also written to this file.
+
+    Returns:
+        str: The SVG document.
+    """
+    layout = drawdef.ring_layout(values, names, ring_names, hints, value_max, value_minTrue,
+                                 text_conclusion, text_advice, your_name, test_date)
+    svg = svg_document(svg_body(layout) + svg_personal(layout['personal']))
+
+    if path is not None:
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(svg)
+
+    return svg
+
+
+# Render an example if this file is executed directly.
+if __name__ == '__main__':
+    print(ikigai_svg(5, 5, 2, 7, 10, 5, 'text_conclusion', 'text_advice', 'your_name', 'test_date'))
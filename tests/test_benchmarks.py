@@ -0,0 +1,34 @@
+"""Module for testing the benchmark suite in the benchmarks package."""
+
+import json
+
+from benchmarks import run
+
+
+def test_every_benchmark_runs():
+    """
+    Test that every benchmark runs at a small size and reports a positive time per call.
+    """
+    results = run.run_benchmarks(sizes=[2], repeat=1, min_time=0)
+
+    assert set(results['results']) == set(run.BENCHMARKS)
+    assert all(sizes['2'] > 0 for sizes in results['results'].values())
+
+
+def test_compare_with_baseline(tmp_path):
+    """
+    Test that slowdowns beyond the tolerance are reported as regressions and set the exit status.
+    """
+    baseline = {'results': {'is_it_number': {'1': 1.0, '100': 1.0}}}
+    current = {'results': {'is_it_number': {'1': 1.1, '100': 1.5, '10000': 9.0}}}
+
+    rows = run.compare(current, baseline, tolerance=0.25)
+    assert [(size, regressed) for _, size, _, _, _, regressed in rows] == [('1', False), ('100', True)]
+
+    path = tmp_path / 'baseline.json'
+    path.write_text(json.dumps({'results': {'is_it_number': {'1': 1e-12}}}))
+    assert run.main(['is_it_number', '--repeat', '1', '--baseline', str(path)]) == 1
+
+    path.write_text(json.dumps({'results': {'is_it_number': {'1': 1.0}}}))
+    assert run.main(['is_it_number', '--repeat', '1', '--baseline', str(path), '--save', str(tmp_path / 'new.json')]) == 0
+    assert 'is_it_number' in json.loads((tmp_path / 'new.json').read_text())['results']
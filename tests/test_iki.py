@@ -155,6 +155,58 @@ def test_is_it_number_edge_cases():
 
 
 
+def test_prompts_with_answer_source():
+    """
+    Test the prompt functions with an answer source and output sink, including their retry loops.
+    """
+    transcript = ikidef.Transcript(['J', 'Jane Doe', 'abc', '11', '7,5', 'YES', 'yes'])
+
+    assert ikidef.input_limit('Name?', 2, 30, transcript.source, transcript.sink) == 'Jane Doe'
+    assert ikidef.ask_for_number('Love?', 0, 10, transcript.source, transcript.sink) == 7.5
+    assert ikidef.ask_for_yn('Ok?', 'yes', 'no', 'Answer yes/no!', transcript.source, transcript.sink) is True
+
+    assert transcript.questions[:2] == ['Name? ', 'Name? ']
+    assert transcript.answers[-1] == 'yes'
+    assert "'abc' is not a number!" in transcript.output
+    assert "Your answer '11.0' is out of range!" in transcript.output
+    assert transcript.lines[-1] == ('Answer yes/no!', '\n')
+
+    # A queue works as a source too, and a source that runs out ends the session like `input` at EOF.
+    import queue
+
+    answers = queue.Queue()
+    answers.put('5')
+    assert ikidef.ask_for_number('Love?', 0, 10, ikidef.answers_from(answers), transcript.sink) == 5.0
+    with pytest.raises(EOFError):
+        ikidef.ask_for_yn('Ok?', 'yes', 'no', 'Error', ikidef.answers_from(['maybe']), transcript.sink)
+
+
+def test_answers_from_async_queue():
+    """
+    Test that an asyncio queue is rejected instead of giving coroutines as answers.
+    """
+    import asyncio
+
+    with pytest.raises(TypeError, match='ikiservice'):
+        ikidef.answers_from(asyncio.Queue())
+
+
+def test_replay_main_module():
+    """
+    Test that recorded sessions of the main module replay to the same results and output.
+    """
+    import IKIGAI_PRO_WORK
+
+    recorded = ikidef.Transcript(['Jane Doe', '8', 'x', '6', '7', '9', 'no', 'yes'])
+    result = IKIGAI_PRO_WORK.questionnaire(recorded.source, recorded.sink, draw=False)
+
+    assert result['text_conclusion'] == "Your score is fine. Still, there is room for improvement if you wish."
+    for _ in range(200):
+        replay = ikidef.Transcript(recorded.answers)
+        assert IKIGAI_PRO_WORK.questionnaire(replay.source, replay.sink, draw=False) == result
+        assert replay.output == recorded.output
+
+
 def test_true_or_not():
     """
     Test the `true_or_not` function with basic functionality, edge cases, and floating-point precision.
@@ -339,5 +391,120 @@ def test_max_line_length():
     assert drawdef.max_line_length(text, len(text)) == text
 
 
+def reference_max_line_length(text, max_length):
+    """The original, quadratic implementation of max_line_length."""
+    text_mod = ''
+    for line in text.split('\n'):
+        current_line = ''
+        for word in line.split(' '):
+            if len(current_line) + 1 + len(word) <= max_length:
+                if current_line:
+                    current_line += ' '
+                current_line += word
+            else:
+                text_mod += '\n' + current_line
+                current_line = '\t' + word
+        if current_line:
+            text_mod += '\n' + current_line
+    return text_mod.strip()
+
+
+def test_max_line_length_matches_reference():
+    """Test max_line_length against the original implementation on random texts."""
+    import random
+
+    rng = random.Random(7)
+    pieces = ['a', 'word', 'longerword', 'x' * 12, '', ' ', '\n', '\t', 'end.']
+
+    for _ in range(2000):
+        text = ' '.join(rng.choice(pieces) for _ in range(rng.randint(0, 30)))
+        max_length = rng.randint(1, 20)
+        assert drawdef.max_line_length(text, max_length) == reference_max_line_length(text, max_length)
+
+
+def test_max_line_length_long_text():
+    """Test max_line_length on a long text and its memoization."""
+    text = ' '.join(['word'] * 100000)
+    wrapped = drawdef.max_line_length(text, 70)
+
+    assert wrapped == reference_max_line_length(text, 70)
+    assert drawdef.max_line_length(text, 70) is wrapped  # Memoized result.
+
+
+def test_wrap_paragraphs():
+    """Test that wrap_paragraphs wraps a stream of paragraphs lazily."""
+    import itertools
+
+    paragraphs = itertools.cycle(['lin1 lin2 lin3 lin4', 'short'])  # Infinite stream.
+    wrapped = drawdef.wrap_paragraphs(paragraphs, 10)
+
+    assert list(itertools.islice(wrapped, 3)) == ['lin1 lin2\n\tlin3 lin4', 'short', 'lin1 lin2\n\tlin3 lin4']
+
+
+
+
+def test_color_name_by_limits():
+    """Test the color_name_by_limits function."""
+    assert drawdef.color_name_by_limits(10, 10, 5) == 'green'
+    assert drawdef.color_name_by_limits(5, 10, 5) == 'dark goldenrod'
+    assert drawdef.color_name_by_limits(9.9, 10, 5) == 'dark goldenrod'
+    assert drawdef.color_name_by_limits(4.9, 10, 5) == 'red'
+
+
+def test_ikigai_layout():
+    """Test the positions and values of the ikigai_layout function."""
+    layout = drawdef.ikigai_layout(5.0, 5.0, 2.0, 7.0, 10, 5, 'conclusion', 'advice', 'Jane', '01.01.2025')
+
+    assert len(layout['circles']) == 4
+    assert layout['radius'] == 150
+
+    texts = {text.text: text for text in layout['texts']}
+    assert texts['LOVE'][:2] == pytest.approx((0, 180))  # Up from the center.
+    assert texts['5.0'].color == 'dark goldenrod'
+    assert texts['2.0'][:2] == pytest.approx((0, -205))  # Money value, under its label.
+    assert texts['2.0'].color == 'red'
+    assert texts['4.75'].color == 'red'  # Average of the four values in the center.
+    assert 'Conclusion:\n- conclusion' in layout['texts'][-1].text
+
+    assert [text.text for text in layout['personal']] == ['IKIGAI - ', 'Jane', '01.01.2025']
+
+
+# `ikigai_layout` of 5.0, 5.0, 2.0, 7.0 before it was generalized to N circles: (x, y, text, color, size)
+IKIGAI_LAYOUT_BEFORE_RING = [
+    (0.0, 180.0, 'LOVE', 'white', 14), (0.0, 155.0, '5.0', 'dark goldenrod', 18),
+    (-180.0, 0.0, 'GOOD AT', 'white', 14), (-180.0, -25.0, '5.0', 'dark goldenrod', 18),
+    (0.0, -180.0, 'PAID FOR', 'white', 14), (0.0, -205.0, '2.0', 'red', 18),
+    (180.0, 0.0, 'WORLD', 'white', 14), (180.0, -25.0, '7.0', 'dark goldenrod', 18),
+    (0.0, -10.0, '4.75', 'red', 18),
+    (63.6396, 53.6396, 'MISSION', 'white', 14), (63.6396, 28.6396, '6.0', 'dark goldenrod', 18),
+    (-63.6396, 53.6396, 'PASSION', 'white', 14), (-63.6396, 28.6396, '5.0', 'dark goldenrod', 18),
+    (-63.6396, -73.6396, 'PROFESSION', 'white', 14), (-63.6396, -98.6396, '3.5', 'red', 18),
+    (63.6396, -73.6396, 'VOCATION', 'white', 14), (63.6396, -98.6396, '4.5', 'red', 18),
+    (385.0, -10.0, 'Increase the part that helps.', 'red', 12),
+    (-365.0, -10.0, 'Learn necessary things.', 'red', 12),
+    (10.0, 290.0, 'Improve the environment.', 'red', 12),
+    (10.0, -310.0, 'Ask for more money.', 'red', 12),
+    (399.3178, -300.9075, 'Conclusion:\n- conclusion\nAdvice:\nadvice', 'black', 8),
+]
+CIRCLES_BEFORE_RING = [(1.1564, 136.3141), (-135.4785, 1.2922), (-0.4566, -135.3426), (136.1783, -0.3207)]
+
+
+def test_ring_layout():
+    """Test that ring_layout draws any number of circles and draws four like the original ikigai_layout."""
+    names = ('A', 'B', 'C', 'D', 'E', 'F')
+    layout = drawdef.ring_layout((1, 2, 3, 4, 5, 6), names, [name * 2 for name in names], names,
+                                 10, 5, 'conclusion', 'advice', 'Jane', '01.01.2025')
+
+    assert len(layout['circles']) == 6
+    assert sum(x for x, _ in layout['circles']) == pytest.approx(0, abs=1e-9)  # Centered.
+    texts = {text.text: text for text in layout['texts']}
+    assert texts['FF'].color == 'white'  # Overlap of the last and first circle.
+    assert texts['3.5'].color == 'red'  # Average of the six values in the center.
 
+    layout = drawdef.ikigai_layout(5.0, 5.0, 2.0, 7.0, 10, 5, 'conclusion', 'advice', 'Jane', '01.01.2025')
 
+    assert [(text.text, text.color, text.size) for text in layout['texts']] \
+        == [expected[2:] for expected in IKIGAI_LAYOUT_BEFORE_RING]
+    assert [text[:2] for text in layout['texts']] \
+        == [pytest.approx(expected[:2], abs=1e-4) for expected in IKIGAI_LAYOUT_BEFORE_RING]
+    assert layout['circles'] == [pytest.approx(center, abs=1e-4) for center in CIRCLES_BEFORE_RING]
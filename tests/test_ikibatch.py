@@ -0,0 +1,258 @@
+"""Module for testing the non-interactive batch mode in the ikibatch module."""
+
+import csv
+import io
+import itertools
+import json
+
+import pytest
+
+import IKIGAI_PRO_WORK
+from src import ikibatch, ikieval
+
+
+def run_main_module(love, world, money, good, yn_answer):
+    """Runs the questionnaire of the main module with scripted answers and returns the drawn texts."""
+    answers = iter(['Jane Doe', str(love), str(world), str(money), str(good)])
+
+    def scripted_input(question=''):
+        if 'yes/no' in question:
+            return yn_answer(question)
+        return next(answers)
+
+    result = IKIGAI_PRO_WORK.questionnaire(scripted_input, lambda *args, **kwargs: None, draw=False)
+    if not result['draw_iki']:
+        return {}
+    return {'conclusion': result['text_conclusion'], 'advice': result['text_advice']}
+
+
+def evaluate(rows):
+    """Evaluates rows through the batch pipeline."""
+    return list(ikibatch.evaluate_rows(rows))
+
+
+def test_batch_matches_main_module():
+    """
+    Test that the batch conclusions and advice match the interactive main module,
+    for a spread of scores and both answers to the follow-up questions.
+    """
+    cases = [(10, 10, 10, 10), (9, 7, 8, 6), (8, 8, 8, 8), (2, 3, 9, 9), (6, 4, 5, 6), (0, 0, 0, 0)]
+
+    for values, yn in itertools.product(cases, ('yes', 'no')):
+        # Random advice is declined, every other follow-up question gets the same answer.
+        drawn = run_main_module(*values,
+                                lambda question: 'no' if 'random' in question else yn)
+        row = dict(zip(ikibatch.ANSWER_FIELDS, values))
+        row.update({field: yn for field in ikibatch.YN_FIELDS})
+        [result] = evaluate([row])
+
+        if drawn:
+            assert (result['conclusion'], result['advice']) == (drawn['conclusion'], drawn['advice'])
+        else:
+            assert (result['conclusion'], result['advice']) == ('-', '-')
+
+
+def test_evaluate_rows_results():
+    """
+    Test the scores and texts of evaluated rows.
+    """
+    rows = [
+        {'name': 'Ann', 'love': '10', 'world': '10', 'money': '10', 'good': '10'},
+        {'name': 'Bob', 'love': '8', 'world': '6', 'money': '7,5', 'good': '9', 'make_love': 'yes',
+         'make_world': 'yes'},
+    ]
+    first, second = evaluate(rows)
+
+    assert first['row'] == 1 and first['name'] == 'Ann'
+    assert first['conclusion'] == ikieval.msg_congrat
+    assert first['score_LWMG_avr'] == 10
+
+    assert second['money'] == 7.5
+    assert second['profession'] == 8.25
+    assert second['conclusion'] == ikieval.msg_space
+    assert ikieval.msg_try_world in second['advice']
+    assert ikieval.msg_try_love not in second['advice']  # Not asked: vocation is the lowest.
+
+
+def test_evaluate_rows_errors():
+    """
+    Test that invalid rows produce an error record and do not stop the batch.
+    """
+    rows = [
+        {'love': 'abc', 'world': '1', 'money': '1', 'good': '1'},
+        {'love': '11', 'world': '1', 'money': '1', 'good': '1'},
+        {'love': '1', 'world': '1', 'money': '1'},
+        {'love': '1', 'world': '1', 'money': '1', 'good': '1', 'make_love': 'maybe'},
+        {'love': '1', 'world': '1', 'money': '1', 'good': '1'},
+    ]
+    results = evaluate(rows)
+
+    assert [result['row'] for result in results] == [1, 2, 3, 4, 5]
+    assert 'not a number' in results[0]['error']
+    assert 'out of range' in results[1]['error']
+    assert 'Missing answer' in results[2]['error']
+    assert 'maybe' in results[3]['error']
+    assert results[4]['error'] == ''
+    assert results[4]['conclusion'] == ikieval.msg_under
+
+
+def test_evaluate_rows_is_lazy():
+    """
+    Test that rows are consumed chunk by chunk, not all at once.
+    """
+    row = {'love': '5', 'world': '5', 'money': '5', 'good': '5'}
+    rows = itertools.repeat(row)  # Infinite input.
+
+    results = ikibatch.evaluate_rows(rows, chunk_size=10)
+    assert [result['row'] for result in itertools.islice(results, 25)] == list(range(1, 26))
+
+
+def test_run_batch_csv_and_jsonl(tmp_path):
+    """
+    Test reading CSV and JSONL files and writing CSV and JSONL results.
+    """
+    csv_path = tmp_path / 'answers.csv'
+    csv_path.write_text('name,love,world,money,good,make_good\nAnn,4,4,4,4,yes\n', encoding='utf-8')
+    jsonl_path = tmp_path / 'answers.jsonl'
+    jsonl_path.write_text('{"name": "Ann", "love": 4, "world": 4, "money": 4, "good": 4, "make_good": true}\n\n',
+                          encoding='utf-8')
+
+    output = io.StringIO()
+    assert ikibatch.run_batch(str(jsonl_path), output) == 1
+    record = json.loads(output.getvalue())
+    assert record['name'] == 'Ann'
+    assert record['conclusion'] == ikieval.msg_under  # Good alone does not fix love, world and money.
+
+    output = io.StringIO()
+    assert ikibatch.run_batch(str(csv_path), output, output_format='csv') == 1
+    header, line = output.getvalue().splitlines()
+    assert header.split(',') == list(ikibatch.RESULT_FIELDS)
+    assert line.startswith('1,Ann,,4.0,4.0,4.0,4.0,')
+
+
+def test_unsupported_format():
+    """
+    Test that unsupported file formats are rejected.
+    """
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        list(ikibatch.read_answers(io.StringIO(''), 'xml'))
+
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        ikibatch.write_results([], io.StringIO(), 'xml')
+
+    with pytest.raises(ValueError, match="Unsupported file format"):
+        ikibatch.write_batches([], io.StringIO(), 'xml')
+
+
+EXPORT_ROWS = [
+    {'name': 'Ann', 'date': '18.10.2026', 'love': '10', 'world': '10', 'money': '10', 'good': '10'},
+    {'name': 'Bob, "B"', 'love': '8', 'world': '6', 'money': '7,5', 'good': '9', 'make_world': 'yes'},
+    {'name': 'Cid', 'love': 'abc', 'world': '1', 'money': '1', 'good': '1'},
+    {'name': 'Dee', 'love': '2', 'world': '3', 'money': '9', 'good': '9', 'make_love': 'yes'},
+]
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'jsonl'])
+def test_write_batches_matches_write_results(file_format):
+    """
+    Test that the columnar export writes the same files as the record-by-record export.
+    """
+    expected = io.StringIO()
+    ikibatch.write_results(ikibatch.evaluate_rows(EXPORT_ROWS), expected, file_format)
+
+    output = io.StringIO()
+    count = ikibatch.write_batches(ikibatch.evaluate_batches(EXPORT_ROWS, chunk_size=3), output, file_format)
+
+    assert count == 4
+    assert output.getvalue() == expected.getvalue()
+
+
+def test_write_batches_one_write_per_batch():
+    """
+    Test that every batch is written with a single call.
+    """
+    class CountingStream(io.StringIO):
+        writes = 0
+
+        def write(self, text):
+            self.writes += 1
+            return super().write(text)
+
+    stream = CountingStream()
+    ikibatch.write_batches(ikibatch.evaluate_batches(EXPORT_ROWS * 10, chunk_size=8), stream, 'jsonl')
+
+    assert stream.writes == 5
+
+
+def test_npy_columns(tmp_path):
+    """
+    Test that the .npy columns load with NumPy and hold the results of `evaluate_rows`.
+    """
+    import numpy as np
+
+    count = ikibatch.write_npy_columns(ikibatch.evaluate_batches(EXPORT_ROWS, chunk_size=3), str(tmp_path))
+    records = evaluate(EXPORT_ROWS)
+
+    assert count == 4
+    assert np.load(tmp_path / 'row.npy').tolist() == [1, 2, 3, 4]
+    passion = np.load(tmp_path / 'passion.npy', mmap_mode='r')
+    assert passion.dtype == np.float64 and passion[1] == records[1]['passion'] and np.isnan(passion[2])
+    assert np.load(tmp_path / 'ok_mission.npy').tolist() == [True, True, False, False]
+
+    for field in ('name', 'conclusion', 'advice', 'error'):
+        texts = np.load(tmp_path / f'{field}.labels.npy')[np.load(tmp_path / f'{field}.npy')]
+        assert texts.tolist() == [record.get(field, '') for record in records]
+
+
+def test_main_npy(tmp_path):
+    """
+    Test the npy output format of the command line.
+    """
+    answers = tmp_path / 'answers.jsonl'
+    answers.write_text('\n'.join(json.dumps(row) for row in EXPORT_ROWS), encoding='utf-8')
+
+    assert ikibatch.main([str(answers), '-o', str(tmp_path / 'columns'), '--output-format', 'npy']) == 0
+    assert len(list((tmp_path / 'columns').glob('*.npy'))) == len(ikibatch.RESULT_FIELDS) + len(ikibatch.TEXT_FIELDS)
+
+
+def test_result_fields_of_main_module():
+    """
+    Test that the fields of the main module's model keep the output columns of the batch mode.
+    """
+    assert ikibatch.RESULT_FIELDS == (
+        'row', 'name', 'date', 'love', 'world', 'money', 'good', 'score_LWMG_avr', 'score_LWMG_min',
+        'passion', 'mission', 'vocation', 'profession', 'ok_passion', 'ok_mission', 'ok_vocation', 'ok_profession',
+        'conclusion', 'advice', 'error', 'profile',
+    )
+    assert ikibatch.BOOL_FIELDS == ('ok_passion', 'ok_mission', 'ok_vocation', 'ok_profession')
+
+
+def test_batch_of_five_circles(tmp_path):
+    """
+    Test that a five-circle model is scored, decided and written with a column per circle and ring.
+    """
+    model = ikieval.make_model(('love', 'world', 'money', 'good', 'health'))
+    fields = ikibatch.result_fields(model)
+    rows = [{'name': 'Ann', 'love': '8', 'world': '2', 'money': '8', 'good': '8', 'health': '9', 'make_love': 'yes'},
+            {'name': 'Bob', 'love': '8', 'world': '2', 'money': '8', 'good': '8', 'health': 'x'}]
+
+    ann, bob = ikibatch.evaluate_rows(rows, model=model)
+
+    assert tuple(ann) == fields and 'ok_health-love' in fields
+    assert (ann['health'], ann['love-world'], ann['ok_love-world'], ann['score_LWMG_avr']) == (9.0, 5.0, True, 7.0)
+    assert ann['advice'] == ikieval.temp_advice.format(adv=ikieval.text_space, plus=model.tries[0])
+    assert bob['error'].startswith("'health':")
+
+    answers = tmp_path / 'answers.jsonl'
+    answers.write_text('\n'.join(json.dumps(row) for row in rows), encoding='utf-8')
+    assert ikibatch.main([str(answers), '-o', str(tmp_path / 'results.csv'),
+                          '--dimensions', 'love,world,money,good,health']) == 0
+    with open(tmp_path / 'results.csv', newline='', encoding='utf-8') as file:
+        header, first, second = csv.reader(file)
+    assert header == list(fields)
+    assert first[:10] == ['1', 'Ann', '', '8.0', '2.0', '8.0', '8.0', '9.0', '7.0', '2.0']
+    assert second[fields.index('error')] == bob['error']
+
+    assert ikibatch.main([str(answers), '-o', str(tmp_path / 'columns'), '--output-format', 'npy',
+                          '--dimensions', 'love,world,money,good,health']) == 0
+    assert len(list((tmp_path / 'columns').glob('*.npy'))) == len(fields) + len(ikibatch.TEXT_FIELDS)
@@ -0,0 +1,68 @@
+"""Module for testing the render cache in the ikicache module."""
+
+import random
+
+import pytest
+
+from src import ikicache, ikiprofile, ikisvg
+
+
+def test_render_key():
+    """
+    Test that the key depends on the scores, texts and profile, including the type of the values.
+    """
+    key = ikicache.render_key(5.0, 5.0, 2.0, 7.0, 10, 5, 'conclusion', 'advice')
+
+    assert key == ikicache.render_key(5.0, 5.0, 2.0, 7.0, 10, 5, 'conclusion', 'advice')
+    assert key != ikicache.render_key(5.0, 5.0, 2.0, 7.0, 10, 5, 'conclusion', 'other advice')
+    assert key != ikicache.render_key(5, 5.0, 2.0, 7.0, 10, 5, 'conclusion', 'advice')  # '5' vs '5.0'
+    profile = ikiprofile.profile_from_dict({'thresholds': {'money': 3}})
+    assert key != ikicache.render_key(5.0, 5.0, 2.0, 7.0, 10, 5, 'conclusion', 'advice', profile)
+
+
+def test_lru_eviction():
+    """
+    Test that the least recently used entry is evicted when the cache is full.
+    """
+    cache = ikicache.RenderCache(max_entries=2)
+    cache.put('a', 'A')
+    cache.put('b', 'B')
+    assert cache.get('a') == 'A'  # 'b' is now the least recently used entry.
+    cache.put('c', 'C')
+
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == 'A' and cache.get('c') == 'C'
+    assert (cache.hits, cache.misses) == (3, 1)
+    assert cache.hit_rate == 0.75
+
+    with pytest.raises(ValueError, match="at least one entry"):
+        ikicache.RenderCache(max_entries=0)
+
+
+def test_persistent_cache(tmp_path):
+    """
+    Test that persisted entries are found by a new cache using the same directory.
+    """
+    ikicache.RenderCache(directory=str(tmp_path)).put('key', '<g/>')
+
+    cache = ikicache.RenderCache(directory=str(tmp_path))
+    assert cache.get('key') == '<g/>'
+    assert cache.get('missing') is None
+    assert [path.name for path in tmp_path.iterdir()] == ['key.svg']
+
+
+def test_cached_svg_is_identical():
+    """
+    Test that a cached rendering equals an uncached one and that repeated scores hit the cache.
+    """
+    rng = random.Random(1)
+    cache = ikicache.RenderCache(max_entries=4096)
+    messages = ('conclusion A', 'conclusion B', 'conclusion C')
+
+    for index in range(2000):
+        values = [rng.choice((5.0, 8.0, 10.0)) for _ in range(4)]
+        args = values + [10, 5, rng.choice(messages), '-', f'Person {index}', '18.10.2026']
+        assert ikisvg.ikigai_svg(*args, cache=cache) == ikisvg.ikigai_svg(*args)
+
+    assert cache.hit_rate > 0.8  # 243 distinct drawings for 2000 reports.
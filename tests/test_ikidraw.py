@@ -0,0 +1,183 @@
+"""Module for testing the bulk rendering in the ikidraw module."""
+
+import sys
+
+import pytest
+
+from src import drawdef, ikidraw, ikieval, ikiprofile, ikisvg
+
+
+class FakeTurtle:
+    """Stands in for the `turtle` module and counts the screen updates, without a display.
+
+    Like the real screen, every drawing command is shown at once (one update) while tracing is on;
+    `turtle.circle` shows every segment. With `tracer(0)` only `update()` updates the screen.
+    """
+
+    DRAWING = {'forward', 'back', 'goto', 'left', 'right', 'home', 'write', 'begin_fill', 'end_fill',
+               'pensize', 'penup', 'pendown', 'hideturtle', 'speed'}
+
+    def __init__(self):
+        self.tracing = 1
+        self.updates = 0
+        self.written = []
+        self.colors = []  # Pen color of every written text.
+        self.pen = 'black'
+
+    def tracer(self, n=None, delay=None):
+        self.tracing = n
+
+    def update(self):
+        self.updates += 1
+
+    def circle(self, radius):
+        if self.tracing:
+            self.updates += 1 + int(min(11 + abs(radius) / 6, 59))  # Segments of `turtle.circle`.
+
+    def color(self, pen, fill=None):
+        self.pen = pen
+        if self.tracing:
+            self.updates += 1
+
+    def write(self, text, **kwargs):
+        self.written.append(str(text))
+        self.colors.append(self.pen)
+        if self.tracing:
+            self.updates += 1
+
+    def exitonclick(self):
+        pass
+
+    def __getattr__(self, name):
+        if name not in self.DRAWING:
+            raise AttributeError(name)
+
+        def command(*args, **kwargs):
+            if self.tracing:
+                self.updates += 1
+
+        return command
+
+
+def make_records(count):
+    """Builds example records with the arguments of `ikigai_draw`."""
+    return [dict(value_love=float(index % 11), value_good=5.0, value_money=7.0, value_world=3.0,
+                 value_max=10, value_minTrue=5, text_conclusion='conclusion', text_advice='advice',
+                 your_name=f'Person {index}', test_date='18.10.2026')
+            for index in range(count)]
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_ikigai_draw_many(tmp_path, capsys, workers):
+    """
+    Test that every record is written to its own file, identical to a single rendering.
+    """
+    records = make_records(25)
+    stats = ikidraw.ikigai_draw_many(iter(records), str(tmp_path), workers=workers, chunk_size=4)
+
+    assert stats['reports'] == 25
+    assert stats['per_second'] > 0
+    assert 'reports/s' in capsys.readouterr().out
+
+    files = sorted(tmp_path.iterdir())
+    assert [file.name for file in files] == [f'report_{index:06d}.svg' for index in range(1, 26)]
+    assert files[3].read_text(encoding='utf-8') == ikisvg.ikigai_svg(**records[3])
+
+
+def test_ikigai_draw_many_file_names(tmp_path):
+    """
+    Test that records can name their file, without modifying the records.
+    """
+    records = make_records(2)
+    records[0]['file'] = 'first.svg'
+
+    ikidraw.ikigai_draw_many(records, str(tmp_path / 'out'), workers=1)
+
+    assert sorted(file.name for file in (tmp_path / 'out').iterdir()) == ['first.svg', 'report_000002.svg']
+    assert records[0]['file'] == 'first.svg'
+
+
+DRAW_ARGS = (7.0, 4.0, 6.0, 3.0, 10, 5, 'conclusion', 'advice', 'Jane Doe', '18.10.2026')
+
+
+@pytest.fixture
+def screen(monkeypatch, capsys):
+    """Replaces the turtle module with a `FakeTurtle`."""
+    fake = FakeTurtle()
+    monkeypatch.setitem(sys.modules, 'turtle', fake)
+    return fake
+
+
+def test_instant_draw_single_update(screen):
+    """
+    Test that the instant mode shows the whole drawing with one screen update.
+    """
+    ikidraw.ikigai_draw(*DRAW_ARGS, percentiles={'love': 73.0}, instant=True)
+
+    assert screen.tracing == 0
+    assert screen.updates == 1
+
+    layout = drawdef.ikigai_layout(*DRAW_ARGS)
+    expected = [text.text for text in layout['texts'] + layout['personal']] + ['73rd percentile']
+    assert screen.written == expected
+
+
+def test_animated_draw_updates(screen):
+    """
+    Test that the animated drawing updates the screen at every step, unlike the instant mode.
+    """
+    ikidraw.ikigai_draw(*DRAW_ARGS)
+
+    assert screen.updates > 8 * 37  # Four filled and four outlined circles of 37 segments.
+
+
+def test_circle_points():
+    """
+    Test the polygon approximating a circle.
+    """
+    points = drawdef.circle_points(10, -5, 150, steps=4)
+
+    assert len(points) == 5
+    assert points[0] == pytest.approx((160, -5))
+    assert points[1] == pytest.approx((10, 145))
+    assert points[-1] == pytest.approx(points[0])
+
+
+def test_draw_with_profile_thresholds(screen):
+    """
+    Test that the animated drawing colors every value by its own threshold and names the profile.
+    """
+    profile = ikiprofile.profile_from_dict({'name': 'strict', 'thresholds': {'money': 3, 'passion': 9}})
+    ikidraw.ikigai_draw(5, 8, 4, 5, 10, 5, 'conclusion', 'advice', 'Jane Doe', '18.10.2026', profile=profile)
+
+    colors = dict(zip(screen.written, screen.colors))
+    assert colors['4'] == 'dark goldenrod'  # Money passes its threshold of 3.
+    assert colors['6.5'] == 'red'  # Passion is under its threshold of 9.
+    assert screen.written[-2] == 'Profile: strict'
+
+    layout = drawdef.ikigai_layout(5, 8, 4, 5, 10, 5, 'conclusion', 'advice', 'Jane Doe', '18.10.2026', profile)
+    values = [text for text in layout['texts'] if text.size == 18]
+    assert [(text.text, text.color) for text in values] == [(text.text, colors[text.text]) for text in values]
+    assert 'Profile: strict' in [text.text for text in layout['texts']]
+
+
+def test_ring_draw(screen):
+    """
+    Test that the main module's model is drawn by `ikigai_draw` and a five-circle model at once,
+    with its labels, rings and the threshold of the profile.
+    """
+    ikidraw.ring_draw(ikieval.IKIGAI_MODEL, (7.0, 3.0, 6.0, 4.0), *DRAW_ARGS[4:], instant=True)
+    layout = drawdef.ikigai_layout(*DRAW_ARGS)
+    assert screen.written == [text.text for text in layout['texts'] + layout['personal']]
+
+    model = ikieval.make_model(('love', 'world', 'money', 'good', 'health'))
+    profile = ikiprofile.profile_from_dict({'name': 'strict', 'value_minTrue': 6})
+    screen.written, screen.colors, screen.updates = [], [], 0
+    ikidraw.ring_draw(model, (7, 3, 6, 4, 9), *DRAW_ARGS[4:], profile=profile)
+
+    assert screen.updates == 1
+    colors = dict(zip(screen.written, screen.colors))
+    assert 'HEALTH' in colors and 'HEALTH-LOVE' in colors
+    assert colors['5'] == 'red'  # love-world is under the profile threshold of 6.
+    assert colors['8'] == 'dark goldenrod'  # health-love
+    assert 'Profile: strict' in screen.written
@@ -0,0 +1,195 @@
+"""Module for testing the evaluation and the decision table in the ikieval module."""
+
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from src import ikieval, ikiscore
+
+
+def reference_decision(scores, make, value_max, model=ikieval.IKIGAI_MODEL):
+    """Runs the if/elif cascade (`questions_to_ask` and `conclusion_and_advice`) for one respondent."""
+    outcome, ask = ikieval.questions_to_ask(scores, value_max, model)
+    make = tuple(asked and make_it for asked, make_it in zip(ask, make))
+    text_conclusion, text_advice, draw_iki = ikieval.conclusion_and_advice(scores, make, value_max, model)
+    return outcome, ask, text_conclusion, text_advice, draw_iki
+
+
+def four_circle_decision(scores, make, value_max):
+    """The four-circle cascade of the main module, written out (pins the generic cascade for N = 4)."""
+    ok = {name: scores[f'ok_{name}'] for name in ('passion', 'mission', 'vocation', 'profession')}
+    pairs = {'passion': ('love', 'good'), 'mission': ('love', 'world'), 'vocation': ('world', 'money'),
+             'profession': ('money', 'good')}
+    ask = dict.fromkeys(('love', 'world', 'money', 'good'), False)
+
+    if scores['score_LWMG_avr'] == value_max:
+        outcome = ikieval.OUTCOME_MAX
+    elif all(ok.values()) and scores['score_PWMP_avr'] < value_max:
+        outcome = ikieval.OUTCOME_IMPROVE
+        for ring, (first, second) in pairs.items():
+            if scores['score_PWMP_min'] == scores[f'value_{ring}']:
+                ask[first] = ask[second] = True
+    elif not all(ok.values()):
+        outcome = ikieval.OUTCOME_UNDER
+        for ring, (first, second) in pairs.items():
+            if not ok[ring]:
+                ask[first] = ask[second] = True
+    else:
+        outcome = ikieval.OUTCOME_UNEXPECTED
+
+    made = {name: asked and make_it for (name, asked), make_it in zip(ask.items(), make)}
+    text_conclusion = text_advice = '-'
+    draw_iki = False
+    if scores['score_LWMG_avr'] == value_max:
+        text_conclusion, draw_iki = ikieval.msg_congrat, True
+    if not all(ok.values()):
+        if any(not ok[ring] and not made[first] and not made[second] for ring, (first, second) in pairs.items()):
+            text_conclusion, text_advice, draw_iki = ikieval.msg_under, ikieval.msg_change_job, True
+    elif scores['score_LWMG_avr'] < value_max:
+        text_conclusion, text_advice = ikieval.msg_space, ikieval.text_space
+        for name, line in (('love', ikieval.msg_try_love), ('good', ikieval.msg_try_good),
+                           ('world', ikieval.msg_try_world), ('money', ikieval.msg_try_money)):
+            if made[name]:
+                text_advice = ikieval.temp_advice.format(adv=text_advice, plus=line)
+        if not any(made.values()):
+            text_conclusion, text_advice = ikieval.msg_still_ok, ''
+        draw_iki = True
+
+    return outcome, tuple(ask.values()), text_conclusion, text_advice, draw_iki
+
+
+def test_decision_table_every_flag_combination():
+    """
+    Test that the decision table matches the four-circle cascade for every combination of flags.
+    """
+    table = ikieval.decision_table()
+    assert len(table) == 2 ** ikieval.KEY_BITS
+
+    for key in range(2 ** ikieval.KEY_BITS):
+        scores, make = ikieval._scores_from_key(key)
+        impossible = key >> ikieval.BIT_LWMG_MAX & 1 and key >> ikieval.BIT_LWMG_UNDER_MAX & 1
+        if not impossible:  # The average cannot be both at and under the maximum.
+            assert ikieval.decision_key(scores, make, 1) == key
+
+        decision = table[key]
+        expected = four_circle_decision(scores, make, 1)
+        assert (decision.outcome, decision.ask, decision.text_conclusion,
+                decision.text_advice, decision.draw_iki) == expected, key
+
+
+def test_key_bits_of_main_module():
+    """
+    Test that the generic key layout gives the keys of the main module for its four circles.
+    """
+    bits = ikieval.key_bits(ikieval.IKIGAI_MODEL)
+
+    assert bits.ok == ikieval.BIT_OK and bits.min == ikieval.BIT_MIN and bits.make == ikieval.BIT_MAKE
+    assert (bits.lwmg_max, bits.lwmg_under_max, bits.pmvp_under_max, bits.size) == \
+        (ikieval.BIT_LWMG_MAX, ikieval.BIT_LWMG_UNDER_MAX, ikieval.BIT_PMVP_UNDER_MAX, ikieval.KEY_BITS)
+
+
+@pytest.mark.parametrize('count', [5, 6])
+def test_decision_table_other_models(count):
+    """
+    Test the decision tables of models with five and six circles against the cascade.
+    """
+    model = ikieval.make_model([f'area{index}' for index in range(count)])
+    table = ikieval.decision_table(model)
+    bits = ikieval.key_bits(model)
+    assert len(table) == 2 ** (3 * count + 3) == 2 ** bits.size
+
+    rng = random.Random(count)
+    for key in [0, len(table) - 1, *(rng.randrange(len(table)) for _ in range(3000))]:
+        scores, make = ikieval._scores_from_key(key, model)
+        if not (key >> bits.lwmg_max & 1 and key >> bits.lwmg_under_max & 1):
+            assert ikieval.decision_key(scores, make, 1, model) == key
+
+        decision = table[key]
+        assert len(decision.ask) == len(decision.tries) == count
+        assert (decision.outcome, decision.ask, decision.text_conclusion,
+                decision.text_advice, decision.draw_iki) == reference_decision(scores, make, 1, model), key
+
+
+def test_decide_five_circles():
+    """
+    Test `decide` for real scores of a five-circle model: the rings under the limit lead to the
+    questions about their two circles.
+    """
+    model = ikieval.make_model(('love', 'world', 'money', 'good', 'health'))
+    scores = ikiscore.score_batch([(8, 2, 8, 8, 9)], model=model)
+    row_scores = {key: column[0] for key, column in scores.items()}
+
+    decision = ikieval.decide(row_scores, model=model)
+    # love-world (5) and world-money (5) are at the limit, so nothing is under it.
+    assert decision.outcome == ikieval.OUTCOME_IMPROVE
+    assert decision.ask == (True, True, True, False, False)
+
+    decision = ikieval.decide(row_scores, (False, True, False, False, False), model=model)
+    assert decision.text_advice == ikieval.temp_advice.format(adv=ikieval.text_space,
+                                                              plus='You can try to improve world.')
+    assert decision.tries == (False, True, False, False, False)
+
+
+def test_make_model():
+    """
+    Test the defaults and the checks of `make_model`.
+    """
+    model = ikieval.make_model(['a', 'b', 'c'])
+
+    assert model.ring_names == ('a-b', 'b-c', 'c-a')
+    assert model.value_order == model.ring_order == model.advice_order == model.random_order == (0, 1, 2)
+    assert model.questions[1] == 'How satisfied are you with b?'
+    assert ikieval.make_model(ikieval.IKIGAI_MODEL.names) != ikieval.IKIGAI_MODEL  # Other texts and orders.
+    assert ikieval.make_model(*ikieval.IKIGAI_MODEL) == ikieval.IKIGAI_MODEL
+
+    with pytest.raises(ValueError, match='at least two'):
+        ikieval.make_model(['a'])
+    with pytest.raises(ValueError, match='must be different'):
+        ikieval.make_model(['a', 'b', 'a'])
+    with pytest.raises(ValueError, match="'tries' must have 3 entries"):
+        ikieval.make_model(['a', 'b', 'c'], tries=['x', 'y'])
+    with pytest.raises(ValueError, match="'ring_order' must list the indices 0-2"):
+        ikieval.make_model(['a', 'b', 'c'], ring_order=(0, 0, 1))
+
+
+def test_decide_matches_cascade_for_scores():
+    """
+    Test `decide` against the cascade for real scores and every set of yes/no answers.
+    """
+    grid = (0, 2, 4, 4.5, 5, 5.5, 6, 8, 9.5, 10)
+    rows = list(itertools.product(grid, repeat=4))
+    scores = ikiscore.score_batch(rows)
+    columns = {key: column.tolist() for key, column in scores.items()}
+
+    for index in range(len(rows)):
+        row_scores = {key: column[index] for key, column in columns.items()}
+        for make in itertools.product((False, True), repeat=4):
+            decision = ikieval.decide(row_scores, make)
+            assert (decision.outcome, decision.ask, decision.text_conclusion,
+                    decision.text_advice, decision.draw_iki) == reference_decision(row_scores, make, 10)
+
+
+def test_decision_tries():
+    """
+    Test that `tries` lists the `msg_try_*` lines used in the advice.
+    """
+    for decision in ikieval.decision_table():
+        lines = (ikieval.msg_try_love, ikieval.msg_try_world, ikieval.msg_try_money, ikieval.msg_try_good)
+        assert decision.tries == tuple(line in decision.text_advice for line in lines)
+
+
+def test_decision_key_arrays():
+    """
+    Test that decision keys of a whole batch equal the keys of the single respondents.
+    """
+    rows = [(10, 10, 10, 10), (9, 7, 8, 6), (2, 3, 9, 9), (6, 4, 5, 6)]
+    make = np.array([(True, False, True, False)] * len(rows))
+    scores = ikiscore.score_batch(rows)
+
+    keys = ikieval.decision_key(scores, make.T)
+
+    for index in range(len(rows)):
+        row_scores = {key: column[index] for key, column in scores.items()}
+        assert keys[index] == ikieval.decision_key(row_scores, tuple(make[index]))
@@ -0,0 +1,151 @@
+"""Module for testing the group-by aggregation of the ikigroup module."""
+
+import csv
+import io
+import json
+import random
+import statistics
+
+import pytest
+
+from src import ikidef, ikieval, ikigroup, ikiprofile
+
+
+def make_rows(count, seed=24):
+    """Builds rows of answers with decimals that round when they are summed, in three teams."""
+    rng = random.Random(seed)
+    answer = lambda: rng.choice((str(rng.randint(0, 10)), f'{rng.uniform(0, 10):.1f}', '0,1', '0.2'))
+    return [{'team': rng.choice(('red', 'green', 'blue')), 'love': answer(), 'world': answer(),
+             'money': answer(), 'good': answer()} for _ in range(count)]
+
+
+def reference(rows, profile=ikiprofile.DEFAULT_PROFILE):
+    """Single-threaded reference: scores row by row and uses `statistics.mean` and `min` per team."""
+    evaluator = ikiprofile.compile_profile(profile)
+    teams = {}
+    for row in rows:
+        values = [ikidef.is_it_number(row[name], None) for name in ('love', 'world', 'money', 'good')]
+        scores = evaluator.scores(*values)
+        teams.setdefault(row['team'], []).append((scores, evaluator.decide(scores).outcome))
+
+    results = {}
+    for team, assessments in teams.items():
+        results[team] = {
+            'count': len(assessments),
+            'mean': {dimension: statistics.mean(scores[name] for scores, _ in assessments)
+                     for dimension, name in zip(ikigroup.DIMENSIONS, ikigroup.SCORE_NAMES)},
+            'min': {dimension: min(scores[name] for scores, _ in assessments)
+                    for dimension, name in zip(ikigroup.DIMENSIONS, ikigroup.SCORE_NAMES)},
+            'outcomes': {outcome: sum(found == outcome for _, found in assessments) for outcome in ikigroup.OUTCOMES},
+        }
+    return results
+
+
+def summary(groups):
+    """The aggregates of `aggregate` in the form of `reference`."""
+    return {team: {key: value for key, value in stats.to_dict().items() if key != 'invalid'}
+            for team, stats in groups.items()}
+
+
+@pytest.mark.parametrize('workers, chunk_size', [(1, 4096), (1, 37), (2, 101)])
+def test_aggregate_matches_reference(workers, chunk_size):
+    """
+    Test that the aggregates equal the single-threaded reference exactly, for any chunking and workers.
+    """
+    rows = make_rows(1500)
+
+    groups = ikigroup.aggregate(rows, 'team', workers=workers, chunk_size=chunk_size)
+
+    assert summary(groups) == reference(rows)
+    assert list(groups) == list(reference(rows))  # Teams in the order they first appear.
+
+
+def test_weighted_profile_and_invalid_rows():
+    """
+    Test the aggregates with a weighted profile and that invalid rows are only counted.
+    """
+    profile = ikiprofile.profile_from_dict({'weights': {'love': 3, 'world': 1, 'money': 1, 'good': 1},
+                                            'rings': {'passion': {'love': 1, 'good': 2}}})
+    rows = make_rows(500, seed=25)
+    invalid = [{'team': 'red', 'love': 'x', 'world': '1', 'money': '1', 'good': '1'},
+               {'team': 'gold', 'love': '11', 'world': '1', 'money': '1', 'good': '1'}]
+
+    groups = ikigroup.aggregate(rows + invalid, 'team', profile=profile, workers=1, chunk_size=64)
+
+    assert summary({team: groups[team] for team in ('red', 'green', 'blue')}) == reference(rows, profile)
+    assert groups['red'].invalid == 1
+    assert groups['gold'].to_dict()['count'] == 0 and groups['gold'].to_dict()['mean']['love'] is None
+
+
+@pytest.mark.parametrize('file_format', ['csv', 'jsonl'])
+def test_aggregate_file(tmp_path, file_format):
+    """
+    Test that reading a file in blocks gives the aggregates of all its rows.
+    """
+    rows = make_rows(800, seed=26)
+    path = tmp_path / f'answers.{file_format}'
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        if file_format == 'csv':
+            writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            file.writelines(json.dumps(row) + '\n' for row in rows)
+
+    groups = ikigroup.aggregate_file(str(path), 'team', workers=1, block_size=997)
+
+    assert groups == ikigroup.aggregate(rows, 'team', workers=1)
+
+
+def test_write_groups():
+    """
+    Test the CSV and JSONL output of the aggregates.
+    """
+    rows = [{'team': 'red', 'love': '10', 'world': '10', 'money': '10', 'good': '10'},
+            {'team': 'red', 'love': '2', 'world': '10', 'money': '10', 'good': '10'}]
+    groups = ikigroup.aggregate(rows, 'team', workers=1)
+
+    output = io.StringIO()
+    assert ikigroup.write_groups(groups, output, 'csv', 'team') == 1
+    [record] = csv.DictReader(io.StringIO(output.getvalue()))
+    assert record['team'] == 'red' and record['mean_love'] == '6.0' and record['min_love'] == '2.0'
+    assert record['outcome_max'] == '1'
+
+    output = io.StringIO()
+    ikigroup.write_groups(groups, output, 'jsonl', 'team')
+    assert json.loads(output.getvalue())['mean']['passion'] == 8.0
+
+
+def test_dimensions_of_main_module():
+    """
+    Test that the aggregated dimensions of the main module's model keep the output columns.
+    """
+    assert ikigroup.DIMENSIONS == ('love', 'world', 'money', 'good', 'passion', 'mission', 'vocation',
+                                   'profession', 'score_LWMG_avr')
+    assert ikigroup.SCORE_NAMES[4] == 'value_passion' and ikigroup.SCORE_NAMES[-1] == 'score_LWMG_avr'
+
+
+def test_aggregate_five_circles():
+    """
+    Test the aggregates of a five-circle model in worker processes against its evaluator, row by row.
+    """
+    model = ikieval.make_model(('love', 'world', 'money', 'good', 'family'))
+    rng = random.Random(27)
+    rows = [{'team': rng.choice(('red', 'blue')), **{name: str(rng.randint(0, 10)) for name in model.names}}
+            for _ in range(300)]
+
+    groups = ikigroup.aggregate(rows, 'team', workers=2, chunk_size=70, model=model)
+
+    evaluator = ikiprofile.compile_model(model)
+    for team in ('red', 'blue'):
+        scores = [evaluator.scores(*(float(row[name]) for name in model.names)) for row in rows if row['team'] == team]
+        stats = groups[team]
+        assert stats.dimensions == ikigroup.group_dimensions(model)
+        assert stats.mean('family-love') == statistics.mean(score['value_family-love'] for score in scores)
+        assert stats.minimum('good') == min(score['value_good'] for score in scores)
+        assert stats.outcomes == {outcome: sum(evaluator.decide(score).outcome == outcome for score in scores)
+                                  for outcome in ikigroup.OUTCOMES}
+
+    output = io.StringIO()
+    ikigroup.write_groups(groups, output, 'csv', 'team')
+    assert output.getvalue().splitlines()[0].split(',') == list(ikigroup.group_fields('team', stats.dimensions))
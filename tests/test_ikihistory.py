@@ -0,0 +1,99 @@
+"""Module for testing the per-person history of the ikihistory module."""
+
+import pytest
+
+import IKIGAI_PRO_WORK
+from src import ikidef, ikihistory, ikiprofile, ikistore
+
+
+@pytest.fixture
+def store():
+    """An empty history in memory."""
+    with ikihistory.HistoryStore(':memory:') as history:
+        yield history
+
+
+def test_deltas_since_previous_result(store):
+    """
+    Test that every new assessment is compared with the previous one of the same person.
+    """
+    first = store.add('Jane Doe', '01.02.2026', 4, 6, 3, 8)
+    store.add('John Roe', '02.02.2026', 9, 9, 9, 9)
+    second = store.add('  JANE   doe ', '15.03.2026', 6, 6, 5, 8)
+
+    assert first.previous is None and first.deltas is None
+    assert second.previous == first.entry
+    assert second.deltas['love'] == 2 and second.deltas['money'] == 2 and second.deltas['world'] == 0
+    assert second.deltas['passion'] == 1  # (8 + 6) / 2 - (8 + 4) / 2
+    assert second.deltas['vocation'] == 1
+    assert second.entry.day == ikistore.date_to_days('15.03.2026')
+
+
+def test_history_order(store):
+    """
+    Test that a history is sorted by date, also when results are added out of order or on the same day.
+    """
+    store.add('Jane Doe', '10.05.2026', 5, 5, 5, 5)
+    store.add('Jane Doe', '09.01.2025', 1, 1, 1, 1)
+    backfill = store.add('Jane Doe', '01.03.2026', 3, 3, 3, 3)
+    store.add('Jane Doe', '10.05.2026', 7, 7, 7, 7)
+
+    history = store.history('jane doe')
+
+    assert [entry.love for entry in history] == [1, 3, 5, 7]
+    assert [entry.sequence for entry in history] == [0, 0, 0, 1]
+    assert backfill.previous.love == 1
+    assert [changes['good'] for changes in store.changes('Jane Doe')] == [2, 2, 2]
+    assert ikihistory.entry_date(history[-1]) == '10.05.2026'
+    assert len(store) == 4 and store.history('Nobody') == []
+
+
+def test_history_uses_the_index(store):
+    """
+    Test that loading a history is a lookup of the primary key, not a scan of the table.
+    """
+    plan = store._connection.execute(
+        'EXPLAIN QUERY PLAN SELECT * FROM assessments WHERE identity = ? ORDER BY day, sequence', ('x',)).fetchall()
+    details = ' '.join(row[-1] for row in plan)
+
+    assert 'SEARCH' in details and 'PRIMARY KEY' in details
+    assert 'TEMP B-TREE' not in details  # No sorting either.
+
+
+def test_normalize_identity():
+    """
+    Test that case, whitespace and Unicode compatibility forms do not change the identity.
+    """
+    assert ikihistory.normalize_identity(' ＪＡＮＥ\tDoe ') == 'jane doe'
+    assert ikihistory.normalize_identity('Straße') == ikihistory.normalize_identity('STRASSE')
+    with pytest.raises(ValueError):
+        ikihistory.normalize_identity('   ')
+
+
+def test_profile_and_format(store):
+    """
+    Test that entries keep the PMVP values and name of their profile, and the progress message.
+    """
+    profile = ikiprofile.profile_from_dict({'name': 'acme', 'rings': {'passion': {'love': 3, 'good': 1}}})
+
+    store.add('Jane Doe', 20000, 4, 4, 4, 8, profile)
+    change = store.add('Jane Doe', 20001, 8, 4, 4, 8, profile)
+
+    assert change.entry.profile == 'acme' and change.entry.passion == 8
+    assert change.deltas['passion'] == 3  # (3 * 8 + 8) / 4 - (3 * 4 + 8) / 4
+    assert ikihistory.format_change(change).startswith(f'Changes since {ikistore.days_to_date(20000)}: Love +4,')
+    assert 'first result' in ikihistory.format_change(store.add('John Roe', 20000, 1, 1, 1, 1))
+
+
+def test_main_keeps_history(monkeypatch, tmp_path, capsys):
+    """
+    Test that `main --history` stores every session and shows the changes since the last one.
+    """
+    path = tmp_path / 'history.sqlite'
+    for love in ('4', '6'):
+        monkeypatch.setattr('builtins.input', ikidef.answers_from(['Jane Doe', love, '6', '6', '6'] + ['no'] * 4))
+        IKIGAI_PRO_WORK.main(['--no-draw', '--history', str(path)])
+
+    assert 'Love +2' in capsys.readouterr().out
+    with ikihistory.HistoryStore(str(path)) as store:
+        assert [entry.love for entry in store.history('Jane Doe')] == [4, 6]
@@ -0,0 +1,143 @@
+"""Module for testing the timing instrumentation."""
+
+import json
+import urllib.request
+
+import pytest
+
+import IKIGAI_PRO_WORK
+from src import ikidef, ikimetrics
+
+
+@pytest.fixture
+def metrics():
+    """Records metrics during a test, starting from none."""
+    ikimetrics.reset()
+    ikimetrics.enable()
+    yield ikimetrics
+    ikimetrics.disable()
+    ikimetrics.reset()
+
+
+def test_disabled_records_nothing():
+    """
+    Test that nothing is recorded while the instrumentation is disabled.
+    """
+    ikimetrics.reset()
+    ikimetrics.disable()
+
+    ikidef.get_sum_avg_min([1, 2, 3])
+    ikimetrics.record('advice', ikimetrics.clock())
+
+    assert ikimetrics.snapshot() == {}
+
+
+def test_histogram(metrics):
+    """
+    Test the counts, sums and cumulative buckets of the recorded stages.
+    """
+    metrics.observe('scoring', 0.000005)
+    metrics.observe('scoring', 0.05)
+    metrics.observe('scoring', 100.0)
+
+    scoring = metrics.snapshot()['scoring']
+
+    assert scoring['count'] == 3
+    assert scoring['sum'] == pytest.approx(100.050005)
+    assert scoring['buckets']['1e-05'] == 1
+    assert scoring['buckets']['0.01'] == 1
+    assert scoring['buckets']['0.1'] == 2
+    assert scoring['buckets']['10.0'] == 2
+    assert scoring['buckets']['+Inf'] == 3
+
+
+def test_stages_of_a_session(metrics):
+    """
+    Test that a questionnaire records the validation, scoring, evaluation and advice stages.
+    """
+    source = ikidef.answers_from(['Jane Doe', 'x', '7', '3', '6', '4', 'yes', 'no', 'yes', 'no'])
+    IKIGAI_PRO_WORK.questionnaire(source, lambda *args, **kwargs: None, draw=False)
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot['validation']['count'] == 8  # The name, five numbers ('x' included) and two yes/no.
+    assert snapshot['scoring']['count'] == 1
+    assert snapshot['advice']['count'] == 1
+    assert snapshot['evaluation']['count'] == 1
+
+
+def test_timed_records_failures(metrics):
+    """
+    Test that a decorated function is recorded also when it raises.
+    """
+    with pytest.raises(ValueError):
+        ikidef.get_sum_avg_min([])
+
+    assert metrics.snapshot()['scoring']['count'] == 1
+
+
+def test_prometheus_text(metrics):
+    """
+    Test the Prometheus text format of the metrics.
+    """
+    metrics.observe('drawing', 0.5)
+
+    lines = metrics.prometheus_text().splitlines()
+
+    assert lines[0].startswith('# HELP ikigai_stage_seconds ')
+    assert lines[1] == '# TYPE ikigai_stage_seconds histogram'
+    assert 'ikigai_stage_seconds_bucket{stage="drawing",le="0.1"} 0' in lines
+    assert 'ikigai_stage_seconds_bucket{stage="drawing",le="1.0"} 1' in lines
+    assert 'ikigai_stage_seconds_bucket{stage="drawing",le="+Inf"} 1' in lines
+    assert 'ikigai_stage_seconds_sum{stage="drawing"} 0.5' in lines
+    assert 'ikigai_stage_seconds_count{stage="drawing"} 1' in lines
+
+
+def test_dump(metrics, tmp_path):
+    """
+    Test writing the metrics to files in both formats.
+    """
+    metrics.observe('advice', 0.001)
+
+    metrics.dump(str(tmp_path / 'metrics.json'))
+    metrics.dump(str(tmp_path / 'metrics.prom'))
+
+    assert json.loads((tmp_path / 'metrics.json').read_text()) == metrics.snapshot()
+    assert (tmp_path / 'metrics.prom').read_text() == metrics.prometheus_text()
+    with pytest.raises(ValueError):
+        metrics.dump(str(tmp_path / 'metrics.txt'), 'xml')
+
+
+def test_serve(metrics):
+    """
+    Test the HTTP endpoint of the metrics.
+    """
+    metrics.observe('evaluation', 0.00002)
+    server = metrics.serve(port=0)
+    url = f'http://127.0.0.1:{server.server_address[1]}'
+
+    try:
+        with urllib.request.urlopen(url + '/metrics') as response:
+            assert response.read().decode() == metrics.prometheus_text()
+        with urllib.request.urlopen(url + '/metrics.json') as response:
+            assert json.loads(response.read()) == metrics.snapshot()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_main_writes_metrics(monkeypatch, tmp_path):
+    """
+    Test that `main --metrics` records a session and writes the metrics.
+    """
+    monkeypatch.setattr('builtins.input', ikidef.answers_from(['Jane Doe', '10', '10', '10', '10', 'no']))
+    monkeypatch.setattr('builtins.print', lambda *args, **kwargs: None)
+    path = tmp_path / 'metrics.json'
+
+    try:
+        IKIGAI_PRO_WORK.main(['--no-draw', '--metrics', str(path)])
+    finally:
+        ikimetrics.disable()
+        ikimetrics.reset()
+
+    assert set(json.loads(path.read_text())) == {'validation', 'scoring', 'evaluation', 'advice'}
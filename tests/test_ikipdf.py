@@ -0,0 +1,99 @@
+"""Module for testing the PDF reports of the ikipdf module."""
+
+import os
+import re
+import zlib
+
+import pytest
+
+from src import drawdef, ikipdf
+
+
+def make_records(count):
+    """Builds example records with the arguments of `ikigai_draw`."""
+    return [dict(value_love=float(index % 11), value_good=5.0, value_money=7.0, value_world=3.0,
+                 value_max=10, value_minTrue=5, text_conclusion='You have critical gaps (in some areas).',
+                 text_advice='   You really need to focus on improving:\n   - You can try to negotiate for more money.',
+                 your_name=f'Person {index}', test_date='18.10.2026')
+            for index in range(count)]
+
+
+def read_objects(data):
+    """Checks the cross-reference table of a PDF and returns its objects by number."""
+    startxref = int(data[data.rindex(b'startxref') + 9:].split()[0])
+    lines = data[startxref:].split(b'\n')
+    assert lines[0] == b'xref'
+    count = int(lines[1].split()[1])
+
+    objects = {}
+    for number in range(1, count):
+        offset = int(lines[2 + number][:10])
+        assert data[offset:].startswith(f'{number} 0 obj\n'.encode())
+        objects[number] = data[offset:data.index(b'endobj', offset)]
+    return objects
+
+
+def stream(obj):
+    """Decompressed stream of an object."""
+    content = obj[obj.index(b'stream\n') + 7:obj.rindex(b'\nendstream')]
+    return zlib.decompress(content) if b'/FlateDecode' in obj else content
+
+
+def test_ikigai_pdf(tmp_path):
+    """
+    Test that every report is a page that uses the shared resources and holds its own texts.
+    """
+    path = tmp_path / 'reports.pdf'
+    records = make_records(3)
+
+    assert ikipdf.ikigai_pdf(iter(records), str(path)) == 3
+
+    data = path.read_bytes()
+    assert data.startswith(b'%PDF-1.4') and data.endswith(b'%%EOF\n')
+    objects = read_objects(data)
+
+    assert b'/Count 3' in objects[ikipdf.PAGES]
+    pages = [objects[number] for number in (8, 10, 12)]
+    assert all(b'/Type /Page ' in page and b'/Resources 6 0 R' in page for page in pages)
+    assert sum(b'/Subtype /Form' in obj for obj in objects.values()) == 1
+    assert sum(b'/BaseFont' in obj for obj in objects.values()) == 2
+
+    artwork = stream(objects[ikipdf.ARTWORK])
+    assert artwork.count(b' f\n') == 4 and b'(PASSION) Tj' in artwork
+
+    content = stream(objects[9])
+    assert b'/Artwork Do' in content
+    assert b'(Person 1) Tj' in content and b'(18.10.2026) Tj' in content
+    assert b'(1.0) Tj' in content  # The value of love.
+    assert b'(PASSION)' not in content  # Only in the shared artwork.
+    assert b'(Conclusion:) Tj' in content
+    assert b'(- You have critical gaps \\(in some areas\\).) Tj' in content  # Wrapped by max_line_length.
+
+
+def test_text_layout():
+    """
+    Test that lines are centered on the anchor and multi-line texts grow upwards.
+    """
+    text = drawdef.Text(100, 50, 'AB\ni', 'black', 18, 'normal')
+    operators = ikipdf.text_operators([text]).decode()
+    positions = [tuple(map(float, match)) for match in re.findall(r'1 0 0 1 (\S+) (\S+) Tm', operators)]
+
+    size = 18 * 4 / 3
+    assert positions[0][0] == pytest.approx(100 - ikipdf.text_width('AB', size) / 2, abs=0.01)
+    assert positions[1][0] == pytest.approx(100 - 222 * size / 1000 / 2, abs=0.01)
+    assert positions[0][1] > positions[1][1] > 50
+    assert ikipdf.text_width('ABC', 10, 'bold') == pytest.approx(21.66)
+
+
+def test_streaming(tmp_path):
+    """
+    Test that pages reach the file while the document is written and that pages stay small.
+    """
+    path = tmp_path / 'reports.pdf'
+    with ikipdf.PdfWriter(str(path)) as pdf:
+        for record in make_records(200):
+            pdf.add_report(**record)
+        assert os.path.getsize(path) > 100_000  # Written before closing.
+
+    assert os.path.getsize(path) / 200 < 1500
+    assert len(read_objects(path.read_bytes())) == 6 + 2 * 200
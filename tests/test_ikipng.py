@@ -0,0 +1,83 @@
+"""Module for testing the PNG rendering of the ikipng module."""
+
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from src import drawdef, ikipng
+
+
+def read_png(png):
+    """Decodes a PNG written by `ikipng` into an (height, width, 3) array, checking every chunk."""
+    assert png[:8] == ikipng.PNG_SIGNATURE
+    position, chunks = 8, {}
+    while position < len(png):
+        length, = struct.unpack('>I', png[position:position + 4])
+        kind = png[position + 4:position + 8]
+        data = png[position + 8:position + 8 + length]
+        crc, = struct.unpack('>I', png[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(kind + data)
+        chunks[kind] = data
+        position += 12 + length
+
+    width, height, depth, color_type, _, _, _ = struct.unpack('>IIBBBBB', chunks[b'IHDR'])
+    assert (depth, color_type) == (8, 2)
+    rows = np.frombuffer(zlib.decompress(chunks[b'IDAT']), dtype=np.uint8).reshape(height, 1 + 3 * width)
+    assert not rows[:, 0].any()  # No filters.
+    return rows[:, 1:].reshape(height, width, 3)
+
+
+def pixel(image, x, y):
+    """Color of the pixel at turtle coordinates (x, y)."""
+    size = image.shape[0]
+    scale = size / ikipng.EXTENT
+    return tuple(image[int(size / 2 - y * scale), int(size / 2 + x * scale)])
+
+
+def test_ikigai_png(tmp_path):
+    """
+    Test that the circles and the value markers are drawn in their colors.
+    """
+    path = tmp_path / 'ikigai.png'
+    image = read_png(ikipng.ikigai_png(7, 4, 10, 3, 10, 5, path=str(path)))
+
+    assert image.shape == (ikipng.SIZE, ikipng.SIZE, 3)
+    assert path.read_bytes()[:8] == ikipng.PNG_SIGNATURE
+
+    layout = drawdef.ikigai_layout(7, 4, 10, 3, 10, 5, '', '', '', '')
+    markers = {text.text: text for text in layout['texts'] if text.size == 18}
+    for value, color in (('7', 'dark goldenrod'), ('4', 'red'), ('10', 'green'), ('3', 'red')):
+        marker = markers[value]
+        assert pixel(image, marker.x, marker.y + ikipng.MARKER_RADIUS) == drawdef.COLORS[color]
+
+    for x, y in layout['circles']:
+        assert pixel(image, x, y) == drawdef.rgb(drawdef.CIRCLE_FILL)
+    assert pixel(image, 440, 440) == drawdef.COLORS['white']
+
+
+def test_reused_canvas():
+    """
+    Test that a reused canvas gives the same image as a new one.
+    """
+    canvas = ikipng.Canvas(200, 200, 200 / ikipng.EXTENT)
+    ikipng.ikigai_png(10, 10, 10, 10, 10, 5, canvas=canvas)
+
+    assert ikipng.ikigai_png(2, 4, 6, 8, 10, 5, canvas=canvas) == ikipng.ikigai_png(2, 4, 6, 8, 10, 5, size=200)
+
+
+def test_render_time():
+    """
+    Test that an 800x800 image takes well under 50 ms.
+    """
+    canvas = ikipng.Canvas(800, 800, 800 / ikipng.EXTENT)
+    ikipng.ikigai_png(7, 4, 10, 3, 10, 5, canvas=canvas)  # Draws the shared circles once.
+
+    times = []
+    for value in range(5):
+        start = time.perf_counter()
+        ikipng.ikigai_png(value, 4, 10, 3, 10, 5, canvas=canvas)
+        times.append(time.perf_counter() - start)
+
+    assert min(times) < 0.05
@@ -0,0 +1,180 @@
+"""Module for testing the scoring profiles of the ikiprofile module."""
+
+import io
+import json
+import random
+
+import pytest
+
+import IKIGAI_PRO_WORK
+from src import drawdef, ikibatch, ikidef, ikieval, ikiprofile, ikirecord, ikisvg
+
+WEIGHTED = {
+    'name': 'acme',
+    'value_minTrue': 6,
+    'weights': {'love': 2, 'world': 1, 'money': 1, 'good': 1},
+    'rings': {'profession': {'good': 2, 'money': 1}},
+    'thresholds': {'money': 4},
+}
+
+
+def test_default_profile_matches_main_module():
+    """
+    Test that the default evaluator gives exactly the scores of the main module and of the batch scoring.
+    """
+    evaluator = ikiprofile.compile_profile(ikiprofile.DEFAULT_PROFILE)
+    rng = random.Random(23)
+    answers = [[rng.choice((0.1, 0.2, 0.3, 7.0, 10.0, rng.uniform(0, 10))) for _ in range(4)] for _ in range(200)]
+
+    batch = evaluator.score_batch(answers)
+    for row, values in enumerate(answers):
+        scores = evaluator.scores(*values)
+        assert scores == ikirecord.Assessment(*values).scores()
+        for key, value in scores.items():
+            assert batch[key][row] == value, key
+
+    assert type(evaluator) is ikiprofile.Evaluator
+    assert ikiprofile.compile_profile(ikiprofile.profile_from_dict({}, name='default')) is evaluator
+
+
+def test_weighted_profile():
+    """
+    Test the weighted averages and the thresholds of a profile, one by one and in a batch.
+    """
+    profile = ikiprofile.profile_from_dict(WEIGHTED)
+    evaluator = ikiprofile.compile_profile(profile)
+
+    scores = evaluator.scores(8.0, 4.0, 5.0, 2.0)
+
+    assert isinstance(evaluator, ikiprofile.WeightedEvaluator)
+    assert scores['score_LWMG_avr'] == (16 + 4 + 5 + 2) / 5
+    assert scores['value_profession'] == (5 + 4) / 3
+    assert scores['value_passion'] == 5  # Pairs without weights keep the mean.
+    assert scores['ok_love'] and scores['ok_money'] and not scores['ok_world']  # Money has its own threshold.
+    assert not scores['ok_passion']  # 5 is under the profile threshold of 6.
+
+    rng = random.Random(24)
+    answers = [[rng.uniform(0, 10) for _ in range(4)] for _ in range(100)]
+    batch = evaluator.score_batch(answers)
+    for row, values in enumerate(answers):
+        for key, value in evaluator.scores(*values).items():
+            assert batch[key][row] == value, key
+
+
+@pytest.mark.parametrize('data, message', [
+    ({'colour': 'red'}, 'Unknown profile key'),
+    ({'value_min': 10, 'value_max': 0}, 'less than'),
+    ({'value_minTrue': 11}, 'out of the range'),
+    ({'weights': {'love': -1}}, 'non-negative'),
+    ({'weights': {'love': 0, 'world': 0, 'money': 0, 'good': 0}}, 'all be zero'),
+    ({'rings': {'ambition': {'love': 1}}}, "'rings'"),
+    ({'rings': {'passion': {'fun': 1}}}, 'Unknown answer'),
+    ({'thresholds': {'money': 'high'}}, 'must be a number'),
+])
+def test_invalid_profiles(data, message):
+    """
+    Test that invalid profiles are rejected when they are loaded.
+    """
+    with pytest.raises(ValueError, match=message):
+        ikiprofile.profile_from_dict(data)
+
+
+def test_load_profile(tmp_path):
+    """
+    Test loading a profile file, named after the file if it has no name.
+    """
+    path = tmp_path / 'nurses.json'
+    path.write_text(json.dumps({'value_minTrue': 7}), encoding='utf-8')
+    broken = tmp_path / 'broken.json'
+    broken.write_text('{', encoding='utf-8')
+
+    profile = ikiprofile.load_profile(str(path))
+
+    assert profile.name == 'nurses' and profile.value_minTrue == 7
+    assert profile.thresholds == (7,) * 8
+    with pytest.raises(ValueError, match='not valid JSON'):
+        ikiprofile.load_profile(str(broken))
+
+
+def test_profile_in_results():
+    """
+    Test that the questionnaire and the batch results name the profile and use its thresholds.
+    """
+    profile = ikiprofile.profile_from_dict(WEIGHTED)
+    answers = ['Jane Doe', '7', '5', '5', '5', 'no', 'no', 'no', 'no']
+
+    result = IKIGAI_PRO_WORK.questionnaire(ikidef.answers_from(answers), lambda *args, **kwargs: None,
+                                           draw=False, profile=profile)
+    default = IKIGAI_PRO_WORK.questionnaire(ikidef.answers_from(answers), lambda *args, **kwargs: None,
+                                            draw=False)
+
+    assert result['profile'] == 'acme' and default['profile'] == 'default'
+    assert result['text_conclusion'] != default['text_conclusion']  # 5 passes only the default threshold.
+
+    rows = [{'love': '7', 'world': '5', 'money': '5', 'good': '5'}, {'love': 'x'}]
+    output = io.StringIO()
+    ikibatch.write_batches(ikibatch.evaluate_batches(rows, profile=profile), output, 'jsonl')
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert [record['profile'] for record in records] == ['acme', 'acme']
+    assert records[0]['score_LWMG_avr'] == (14 + 5 + 5 + 5) / 5
+    assert records[0]['conclusion'] == result['text_conclusion']
+
+
+def test_layout_with_profile():
+    """
+    Test that the drawing shows the weighted values of a profile.
+    """
+    profile = ikiprofile.profile_from_dict(WEIGHTED)
+    layout = drawdef.ikigai_layout(8, 2, 5, 4, 10, 6, '', '', '', '', profile=profile)
+    values = [text.text for text in layout['texts'] if text.size == 18]
+
+    assert values[4] == '5.4'  # The final score: (2 * 8 + 4 + 5 + 2) / 5.
+    assert '3.0' in values  # Profession: (2 * 2 + 5) / 3.
+
+
+def test_layout_colors_by_profile_thresholds():
+    """
+    Test that the colors of the drawing follow the thresholds of the profile, like the verdict.
+    """
+    profile = ikiprofile.profile_from_dict({'name': 'strict', 'thresholds': {'money': 3, 'passion': 9}})
+    scores = ikiprofile.compile_profile(profile).scores(5, 5, 4, 8)
+
+    layout = drawdef.ikigai_layout(5, 8, 4, 5, 10, 5, '', '', '', '', profile=profile)
+    default = drawdef.ikigai_layout(5, 8, 4, 5, 10, 5, '', '', '', '')
+    colors = {text.text: text.color for text in layout['texts'] if text.size == 18}
+
+    assert scores['ok_money'] and colors['4'] == 'dark goldenrod'
+    assert not scores['ok_passion'] and colors['6.5'] == 'red'
+    assert {text.text: text.color for text in default['texts'] if text.size == 18}['4'] == 'red'
+    assert 'Profile: strict' in [text.text for text in layout['texts']]
+    assert 'Profile: strict' in ikisvg.ikigai_svg(5, 8, 4, 5, 10, 5, '', '', '', '', profile=profile)
+
+
+def test_model_evaluator():
+    """
+    Test that the evaluator of a six-circle model scores one respondent like the batch scoring and
+    takes only the limits of a profile.
+    """
+    model = ikieval.make_model(('love', 'world', 'money', 'good', 'health', 'family'))
+    profile = ikiprofile.profile_from_dict({'name': 'strict', 'value_minTrue': 6})
+    evaluator = ikiprofile.compile_model(model, profile)
+
+    rng = random.Random(6)
+    answers = [[rng.choice((0.1, 0.2, 0.3, 6.0, 10.0, rng.uniform(0, 10))) for _ in range(6)] for _ in range(200)]
+    batch = evaluator.score_batch(answers)
+    for row, values in enumerate(answers):
+        scores = evaluator.scores(*values)
+        assert scores['value_family-love'] == ikidef.consecutive_and_circular_averages(values)[5]
+        for key, value in scores.items():
+            assert batch[key][row] == value, key
+
+    assert isinstance(evaluator, ikiprofile.ModelEvaluator)
+    assert set(evaluator.thresholds.values()) == {6}
+    assert evaluator.decide(evaluator.scores(*[10] * 6)).outcome == ikieval.OUTCOME_MAX
+    assert ikiprofile.compile_model(ikieval.IKIGAI_MODEL, profile) is ikiprofile.compile_profile(profile)
+
+    with pytest.raises(ValueError, match="sets weights or thresholds"):
+        ikiprofile.compile_model(model, ikiprofile.profile_from_dict(WEIGHTED))
+    with pytest.raises(ValueError, match="sets weights or thresholds"):
+        ikiprofile.compile_model(model, ikiprofile.profile_from_dict({'thresholds': {'love': 4}}))
@@ -0,0 +1,62 @@
+"""Module for testing the assessment records in the ikirecord module."""
+
+import pickle
+import random
+
+from src import ikieval, ikirecord
+from src.ikirecord import Assessment
+
+
+def test_evaluate_matches_decision():
+    """
+    Test that an evaluated assessment records the scores, flags and texts of `ikieval.decide`.
+    """
+    rng = random.Random(5)
+
+    for _ in range(500):
+        values = [rng.randint(0, 10) for _ in range(4)]
+        make = tuple(rng.random() < 0.5 for _ in range(4))
+        assessment = Assessment.evaluate(*values, make=make)
+
+        scores = assessment.scores()
+        decision = ikieval.decide(scores, make)
+        assert assessment.values == tuple(map(float, values))
+        assert assessment.ok_passion == scores['ok_passion'] and assessment.ok_money == scores['ok_money']
+        assert (assessment.ask_love, assessment.ask_world, assessment.ask_money, assessment.ask_good) == decision.ask
+        assert (assessment.try_love, assessment.try_world, assessment.try_money, assessment.try_good) == decision.tries
+        assert assessment.make_money == (make[2] and decision.ask[2])
+        assert assessment.draw_iki == decision.draw_iki
+        assert assessment.outcome == decision.outcome
+        assert (assessment.text_conclusion, assessment.text_advice) == (decision.text_conclusion, decision.text_advice)
+
+
+def test_serialization_round_trip():
+    """
+    Test that tuples, dicts and pickles rebuild an equal assessment.
+    """
+    assessment = Assessment.evaluate(8, 7, 4, 6, make=(True, True, True, True), name='Jane', date='18.10.2026')
+
+    assert Assessment.from_tuple(assessment.to_tuple()) == assessment
+    assert Assessment.from_dict(assessment.to_dict()) == assessment
+    assert pickle.loads(pickle.dumps(assessment)) == assessment
+    assert assessment.to_dict()['try_money'] is True
+    assert ikirecord.pack_flags(ok_love=True, draw_iki=False) == 1
+
+
+def test_slots():
+    """
+    Test that assessments have no per-instance dictionary.
+    """
+    assessment = Assessment(1, 2, 3, 4)
+
+    assert not hasattr(assessment, '__dict__')
+    assert assessment.flags == 0 and assessment.text_conclusion == '-'
+
+
+def test_memory_against_dicts():
+    """
+    Test that assessments take a small fraction of the memory of the same data in dictionaries.
+    """
+    result = ikirecord.memory_comparison(20000)
+
+    assert result['ratio'] < 0.25
@@ -0,0 +1,167 @@
+"""Module for testing the batch scoring in the ikiscore module."""
+
+import random
+from statistics import mean
+
+import numpy as np
+import pytest
+
+from src import ikidef, ikieval, ikiscore
+
+
+def reference_scores(love, world, money, good, value_minTrue):
+    """Scores one respondent the same way as the main module."""
+    LWMG = (love, world, good, money)
+    score_LWMG_sum, score_LWMG_avr, score_LWMG_min = ikidef.get_sum_avg_min(LWMG)
+
+    PMVP = (mean((good, love)), mean((world, love)), mean((world, money)), mean((good, money)))
+    score_PWMP_sum, score_PWMP_avr, score_PWMP_min = ikidef.get_sum_avg_min(PMVP)
+
+    scores = {
+        'score_LWMG_sum': score_LWMG_sum,
+        'score_LWMG_avr': score_LWMG_avr,
+        'score_LWMG_min': score_LWMG_min,
+        'score_PWMP_sum': score_PWMP_sum,
+        'score_PWMP_avr': score_PWMP_avr,
+        'score_PWMP_min': score_PWMP_min,
+    }
+    for name, value in zip(('love', 'world', 'money', 'good'), (love, world, money, good)):
+        scores[f'value_{name}'] = value
+        scores[f'ok_{name}'] = ikidef.true_or_not(value, value_minTrue)
+    for name, value in zip(('passion', 'mission', 'vocation', 'profession'), PMVP):
+        scores[f'value_{name}'] = value
+        scores[f'ok_{name}'] = ikidef.true_or_not(value, value_minTrue)
+    return scores
+
+
+def test_score_batch_matches_reference():
+    """
+    Test that every metric matches the one-respondent-at-a-time reference exactly,
+    for whole numbers as well as decimals that cause rounding errors.
+    """
+    rng = random.Random(42)
+    rows = [[rng.randint(0, 10) for _ in range(4)] for _ in range(200)]
+    rows += [[round(rng.uniform(0, 10), rng.randint(1, 3)) for _ in range(4)] for _ in range(300)]
+    rows += [[0.1, 0.2, 0.3, 0.7], [10, 10, 10, 10], [0, 0, 0, 0], [5, 4.9, 5.1, 5]]
+
+    scores = ikiscore.score_batch(rows, 5)
+
+    for index, row in enumerate(rows):
+        expected = reference_scores(*row, 5)
+        for key, value in expected.items():
+            assert scores[key][index] == value, (key, row)
+
+
+def test_score_batch_flags_are_boolean_arrays():
+    """
+    Test that the threshold flags are boolean arrays and respect the threshold.
+    """
+    scores = ikiscore.score_batch(np.array([[5, 4, 10, 0]]), value_minTrue=5)
+
+    assert scores['ok_love'].dtype == bool
+    assert scores['ok_love'].tolist() == [True]
+    assert scores['ok_world'].tolist() == [False]
+    assert scores['ok_passion'].tolist() == [False]  # mean(0, 5) = 2.5
+    assert scores['ok_vocation'].tolist() == [True]  # mean(4, 10) = 7
+
+
+def test_score_batch_of_model():
+    """
+    Test that the scores of a model are named after its dimensions and rings, and that the model
+    of the main module gives the default scores.
+    """
+    model = ikieval.make_model(('love', 'world', 'money', 'good', 'health'))
+    rng = random.Random(5)
+    rows = [[round(rng.uniform(0, 10), rng.randint(0, 2)) for _ in range(5)] for _ in range(100)]
+
+    scores = ikiscore.score_batch(rows, 5, model)
+    ring = ikiscore.score_ring(rows, 5)
+
+    for index, name in enumerate(model.ring_names):
+        assert scores[f'value_{name}'].tolist() == ring['ring'][:, index].tolist()
+        assert scores[f'ok_{name}'].tolist() == ring['ok_ring'][:, index].tolist()
+    assert scores['value_health'].tolist() == [row[4] for row in rows]
+    assert scores['score_PWMP_avr'].tolist() == ring['ring_avr'].tolist()
+
+    four = [row[:4] for row in rows]
+    default, main_model = ikiscore.score_batch(four), ikiscore.score_batch(four, model=ikieval.IKIGAI_MODEL)
+    assert list(default) == list(main_model)
+    assert all(default[key].tolist() == main_model[key].tolist() for key in default)
+
+    with pytest.raises(ValueError, match=r"shape \(N, 5\)"):
+        ikiscore.score_batch(four, model=model)
+
+
+def test_score_batch_invalid_shape():
+    """
+    Test that answers without exactly four columns are rejected.
+    """
+    with pytest.raises(ValueError, match="Answers must have shape"):
+        ikiscore.score_batch([[1, 2, 3]])
+
+    with pytest.raises(ValueError, match="Answers must have shape"):
+        ikiscore.score_batch([1, 2, 3, 4])
+
+
+def test_validate_answers_matches_is_it_number():
+    """
+    Test that the values and masks match `ikidef.is_it_number` and the range check of `ask_for_number`.
+    """
+    rng = random.Random(3)
+    raw = [f'{rng.uniform(-2, 12):.{rng.randint(0, 6)}f}'.replace('.', rng.choice('.,')) for _ in range(2000)]
+    raw += ['7', '-0', '+3.', '.5', '5,', '', ' 4', '1e1', '1.2.3', 'abc', '-', 'nan', 'inf', '10', '0',
+            '999999999999999', '1234567890123456.5', '١٢', None, 5, 7.25]
+
+    validation = ikiscore.validate_answers(raw, 0, 10)
+
+    for row, value in enumerate(raw):
+        expected = ikidef.is_it_number(value, 'Error')
+        if expected == 'Error':
+            assert not validation.valid[row], value
+            assert not validation.in_range[row], value
+        else:
+            assert validation.valid[row], value
+            assert validation.values[row] == expected or (expected != expected and np.isnan(validation.values[row]))
+            assert validation.in_range[row] == (0 <= expected <= 10), value
+
+
+def test_validate_answers_errors():
+    """
+    Test that only failing rows are reported, with the messages of `ask_for_number`.
+    """
+    validation = ikiscore.validate_answers(['5', 'abc', '11', '2,5'], 0, 10)
+
+    assert validation.values[[0, 2, 3]].tolist() == [5.0, 11.0, 2.5]
+    assert validation.errors == [
+        (1, 'abc', "You must enter a number. 'abc' is not a number! Try again."),
+        (2, '11', "Your answer '11.0' is out of range! Try again."),
+    ]
+
+    assert ikiscore.validate_answers(['1', '2', '3'], 0, 10).errors == []
+    assert ikiscore.validate_answers([], 0, 10).errors == []
+    assert ikiscore.validate_answers(['1\n2', '3'], 0, 10).values.tolist()[1] == 3.0  # Line break in an answer.
+
+
+@pytest.mark.parametrize('count', [2, 3, 5, 6])
+def test_score_ring_matches_ikidef(count):
+    """
+    Test that models with other numbers of circles match `ikidef.consecutive_and_circular_averages`
+    and `ikidef.get_sum_avg_min` row by row.
+    """
+    rng = random.Random(count)
+    rows = [[round(rng.uniform(0, 10), rng.randint(0, 2)) for _ in range(count)] for _ in range(300)]
+
+    scores = ikiscore.score_ring(rows, 5)
+
+    assert scores['ring'].shape == (300, count)
+    for index, row in enumerate(rows):
+        ring = ikidef.consecutive_and_circular_averages(row)
+        assert scores['ring'][index].tolist() == ring
+        assert scores['ok_ring'][index].tolist() == [value >= 5 for value in ring]
+        assert (scores['values_sum'][index], scores['values_avr'][index], scores['values_min'][index]) \
+            == ikidef.get_sum_avg_min(row)
+        assert (scores['ring_sum'][index], scores['ring_avr'][index], scores['ring_min'][index]) \
+            == ikidef.get_sum_avg_min(ring)
+
+    with pytest.raises(ValueError, match="Answers must have shape"):
+        ikiscore.score_ring([[1]])
@@ -0,0 +1,126 @@
+"""Module for testing the questionnaire service in the ikiservice module."""
+
+import asyncio
+import json
+import random
+
+import pytest
+
+from src import ikieval, ikiservice
+from src.ikirecord import Assessment
+
+
+def play(session, answers):
+    """Answers the questions of a session and returns all turns."""
+    turns = [session.start()]
+    for answer in answers:
+        turns.append(session.answer(answer))
+    return turns
+
+
+def test_session_validation():
+    """
+    Test that invalid answers are rejected with the messages of `ikidef` and the question is repeated.
+    """
+    session = ikiservice.Session()
+    turns = play(session, ['J', 'Jane Doe', 'abc', '11', '7,5'])
+
+    assert turns[0]['prompt'] == ikieval.ask_name
+    assert 'between 2 and 30 characters' in turns[1]['messages'][0]
+    assert turns[2]['prompt'].endswith(ikieval.ask_love)
+    assert turns[3]['messages'] == ["You must enter a number. 'abc' is not a number! Try again."]
+    assert turns[4]['messages'] == ["Your answer '11.0' is out of range! Try again."]
+    assert turns[5]['prompt'].endswith(ikieval.ask_world)
+    assert session.values == {'love': 7.5}
+
+
+def test_session_matches_assessment():
+    """
+    Test that finished sessions record the same results as `Assessment.evaluate`.
+    """
+    rng = random.Random(11)
+
+    for _ in range(300):
+        values = [rng.randint(0, 9) for _ in range(4)]
+        yes = [rng.random() < 0.5 for _ in range(4)]
+        session = ikiservice.Session()
+        turn = play(session, ['Jane Doe', *map(str, values)])[-1]
+
+        while 'prompt' in turn:
+            index = list(ikiservice.YN_QUESTIONS.values()).index(turn['prompt'])
+            turn = session.answer(ikieval.positive if yes[index] else ikieval.negative)
+
+        expected = Assessment.evaluate(*values, make=tuple(yes), name='Jane Doe', date=session.test_date)
+        assert session.result == expected
+        assert turn['result'] == expected.to_dict()
+
+
+def test_session_random_advice():
+    """
+    Test that a maximum score offers random advice until the respondent declines.
+    """
+    session = ikiservice.Session(rng=random.Random(0))
+    turns = play(session, ['Jane', '10', '10', '10', '10', 'maybe', 'yes', 'yes', 'no'])
+
+    assert turns[5]['prompt'] == ikieval.ask_random
+    assert turns[6]['messages'] == [ikieval.msg_error]
+    assert turns[7]['prompt'] == ikieval.ask_random_again
+    assert session.done
+    assert session.result.text_conclusion == ikieval.msg_congrat
+    assert session.result.text_advice.startswith(ikieval.text_random)
+
+    with pytest.raises(RuntimeError, match="already finished"):
+        session.answer('yes')
+
+
+async def respondent(port, answers):
+    """Connects to the service, sends the answers and returns the last turn."""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    turn = json.loads(await reader.readline())
+
+    for answer in answers:
+        writer.write(answer.encode() + b'\n')
+        await writer.drain()
+        turn = json.loads(await reader.readline())
+
+    writer.close()
+    await writer.wait_closed()
+    return turn
+
+
+def test_concurrent_sessions():
+    """
+    Test that many simultaneous respondents are served, each with their own results.
+    """
+    async def run():
+        server = await ikiservice.serve(port=0, timeout=10)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            # Values from 6 to 9 keep every circle above the limit; every question asked is answered 'no'.
+            scripts = [[f'Person {index}', *(str(6 + (index + column) % 4) for column in range(4)), 'no', 'no']
+                       for index in range(300)]
+            return scripts, await asyncio.gather(*(respondent(port, script) for script in scripts))
+
+    scripts, turns = asyncio.run(run())
+
+    for script, turn in zip(scripts, turns):
+        assert turn['result']['name'] == script[0]
+        assert turn['result']['conclusion'] == ikieval.msg_still_ok
+
+
+def test_session_timeout():
+    """
+    Test that a session is closed when no answer arrives in time.
+    """
+    async def run():
+        server = await ikiservice.serve(port=0, timeout=0.05)
+        async with server:
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+            turns = [json.loads(line) for line in (await reader.read()).splitlines()]
+            writer.close()
+            return turns
+
+    turns = asyncio.run(run())
+
+    assert turns[0]['prompt'] == ikieval.ask_name
+    assert turns[1]['error'] == 'timeout'
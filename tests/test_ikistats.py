@@ -0,0 +1,117 @@
+"""Module for testing the population statistics in the ikistats module."""
+
+import json
+import random
+import statistics
+
+import pytest
+
+from src import ikistats, ikistore
+from src.ikirecord import Assessment
+
+
+def random_assessments(count, seed):
+    """Evaluates random assessments with half-point answers."""
+    rng = random.Random(seed)
+    return [Assessment.evaluate(*(rng.randint(0, 20) / 2 for _ in range(4))) for _ in range(count)]
+
+
+def test_running_aggregates_match_statistics():
+    """
+    Test the running count, mean, variance, minimum, histograms and outcomes against a full recomputation.
+    """
+    assessments = random_assessments(1000, 1)
+    stats = ikistats.PopulationStats()
+    for assessment in assessments:
+        stats.add(assessment)
+
+    assert stats.count == 1000
+    for index, name in enumerate(ikistats.DIMENSIONS):
+        column = [(assessment.values + assessment.pmvp)[index] for assessment in assessments]
+        assert stats.mean(name) == pytest.approx(statistics.mean(column))
+        assert stats.variance(name) == pytest.approx(statistics.pvariance(column))
+        assert stats.minimum(name) == min(column)
+        assert sum(stats.histogram(name)) == 1000
+        assert stats.histogram(name)[-1] == sum(value >= 9 for value in column)  # 10 is in the last bin.
+
+    for outcome, count in stats.outcomes.items():
+        assert count == sum(assessment.outcome == outcome for assessment in assessments)
+
+
+def test_merged_shards_match_single_pass(tmp_path):
+    """
+    Test that merging shards (including an empty one and one read from a results store) gives the
+    aggregates of a single pass.
+    """
+    shards = [random_assessments(count, seed) for seed, count in enumerate((300, 0, 1, 500))]
+
+    single = ikistats.PopulationStats()
+    for assessment in sum(shards, []):
+        single.add(assessment)
+
+    partial = []
+    for shard in shards[:3]:
+        stats = ikistats.PopulationStats()
+        for assessment in shard:
+            stats.add(assessment)
+        partial.append(ikistats.PopulationStats.from_dict(json.loads(json.dumps(stats.to_dict(), allow_nan=False))))
+
+    path = str(tmp_path / 'results.ikis')
+    with ikistore.ResultStore(path) as store:
+        store.append(shards[3])
+    from_store = ikistats.PopulationStats()
+    from_store.add_records(ikistore.read_results(path).records)
+    partial.append(from_store)
+
+    assert partial[1].to_dict()['dimensions']['love']['min'] is None  # Strict JSON for an empty shard.
+    assert partial[1].minimums == ikistats.PopulationStats().minimums
+
+    merged = ikistats.PopulationStats.combine(partial)
+
+    assert merged.count == single.count
+    assert merged.means == pytest.approx(single.means)
+    assert merged.m2 == pytest.approx(single.m2)
+    assert merged.minimums == single.minimums and merged.maximums == single.maximums
+    assert merged.histograms == single.histograms
+    assert merged.outcomes == single.outcomes
+
+    with pytest.raises(ValueError, match="same value_max and bins"):
+        merged.merge(ikistats.PopulationStats(bins=5))
+
+
+def test_percentile_index_matches_brute_force(tmp_path):
+    """
+    Test single and batch percentile lookups against a direct count, while results keep arriving
+    one by one and from a results store.
+    """
+    assessments = random_assessments(400, 7)
+    index = ikistats.PercentileIndex()
+    assert index.percentile('love', 5) != index.percentile('love', 5)  # NaN without a population.
+
+    def brute_force(population, dimension, value):
+        column = [dict(zip(ikistats.DIMENSIONS, a.values + a.pmvp))[dimension] for a in population]
+        below = sum(other < value for other in column)
+        equal = sum(other == value for other in column)
+        return (below + equal / 2) * 100 / len(column)
+
+    for assessment in assessments[:200]:
+        index.add(assessment)
+    assert index.percentile('passion', 7.25) == pytest.approx(brute_force(assessments[:200], 'passion', 7.25))
+
+    path = str(tmp_path / 'results.ikis')
+    with ikistore.ResultStore(path) as store:
+        store.append(assessments[200:])
+    index.add_records(ikistore.read_results(path).records)
+
+    scores = [value / 4 for value in range(41)]
+    for dimension in ('love', 'money', 'passion', 'vocation'):
+        expected = [brute_force(assessments, dimension, value) for value in scores]
+        assert index.percentile(dimension, scores[13]) == pytest.approx(expected[13])
+        assert index.percentiles(dimension, scores).tolist() == pytest.approx(expected)
+
+    below = index._below[:, 1:]  # Kept up to date by the updates, never rebuilt.
+    assert (below == index.counts[:, :-1].cumsum(axis=1)).all() and not index._below[:, 0].any()
+
+    ranks = index.of(assessments[0])
+    assert set(ranks) == set(ikistats.DIMENSIONS)
+    assert all(0 < rank < 100 for rank in ranks.values())
@@ -0,0 +1,106 @@
+"""Module for testing the results store in the ikistore module."""
+
+import random
+
+import numpy as np
+import pytest
+
+from src import ikistore
+from src.ikirecord import Assessment
+
+
+def assessments(count, seed=0):
+    """Evaluates random assessments."""
+    rng = random.Random(seed)
+    return [Assessment.evaluate(*(rng.randint(0, 20) / 2 for _ in range(4)),
+                                make=tuple(rng.random() < 0.5 for _ in range(4)),
+                                date=f'{rng.randint(1, 28):02d}.{rng.randint(1, 12):02d}.20{rng.randint(10, 30)}')
+            for _ in range(count)]
+
+
+def test_append_and_read(tmp_path):
+    """
+    Test that appended assessments are read back unchanged, as zero-copy views of the file.
+    """
+    path = str(tmp_path / 'results.ikis')
+    first, second = assessments(500, 1), assessments(300, 2)
+
+    with ikistore.ResultStore(path) as store:
+        assert store.append(first) == 500
+    with ikistore.ResultStore(path) as store:  # Reopened stores append after the existing records.
+        assert store.append(second) == 800
+
+    results = ikistore.read_results(path)
+
+    assert isinstance(results.records, np.memmap)
+    assert len(results.records) == 800
+    for index, assessment in enumerate(first + second):
+        assert ikistore.to_assessment(results, index) == assessment
+    assert ikistore.values(results.records)[0].tolist() == list(first[0].values)
+    assert len(results.messages) == len(set(results.messages))  # Every message is stored once.
+
+
+def test_uncommitted_data_is_ignored(tmp_path):
+    """
+    Test that data written after the last commit (an interrupted append) is never read and is
+    cut off when the store is opened again.
+    """
+    path = str(tmp_path / 'results.ikis')
+    with ikistore.ResultStore(path) as store:
+        store.append(assessments(10))
+
+    with open(path, 'ab') as file:
+        file.write(b'\xff' * (ikistore.RECORD_DTYPE.itemsize * 3 + 5))  # Records without a commit.
+    with open(path + ikistore.MESSAGES_SUFFIX, 'a') as file:
+        file.write('["torn')  # A message line without its end.
+
+    assert len(ikistore.read_results(path).records) == 10
+
+    with ikistore.ResultStore(path) as store:
+        store.append(Assessment.evaluate(10, 10, 10, 10, date='18.10.2026'))
+
+    results = ikistore.read_results(path)
+    assert len(results.records) == 11
+    assert ikistore.to_assessment(results, 10).date == '18.10.2026'
+
+
+def test_failed_append_writes_nothing(tmp_path):
+    """
+    Test that a batch with an answer that cannot be stored (here infinite) is rejected as a whole,
+    without leaving its new messages behind for the next batch.
+    """
+    path = str(tmp_path / 'results.ikis')
+    valid = Assessment.evaluate(1, 1, 1, 1, date='18.10.2026')
+    with ikistore.ResultStore(path) as store:
+        with pytest.raises(ValueError, match="cannot be stored"):
+            store.append([valid, Assessment.evaluate(float('inf'), 5, 5, 5)])
+        assert len(store) == 0 and store.messages == []
+
+        store.append([valid])
+
+    results = ikistore.read_results(path)
+    assert ikistore.to_assessment(results, 0).text_conclusion == valid.text_conclusion
+
+
+def test_dates_and_limits(tmp_path):
+    """
+    Test the date conversion, missing dates, answers that cannot be stored and files that are not stores.
+    """
+    assert ikistore.date_to_days('02.01.1970') == 1
+    assert ikistore.days_to_date(ikistore.date_to_days('18.10.2026')) == '18.10.2026'
+    assert ikistore.days_to_date(ikistore.date_to_days('')) == ''
+
+    with pytest.raises(ValueError, match="cannot be stored"):
+        ikistore.quantize(-1)
+
+    path = str(tmp_path / 'results.ikis')
+    ikistore.ResultStore(path).close()
+    assert len(ikistore.read_results(path).records) == 0
+
+    (tmp_path / 'other.ikis').write_bytes(b'not a store'.ljust(ikistore.HEADER_SIZE))
+    with pytest.raises(ValueError, match="Not a results store"):
+        ikistore.read_results(str(tmp_path / 'other.ikis'))
+
+    (tmp_path / 'truncated.ikis').write_bytes(b'IK')
+    with pytest.raises(ValueError, match="Not a results store"):
+        ikistore.read_results(str(tmp_path / 'truncated.ikis'))
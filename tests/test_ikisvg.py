@@ -0,0 +1,88 @@
+"""Module for testing the SVG rendering in the ikisvg module."""
+
+import subprocess
+import sys
+import xml.etree.ElementTree as ElementTree
+
+from src import ikisvg
+
+SVG = '{http://www.w3.org/2000/svg}'
+
+
+def render(**kwargs):
+    """Renders an example drawing and parses it."""
+    args = dict(value_love=10.0, value_good=6.0, value_money=3.0, value_world=8.0, value_max=10,
+                value_minTrue=5, text_conclusion='A & B', text_advice='Try <this>.',
+                your_name='Jane Doe', test_date='18.10.2026')
+    args.update(kwargs)
+    svg = ikisvg.ikigai_svg(**args)
+    return svg, ElementTree.fromstring(svg)
+
+
+def test_ikigai_svg_content():
+    """
+    Test that the SVG contains the circles, values in their colors, and the personal texts.
+    """
+    svg, root = render()
+
+    assert len(root.findall(f'.//{SVG}circle')) == 8  # Four filled circles and four outlines.
+
+    texts = {''.join(text.itertext()): text.get('fill') for text in root.iter(f'{SVG}text')}
+    assert texts['10.0'] == 'green'
+    assert texts['6.0'] == 'darkgoldenrod'
+    assert texts['3.0'] == 'red'
+    assert texts['6.75'] == 'darkgoldenrod'  # Average in the center.
+    assert texts['LOVE'] == 'white'
+    assert 'Jane Doe' in texts and '18.10.2026' in texts
+    assert 'A &amp; B' in svg and 'Try &lt;this&gt;.' in svg  # Escaped conclusion and advice.
+
+
+def test_ikigai_svg_file(tmp_path):
+    """
+    Test that the SVG is written to a file when a path is given.
+    """
+    path = tmp_path / 'report.svg'
+    svg, _ = render(path=str(path))
+    assert path.read_text(encoding='utf-8') == svg
+
+
+def test_ring_svg():
+    """
+    Test that a model with five circles renders five filled circles and five outlines.
+    """
+    names = ('A', 'B', 'C', 'D', 'E')
+    svg = ikisvg.ring_svg((1, 2, 3, 4, 5), names, names, names, 10, 5, 'conclusion', 'advice',
+                          'Jane Doe', '18.10.2026')
+    root = ElementTree.fromstring(svg)
+
+    assert len(root.findall(f'.//{SVG}circle')) == 10
+    assert 'Jane Doe' in svg
+
+
+def test_ikigai_svg_percentiles():
+    """
+    Test that percentile ranks are shown as ordinals, also for cached drawings.
+    """
+    from src import ikicache
+
+    svg, root = render(percentiles={'love': 73.2, 'passion': 11.0, 'vocation': float('nan')})
+    texts = [''.join(text.itertext()) for text in root.iter(f'{SVG}text')]
+
+    assert '73rd percentile' in texts and '11th percentile' in texts
+    assert sum(text.endswith('percentile') for text in texts) == 2  # NaN ranks are not shown.
+
+    cache = ikicache.RenderCache()
+    render(cache=cache)
+    assert render(cache=cache, percentiles={'love': 73.2})[0].count('percentile') == 1
+    assert render(cache=cache)[0].count('percentile') == 0
+
+
+def test_ikisvg_does_not_import_turtle():
+    """
+    Test that rendering does not import turtle or tkinter, so it works without a display.
+    """
+    code = ('import sys; from src import ikisvg; '
+            'ikisvg.ikigai_svg(5, 5, 2, 7, 10, 5, "c", "a", "n", "d"); '
+            'print("turtle" in sys.modules or "tkinter" in sys.modules)')
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == 'False'
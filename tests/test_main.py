@@ -0,0 +1,101 @@
+"""Module for testing the startup of the main module and the modules used by worker processes."""
+
+import subprocess
+import sys
+
+import pytest
+
+import IKIGAI_PRO_WORK
+from src import ikidef, ikieval
+
+IMPORT_BUDGET_US = 50_000  # Cold import budget in microseconds (turtle or NumPy alone take longer).
+HEAVY_MODULES = ('turtle', 'tkinter', 'numpy', 'statistics', 'asyncio', 'urllib.request')
+
+
+def import_times(module):
+    """Imports a module in a fresh interpreter with `-X importtime`.
+
+    Returns:
+        dict: Cumulative import time in microseconds by imported module name.
+    """
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                             capture_output=True, text=True, check=True)
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize('module', ['IKIGAI_PRO_WORK', 'src.ikisvg', 'src.ikidraw'])
+def test_import_budget(module):
+    """
+    Test that importing the main module and the rendering modules stays under the time budget and
+    does not load heavy modules before they are needed.
+    """
+    runs = [import_times(module) for _ in range(3)]
+
+    assert min(times[module] for times in runs) < IMPORT_BUDGET_US
+    for heavy in HEAVY_MODULES:
+        assert heavy not in runs[0], heavy
+
+
+def test_main_without_drawing(monkeypatch):
+    """
+    Test that `main` runs the questionnaire from the keyboard without drawing when asked.
+    """
+    answers = ikidef.answers_from(['Jane Doe', '10', '10', '10', '10', 'no'])
+    monkeypatch.setattr('builtins.input', answers)
+    monkeypatch.setattr('builtins.print', lambda *args, **kwargs: None)
+
+    result = IKIGAI_PRO_WORK.main(['--no-draw'])
+
+    assert result['user_name'] == 'Jane Doe'
+    assert result['draw_iki'] is True and result['text_conclusion'] == "Congratulations! Keep doing what you're doing."
+    assert 'turtle' not in sys.modules
+
+
+def test_questionnaire_five_circles():
+    """
+    Test that the questionnaire asks about every circle of a model and follows its rings.
+    """
+    model = ikieval.make_model(('love', 'world', 'money', 'good', 'health'))
+    questions, output = [], []
+
+    def source(question=''):
+        questions.append(question)
+        return answers.pop(0)
+
+    # love-world and world-money (5) are the lowest rings: ask about love, world and money.
+    answers = ['Jane Doe', '8', '2', '8', '8', '9', 'yes', 'no', 'no']
+    result = IKIGAI_PRO_WORK.questionnaire(source, lambda *args, **kwargs: output.append(args), draw=False,
+                                           model=model)
+
+    assert len(questions) == 9
+    assert all(question in asked for question, asked in zip(model.questions + model.follow_ups[:3], questions[1:]))
+    assert [result[name] for name in model.names] == [8, 2, 8, 8, 9]
+    assert result['text_conclusion'] == ikieval.msg_space
+    assert result['text_advice'] == ikieval.temp_advice.format(adv=ikieval.text_space, plus=model.tries[0])
+    assert result['draw_iki'] is True
+
+    # love-world (1) is under the limit and neither circle can be improved.
+    answers, output[:] = ['Jane Doe', '1', '1', '9', '9', '9', 'no', 'no'], []
+    result = IKIGAI_PRO_WORK.questionnaire(source, lambda *args, **kwargs: output.append(args), draw=False,
+                                           model=model)
+
+    assert ('\t -', 'Love-world') in output
+    assert (result['text_conclusion'], result['text_advice']) == (ikieval.msg_under, ikieval.msg_change_job)
+
+
+def test_statistics_loaded_once_when_needed():
+    """
+    Test that `ikidef` imports the statistics module only for the first mean, and only once.
+    """
+    code = ('import sys; from src import ikidef; loaded = "statistics" in sys.modules; '
+            'ikidef.get_sum_avg_min([1, 2]); ikidef.consecutive_and_circular_averages([1, 2, 3]); '
+            'print(loaded, ikidef.statistics_module() is sys.modules["statistics"])')
+    process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+
+    assert process.stdout.split() == ['False', 'True']